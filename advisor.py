@@ -0,0 +1,134 @@
+import itertools
+from scoring import ScoringSystem
+
+# Die symbol used by the advisor for a wild (star) die; faces are 1..faces
+WILD = 0
+
+
+class RerollAdvisor:
+    """Exact expected-score advice on which dice to discard.
+    
+    Hands are canonical multisets (924 full hands, 1716 partial holds for six
+    six-sided dice), filled in by dynamic programming one reroll level at a
+    time, so advice for a hand is a handful of dictionary lookups once the
+    tables exist.
+    """
+    
+    def __init__(self, scoring_system=None, wild_chance=0.15, hand_size=None):
+        self.scoring_system = scoring_system or ScoringSystem()
+        self.hand_size = hand_size or self.scoring_system.hand_size
+        faces = self.scoring_system.faces
+        self.symbols = tuple(range(faces + 1))
+        
+        # Same odds as DiceyDilemma.roll_dice / discard_selected_dice
+        face_chance = (1 - wild_chance) / faces
+        self.symbol_chances = {WILD: wild_chance}
+        for face in range(1, faces + 1):
+            self.symbol_chances[face] = face_chance
+        
+        # Every hold of 0..hand_size dice, smallest first
+        hand_size = self.hand_size
+        self.holds = []
+        for size in range(hand_size + 1):
+            self.holds.extend(itertools.combinations_with_replacement(self.symbols, size))
+        self.full_hands = [hold for hold in self.holds if len(hold) == hand_size]
+        
+        # Transitions between holds: add one die / remove one die
+        self.add_die = {}
+        self.remove_die = {}
+        for hold in self.holds:
+            if len(hold) < hand_size:
+                self.add_die[hold] = [(tuple(sorted(hold + (symbol,))), self.symbol_chances[symbol])
+                                      for symbol in self.symbols]
+            self.remove_die[hold] = list({hold[:i] + hold[i + 1:] for i in range(len(hold))})
+        
+        # Score of playing each full hand right now
+        self.play_scores = {hand: self.hand_score(hand) for hand in self.full_hands}
+        
+        # hand_values[r][hand]: best expected score for a full hand with r rerolls left
+        # hold_values[r][hold]: expected score of keeping hold and rerolling the rest
+        self.hand_values = [dict(self.play_scores)]
+        self.hold_values = []
+        self._advice_cache = {}
+    
+    def hand_score(self, hand):
+        """Score a canonical hand, treating WILD symbols as wild dice"""
+        wild_dice = [i for i, symbol in enumerate(hand) if symbol == WILD]
+        return self.scoring_system.calculate_score(list(hand), wild_dice).score
+    
+    def build(self, max_rerolls):
+        """Fill the value tables up to max_rerolls rerolls"""
+        while len(self.hand_values) <= max_rerolls:
+            self._build_next_level()
+    
+    def _build_next_level(self):
+        """Extend the tables by one reroll"""
+        next_values = self.hand_values[-1]
+        
+        # Expected value of each hold, building up from full hands one die at a time
+        hold_values = {}
+        for hold in reversed(self.holds):
+            if len(hold) == self.hand_size:
+                hold_values[hold] = next_values[hold]
+            else:
+                hold_values[hold] = sum(chance * hold_values[child] for child, chance in self.add_die[hold])
+        self.hold_values.append(hold_values)
+        
+        # Best hold inside each multiset, smallest first
+        best_subhold = {}
+        for hold in self.holds:
+            best = hold_values[hold]
+            for smaller in self.remove_die[hold]:
+                if best_subhold[smaller] > best:
+                    best = best_subhold[smaller]
+            best_subhold[hold] = best
+        
+        # A full hand can be played, or reroll at least one die
+        hand_values = {}
+        for hand in self.full_hands:
+            best = self.play_scores[hand]
+            for smaller in self.remove_die[hand]:
+                if best_subhold[smaller] > best:
+                    best = best_subhold[smaller]
+            hand_values[hand] = best
+        self.hand_values.append(hand_values)
+    
+    def expected_value(self, dice, rerolls_left):
+        """Best expected final score for the current dice"""
+        self.build(rerolls_left)
+        return self.hand_values[rerolls_left][self._canonical(dice)]
+    
+    def advise(self, dice, rerolls_left):
+        """Return (discard indices, expected score, {discard indices: expected score})
+        
+        The empty discard means playing the hand as it is. Ties prefer
+        discarding fewer dice.
+        """
+        symbols = tuple(WILD if die.is_wild else die.value for die in dice)
+        cache_key = (symbols, rerolls_left)
+        advice = self._advice_cache.get(cache_key)
+        if advice is not None:
+            return advice
+        
+        self.build(rerolls_left)
+        play_score = self.play_scores[tuple(sorted(symbols))]
+        options = {(): play_score}
+        if rerolls_left > 0:
+            hold_values = self.hold_values[rerolls_left - 1]
+            indices = range(len(symbols))
+            for count in range(1, len(symbols) + 1):
+                for discard in itertools.combinations(indices, count):
+                    kept = tuple(sorted(symbols[i] for i in indices if i not in discard))
+                    options[discard] = hold_values[kept]
+        
+        # Options are in order of discard size, so max keeps the smallest discard on ties
+        best_discard = max(options, key=options.get)
+        advice = (list(best_discard), options[best_discard], options)
+        if len(self._advice_cache) >= 4096:
+            self._advice_cache.clear()
+        self._advice_cache[cache_key] = advice
+        return advice
+    
+    def _canonical(self, dice):
+        """Canonical hand for a list of Dice"""
+        return tuple(sorted(WILD if die.is_wild else die.value for die in dice))
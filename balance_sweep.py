@@ -0,0 +1,222 @@
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+import json5
+import numpy as np
+from game_core import DEFAULT_BALANCE
+from scoring import ScoringSystem, DEFAULT_RULES_PATH, load_rule_set
+from simulate import simulate, CAUSE_IDS, TURN_LIMIT
+from vector_engine import VectorGames
+
+# Finished grid points are cached here as <parameter hash>.json
+SWEEP_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sweep_cache")
+SWEEP_VERSION = 1  # Bump when the engines or the summary change, so old results are not reused
+
+ENGINES = ("vector", "core")
+
+# Table columns after the swept parameters
+RESULT_COLUMNS = ("runs", "mean_level", "p10", "p50", "p90", "mean_gold", "turn_limit_pct")
+
+
+def sweepable_keys(rules_path=DEFAULT_RULES_PATH):
+    """Every parameter a grid may sweep, with its default value"""
+    rule_set = load_rule_set(rules_path)
+    defaults = dict(DEFAULT_BALANCE)
+    defaults["bonus_multiplier"] = rule_set["bonus_multiplier"]
+    for name, value in rule_set["scoring_rules"].items():
+        defaults[f"rules.{name}"] = value
+    return defaults
+
+
+def grid_points(grid):
+    """Every combination of the grid's values, in a stable order: a list of {key: value}"""
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def resolve_point(point, rules_path=DEFAULT_RULES_PATH):
+    """Split a grid point into (balance overrides, rule set)"""
+    defaults = sweepable_keys(rules_path)
+    unknown = sorted(set(point) - set(defaults))
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(unknown)}")
+    
+    rule_set = load_rule_set(rules_path)
+    balance = {}
+    for key, value in point.items():
+        if key == "bonus_multiplier":
+            rule_set["bonus_multiplier"] = value
+        elif key.startswith("rules."):
+            rule_set["scoring_rules"][key[len("rules."):]] = value
+        else:
+            balance[key] = value
+    return balance, rule_set
+
+
+def point_hash(point, engine, policy, runs, seed, max_turns, rules_path=DEFAULT_RULES_PATH):
+    """Cache key of a grid point: every setting that can change its results"""
+    balance, rule_set = resolve_point(point, rules_path)
+    content = json.dumps({
+        "balance": dict(DEFAULT_BALANCE, **balance),
+        "scoring_rules": rule_set["scoring_rules"],
+        "bonus_multiplier": rule_set["bonus_multiplier"],
+        "engine": engine,
+        "policy": policy,
+        "runs": runs,
+        "seed": seed,
+        "max_turns": max_turns,
+        "version": SWEEP_VERSION
+    }, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def summarize_point(levels, gold, turn_limited):
+    """Summary of one grid point's runs (the RESULT_COLUMNS)"""
+    p10, p50, p90 = np.percentile(levels, [10, 50, 90])
+    return {
+        "runs": int(len(levels)),
+        "mean_level": float(levels.mean()),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+        "mean_gold": float(gold.mean()),
+        "turn_limit_pct": float(100 * turn_limited.mean())
+    }
+
+
+def run_point(task):
+    """Play one grid point's runs and summarize them"""
+    point, engine, policy, runs, seed, max_turns, rules_path = task
+    balance, rule_set = resolve_point(point, rules_path)
+    if engine == "vector":
+        # The vector engine has no shop, so power-up and restore prices do not matter
+        scoring_system = ScoringSystem(rules_path)
+        scoring_system.set_rules(rule_set["scoring_rules"], rule_set["bonus_multiplier"])
+        games = VectorGames(runs, policy, scoring_system, seed, balance)
+        games.run(max_turns)
+        return summarize_point(games.level, games.gold, games.alive)
+    
+    # Grid points already run in parallel, so each one plays its runs in this process
+    records = simulate(runs, policy, 1, seed, max_turns, balance=balance, rule_set=rule_set)
+    return summarize_point(records["level"], records["gold"], records["cause"] == CAUSE_IDS[TURN_LIMIT])
+
+
+def sweep(grid, engine="vector", policy="play", runs=1000, seed=0, max_turns=2000, processes=None,
+          cache_dir=SWEEP_CACHE_DIR, rules_path=DEFAULT_RULES_PATH):
+    """Results of every grid point: a list of (point, summary), computing only uncached points"""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}")
+    points = grid_points(grid)
+    hashes = [point_hash(point, engine, policy, runs, seed, max_turns, rules_path) for point in points]
+    
+    results = {}
+    missing = []
+    for point, digest in zip(points, hashes):
+        path = os.path.join(cache_dir, f"{digest}.json")
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                results[digest] = json.load(f)["summary"]
+        elif digest not in missing:
+            missing.append(digest)
+    
+    if missing:
+        os.makedirs(cache_dir, exist_ok=True)
+        tasks = [(points[hashes.index(digest)], engine, policy, runs, seed, max_turns, rules_path)
+                 for digest in missing]
+        processes = min(processes or os.cpu_count() or 1, len(tasks))
+        if processes == 1:
+            summaries = map(run_point, tasks)
+        else:
+            pool = multiprocessing.Pool(processes)
+            summaries = pool.imap(run_point, tasks)
+        try:
+            for digest, task, summary in zip(missing, tasks, summaries):
+                results[digest] = summary
+                # Write then rename, so an interrupted sweep never leaves a half-written entry
+                path = os.path.join(cache_dir, f"{digest}.json")
+                with open(path + ".tmp", "w") as f:
+                    json.dump({"point": task[0], "summary": summary}, f, sort_keys=True)
+                os.replace(path + ".tmp", path)
+        finally:
+            if processes > 1:
+                pool.close()
+                pool.join()
+    
+    return [(point, results[digest]) for point, digest in zip(points, hashes)]
+
+
+def format_value(value):
+    """Fixed formatting, so tables from different runs diff cleanly"""
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def format_table(grid, results):
+    """Aligned text table, one row per grid point in a stable order"""
+    header = sorted(grid) + list(RESULT_COLUMNS)
+    rows = [[format_value(point[key]) for key in sorted(grid)] + [format_value(summary[key]) for key in RESULT_COLUMNS]
+            for point, summary in results]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)).rstrip()
+             for row in [header] + rows]
+    return "\n".join(lines)
+
+
+def parse_grid(settings, grid_path=None):
+    """Grid from a JSON5 file ({key: [values]}) and --set key=v1,v2 options (which win)"""
+    grid = {}
+    if grid_path:
+        with open(grid_path, "r") as f:
+            grid.update(json5.load(f))
+    for setting in settings:
+        key, separator, values = setting.partition("=")
+        if not separator or not values:
+            raise ValueError(f"Expected key=v1,v2,... but got {setting!r}")
+        grid[key.strip()] = [json5.loads(value) for value in values.split(",")]
+    for key, values in grid.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"{key}: expected a non-empty list of values")
+    return grid
+
+
+def main():
+    """Sweep balance constants and print the outcome of every combination"""
+    parser = argparse.ArgumentParser(description="Parallel sweep over Dicey Dilemma balance constants")
+    parser.add_argument("--set", dest="settings", action="append", default=[], metavar="KEY=V1,V2",
+                        help=f"Values to sweep; keys: {', '.join(sweepable_keys())}")
+    parser.add_argument("--grid", help="JSON5 file of {key: [values]}")
+    parser.add_argument("--engine", choices=ENGINES, default="vector",
+                        help="vector is fast but has no shop; core plays complete GameCore runs")
+    parser.add_argument("--policy", choices=["play", "advisor"], default="play")
+    parser.add_argument("--runs", type=int, default=1000, help="Runs per grid point")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=2000, help="Hands played before a run is cut off")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--cache-dir", default=SWEEP_CACHE_DIR)
+    parser.add_argument("--output", help="Also write the table to this file")
+    args = parser.parse_args()
+    
+    try:
+        grid = parse_grid(args.settings, args.grid)
+        start = time.time()
+        results = sweep(grid, args.engine, args.policy, args.runs, args.seed, args.max_turns,
+                        args.processes, args.cache_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    table = format_table(grid, results)
+    print(table)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(table + "\n")
+    print(f"\n{len(results)} grid points in {time.time() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
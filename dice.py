@@ -1,6 +1,88 @@
 import pygame
 import math
 
+# Colors
+DIE_BG_COLOR = (255, 255, 255)  # White
+DIE_BORDER_COLOR = (100, 100, 100)  # Gray
+DIE_SELECTED_COLOR = (255, 255, 0)  # Yellow
+DIE_DOT_COLOR = (0, 0, 0)  # Black
+DIE_STAR_COLOR = (255, 215, 0)  # Gold
+
+# Dot positions for each value, as fractions of the face inside its margin
+DOT_POSITIONS = {
+    1: [(0.5, 0.5)],
+    2: [(0.25, 0.25), (0.75, 0.75)],
+    3: [(0.25, 0.25), (0.5, 0.5), (0.75, 0.75)],
+    4: [(0.25, 0.25), (0.75, 0.25), (0.25, 0.75), (0.75, 0.75)],
+    5: [(0.25, 0.25), (0.75, 0.25), (0.5, 0.5), (0.25, 0.75), (0.75, 0.75)],
+    6: [(0.25, 0.25), (0.75, 0.25), (0.25, 0.5), (0.75, 0.5), (0.25, 0.75), (0.75, 0.75)]
+}
+
+# Faces in the atlas, one column each: the dotted values, the wild star and
+# a blank face for values without dots (dice with more than 6 faces)
+ATLAS_FACES = (1, 2, 3, 4, 5, 6, "wild", None)
+
+# Face atlases shared by every die, by die size
+_FACE_ATLASES = {}
+
+
+def draw_face(surface, rect, face, is_selected):
+    """Draw one die face (a value, "wild" or None for blank) filling rect"""
+    # Draw background
+    if is_selected:
+        pygame.draw.rect(surface, DIE_SELECTED_COLOR, rect)
+    else:
+        pygame.draw.rect(surface, DIE_BG_COLOR, rect)
+    
+    # Draw border
+    pygame.draw.rect(surface, DIE_BORDER_COLOR, rect, 3)
+    
+    if face == "wild":
+        # Draw a simple star (5-pointed)
+        center_x = rect.x + rect.width // 2
+        center_y = rect.y + rect.height // 2
+        radius = 20  # Larger star for bigger dice
+        points = []
+        for i in range(10):
+            angle = i * math.pi / 5
+            if i % 2 == 0:
+                r = radius
+            else:
+                r = radius * 0.4
+            points.append((center_x + r * math.cos(angle), center_y + r * math.sin(angle)))
+        pygame.draw.polygon(surface, DIE_STAR_COLOR, points)
+    elif face in DOT_POSITIONS:
+        dot_radius = 5  # Slightly larger dots for bigger dice
+        margin = 12  # More margin for bigger dice
+        for rel_x, rel_y in DOT_POSITIONS[face]:
+            x = rect.x + margin + (rect.width - 2 * margin) * rel_x
+            y = rect.y + margin + (rect.height - 2 * margin) * rel_y
+            pygame.draw.circle(surface, DIE_DOT_COLOR, (int(x), int(y)), dot_radius)
+
+
+def face_atlas(size):
+    """(atlas surface, {(face, selected): area}) of every die face, drawn once
+    
+    Each face has a column, unselected above selected, so a die is drawn
+    with a single blit of its area.
+    """
+    atlas = _FACE_ATLASES.get(size)
+    if atlas is not None:
+        return atlas
+    
+    surface = pygame.Surface((size * len(ATLAS_FACES), size * 2))
+    areas = {}
+    for col, face in enumerate(ATLAS_FACES):
+        for row, is_selected in enumerate((False, True)):
+            area = pygame.Rect(col * size, row * size, size, size)
+            draw_face(surface, area, face, is_selected)
+            areas[face, is_selected] = area
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()  # Match the screen's pixel format for fast blits
+    atlas = _FACE_ATLASES[size] = (surface, areas)
+    return atlas
+
+
 class Dice:
     def __init__(self, index, value, is_wild=False):
         self.index = index
@@ -24,68 +106,14 @@ class Dice:
         self.y = 250 + row * (self.size + row_gap)  # Moved down from 230 to 250
         
         self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
-        
-        # Colors
-        self.bg_color = (255, 255, 255)  # White
-        self.border_color = (100, 100, 100)  # Gray
-        self.selected_color = (255, 255, 0)  # Yellow
-        self.dot_color = (0, 0, 0)  # Black
-        self.star_color = (255, 215, 0)  # Gold
     
-    def draw(self, screen, is_selected):
-        """Draw the die"""
-        # Draw background
-        if is_selected:
-            pygame.draw.rect(screen, self.selected_color, self.rect)
-        else:
-            pygame.draw.rect(screen, self.bg_color, self.rect)
-        
-        # Draw border
-        pygame.draw.rect(screen, self.border_color, self.rect, 3)
-        
+    def face(self):
+        """The die's face in the atlas"""
         if self.is_wild:
-            self.draw_star(screen)
-        else:
-            self.draw_dots(screen)
-    
-    def draw_dots(self, screen):
-        """Draw dots on the die based on value"""
-        dot_radius = 5  # Slightly larger dots for bigger dice
-        margin = 12  # More margin for bigger dice
-        
-        # Define dot positions for each value
-        dot_positions = {
-            1: [(0.5, 0.5)],
-            2: [(0.25, 0.25), (0.75, 0.75)],
-            3: [(0.25, 0.25), (0.5, 0.5), (0.75, 0.75)],
-            4: [(0.25, 0.25), (0.75, 0.25), (0.25, 0.75), (0.75, 0.75)],
-            5: [(0.25, 0.25), (0.75, 0.25), (0.5, 0.5), (0.25, 0.75), (0.75, 0.75)],
-            6: [(0.25, 0.25), (0.75, 0.25), (0.25, 0.5), (0.75, 0.5), (0.25, 0.75), (0.75, 0.75)]
-        }
-        
-        if self.value in dot_positions:
-            for rel_x, rel_y in dot_positions[self.value]:
-                x = self.x + margin + (self.size - 2 * margin) * rel_x
-                y = self.y + margin + (self.size - 2 * margin) * rel_y
-                pygame.draw.circle(screen, self.dot_color, (int(x), int(y)), dot_radius)
+            return "wild"
+        return self.value if self.value in DOT_POSITIONS else None
     
-    def draw_star(self, screen):
-        """Draw a star for wild card dice"""
-        center_x = self.x + self.size // 2
-        center_y = self.y + self.size // 2
-        radius = 20  # Larger star for bigger dice
-        
-        # Draw a simple star (5-pointed)
-        points = []
-        for i in range(10):
-            angle = i * math.pi / 5
-            if i % 2 == 0:
-                r = radius
-            else:
-                r = radius * 0.4
-            x = center_x + r * math.cos(angle)
-            y = center_y + r * math.sin(angle)
-            points.append((x, y))
-        
-        if len(points) >= 3:
-            pygame.draw.polygon(screen, self.star_color, points) 
\ No newline at end of file
+    def draw(self, screen, is_selected):
+        """Draw the die"""
+        atlas, areas = face_atlas(self.size)
+        screen.blit(atlas, self.rect, areas[self.face(), is_selected])
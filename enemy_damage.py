@@ -0,0 +1,107 @@
+import itertools
+import math
+import random
+from fractions import Fraction
+from scoring import ScoringSystem
+
+# Exact distributions shared between callers with identical rules and odds,
+# as ({(hand type id, damage): probability}, {(hand type id, damage): ScoreResult})
+_PMF_CACHE = {}
+
+
+def _enemy_attacks(scoring_system, wild_chance):
+    """Exact attack distribution, with the ScoreResult of one hand dealing each attack"""
+    scoring_system = scoring_system or ScoringSystem()
+    wild_chance = Fraction(wild_chance).limit_denominator(10 ** 6)
+    cache_key = (scoring_system.rules_key(), wild_chance)
+    attacks = _PMF_CACHE.get(cache_key)
+    if attacks is not None:
+        return attacks
+    
+    faces = scoring_system.faces
+    chances = [wild_chance] + [(1 - wild_chance) / faces] * faces
+    pmf = {}
+    results = {}
+    for hand in itertools.combinations_with_replacement(range(faces + 1), scoring_system.hand_size):
+        # Number of orderings of this multiset times the chance of one ordering
+        orderings = math.factorial(scoring_system.hand_size)
+        chance = Fraction(1)
+        for value in set(hand):
+            count = hand.count(value)
+            orderings //= math.factorial(count)
+            chance *= chances[value] ** count
+        result = scoring_system.calculate_score(list(hand), [])
+        # Hands of one type dealing the same damage read the same (the base score is the type's)
+        attack = (result.hand_type, result.score)
+        pmf[attack] = pmf.get(attack, 0) + chance * orderings
+        results.setdefault(attack, result)
+    
+    attacks = (dict(sorted(pmf.items())), results)
+    _PMF_CACHE[cache_key] = attacks
+    return attacks
+
+
+def enemy_attack_pmf(scoring_system=None, wild_chance=0.15):
+    """Exact {(hand type id, damage): probability} of one DiceyDilemma.enemy_turn attack
+    
+    Enemy dice are rolled like the player's (wild_chance of a 0) but scored
+    without wild indices, so a 0 counts as a plain zero-valued die. Hand
+    type ids index scoring.HAND_TYPES. Probabilities are Fractions.
+    """
+    return _enemy_attacks(scoring_system, wild_chance)[0]
+
+
+def enemy_damage_pmf(scoring_system=None, wild_chance=0.15):
+    """Exact {damage: probability} of one enemy attack, sorted by damage"""
+    pmf = {}
+    for (hand_id, damage), chance in enemy_attack_pmf(scoring_system, wild_chance).items():
+        pmf[damage] = pmf.get(damage, 0) + chance
+    return dict(sorted(pmf.items()))
+
+
+class EnemyDamageSampler:
+    """O(1) sampling of enemy attacks (hand type and damage) with Vose's alias method"""
+    
+    def __init__(self, scoring_system=None, wild_chance=0.15, rng=None):
+        self.rng = rng or random
+        pmf, results = _enemy_attacks(scoring_system, wild_chance)
+        self.attacks = list(pmf)  # (hand type id, damage)
+        self.results = [results[attack] for attack in self.attacks]
+        count = len(self.attacks)
+        
+        # Scale probabilities so the average column holds exactly 1
+        scaled = [float(chance) * count for chance in pmf.values()]
+        self.accept = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.accept[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            if scaled[high] < 1.0:
+                small.append(high)
+            else:
+                large.append(high)
+        # Whatever is left is 1 up to rounding error
+    
+    def _draw(self):
+        """Index of one sampled attack"""
+        column = int(self.rng.random() * len(self.attacks))
+        if self.rng.random() < self.accept[column]:
+            return column
+        return self.alias[column]
+    
+    def sample_attack(self):
+        """Draw one enemy attack as (hand type id, damage)"""
+        return self.attacks[self._draw()]
+    
+    def sample_result(self):
+        """Draw one enemy attack as the ScoreResult of a hand dealing it"""
+        return self.results[self._draw()]
+    
+    def sample(self):
+        """Draw the damage of one enemy attack"""
+        return self.attacks[self._draw()][1]
@@ -0,0 +1,296 @@
+import argparse
+import itertools
+import os
+import struct
+import numpy as np
+from advisor import RerollAdvisor, WILD
+from enemy_damage import enemy_damage_pmf
+
+# Binary table layout: header, float32 win probabilities, uint16 policy
+TABLE_MAGIC = b"DDFS"
+TABLE_VERSION = 2  # 2: the rules the tables were solved for are in the header
+TABLE_HEADER = struct.Struct("<4sHHIIIII8s")  # Ends with ScoringSystem.rules_hash() as 8 bytes
+PLAY = 0xFFFF  # Policy entry meaning "play the hand"
+
+# Where main() writes the tables and FightPolicy looks for them
+FIGHT_TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fight_tables.bin")
+
+
+def is_sequential_six(hand):
+    """Same test as DiceyDilemma.check_sequential_six for a canonical hand"""
+    wild_count = hand.count(WILD)
+    missing = [num for num in range(1, 7) if num not in hand]
+    return len(missing) <= wild_count
+
+
+def is_six_fours(hand):
+    """Same test as DiceyDilemma.check_six_fours for a canonical hand"""
+    return all(value == 4 or value == WILD for value in hand)
+
+
+def _bucket_split(positions):
+    """Split fractional bucket positions between the neighbouring buckets.
+    
+    Returns (low index, high index, weight of high). Positions at or below 0
+    mean death and get index 0; live positions never round down to 0.
+    """
+    alive = positions > 0
+    low = np.where(alive, np.maximum(np.floor(positions), 1), 0).astype(np.int64)
+    high = np.where(alive, np.ceil(positions), 0).astype(np.int64)
+    high_weight = np.where(high > low, positions - low, 0.0)
+    return low, high, high_weight
+
+
+class FightSolver:
+    """Offline solver for one fight against the current enemy.
+    
+    Shields absorb damage before health, so a combatant's state is its
+    health plus shield, bucketed into hp_bucket sized steps. Win
+    probabilities and the optimal hold for every (player HP, enemy HP,
+    rerolls left, hand) are found by sweeping enemy HP upwards, vectorized
+    over player HP and all 924 hands.
+    """
+    
+    def __init__(self, advisor=None, hp_bucket=500, player_max_hp=25100, enemy_max_hp=15100, max_rerolls=3):
+        self.advisor = advisor or RerollAdvisor()
+        self.scoring_system = self.advisor.scoring_system
+        self.hp_bucket = hp_bucket
+        self.player_buckets = -(-player_max_hp // hp_bucket)
+        self.enemy_buckets = -(-enemy_max_hp // hp_bucket)
+        self.max_rerolls = max_rerolls
+        
+        hands = self.advisor.full_hands
+        holds = self.advisor.holds
+        hold_index = {hold: i for i, hold in enumerate(holds)}
+        
+        self.hand_scores = np.array([self.advisor.play_scores[hand] for hand in hands], dtype=np.float64)
+        if self.hand_scores.min() < hp_bucket:
+            # Every play must cost the enemy at least one bucket
+            raise ValueError(f"hp_bucket must be at most {int(self.hand_scores.min())}")
+        
+        # Hands that skip the enemy turn (no power-ups owned) can be replayed until the enemy dies
+        self.free_replay = np.array([is_sequential_six(hand) or is_six_fours(hand) for hand in hands])
+        
+        # completion[i, j]: chance that rerolling the dice missing from hold i gives hand j
+        hand_index = {hand: j for j, hand in enumerate(hands)}
+        rows = {}
+        for hold in reversed(holds):
+            row = np.zeros(len(hands))
+            if len(hold) == self.advisor.hand_size:
+                row[hand_index[hold]] = 1.0
+            else:
+                for child, chance in self.advisor.add_die[hold]:
+                    row += chance * rows[child]
+            rows[hold] = row
+        self.completion = np.array([rows[hold] for hold in holds])
+        self.roll_row = self.completion[hold_index[()]]
+        
+        # Proper sub-holds of every hand (what can be kept when discarding at least one die),
+        # padded with a sentinel row that is never the best choice
+        sub_holds = []
+        for hand in hands:
+            subs = set()
+            for size in range(len(hand)):
+                for kept in _sub_multisets(hand, size):
+                    subs.add(hold_index[kept])
+            sub_holds.append(sorted(subs))
+        width = max(len(subs) for subs in sub_holds)
+        self.sentinel = len(holds)
+        self.sub_holds = np.array([subs + [self.sentinel] * (width - len(subs)) for subs in sub_holds])
+        
+        self.enemy_distribution = {damage: float(chance) for damage, chance in enemy_damage_pmf(self.scoring_system).items()}
+    
+    def _enemy_attack_matrix(self):
+        """transition[p, q]: chance the enemy attack moves the player from bucket p to q (0 = dead)"""
+        size = self.player_buckets + 1
+        transition = np.zeros((size, size))
+        player = np.arange(1, size, dtype=np.float64)
+        for damage, chance in self.enemy_distribution.items():
+            low, high, high_weight = _bucket_split(player - damage / self.hp_bucket)
+            np.add.at(transition, (np.arange(1, size), low), chance * (1 - high_weight))
+            np.add.at(transition, (np.arange(1, size), high), chance * high_weight)
+        transition[:, 0] = 0  # Dead players do not win
+        return transition
+    
+    def solve(self):
+        """Compute win probabilities and the optimal policy"""
+        player_size = self.player_buckets + 1
+        enemy_size = self.enemy_buckets + 1
+        hand_count = len(self.hand_scores)
+        
+        win = np.zeros((player_size, enemy_size))
+        win[1:, 0] = 1.0
+        after_enemy = np.zeros((player_size, enemy_size))
+        after_enemy[1:, 0] = 1.0
+        policy = np.full((self.max_rerolls, enemy_size, player_size, hand_count), PLAY, dtype=np.uint16)
+        transition = self._enemy_attack_matrix()
+        
+        for enemy in range(1, enemy_size):
+            # Value of playing each hand: the enemy takes the hit, then attacks back
+            low, high, high_weight = _bucket_split(enemy - self.hand_scores / self.hp_bucket)
+            play = ((1 - high_weight)[:, None] * after_enemy[:, low].T
+                    + high_weight[:, None] * after_enemy[:, high].T)
+            play[self.free_replay] = 1.0
+            play[:, 0] = 0.0
+            
+            # Rerolls: keep the best proper sub-hold, or play
+            value = play
+            for rerolls in range(1, self.max_rerolls + 1):
+                hold_value = np.vstack([self.completion @ value, np.full((1, player_size), -1.0)])
+                candidates = hold_value[self.sub_holds]
+                best = candidates.argmax(axis=1)
+                best_value = np.take_along_axis(candidates, best[:, None, :], axis=1)[:, 0, :]
+                keep_playing = play >= best_value
+                value = np.where(keep_playing, play, best_value)
+                chosen = np.take_along_axis(self.sub_holds, best, axis=1)
+                policy[rerolls - 1, enemy] = np.where(keep_playing, PLAY, chosen).T
+            
+            # A fresh roll at the start of the player's turn
+            win[:, enemy] = self.roll_row @ value
+            win[0, enemy] = 0.0
+            after_enemy[:, enemy] = transition @ win[:, enemy]
+        
+        return FightTables(self.hp_bucket, win.astype(np.float32), policy, self.advisor, self.scoring_system.rules_hash())
+    
+    def save(self, path):
+        """Solve and write the tables to path"""
+        tables = self.solve()
+        tables.save(path)
+        return tables
+
+
+def _sub_multisets(hand, size):
+    """Distinct sub-multisets of a sorted hand with the given size"""
+    seen = set()
+    for indices in itertools.combinations(range(len(hand)), size):
+        kept = tuple(hand[i] for i in indices)
+        if kept not in seen:
+            seen.add(kept)
+            yield kept
+
+
+class FightTables:
+    """Win probabilities and optimal holds produced by FightSolver
+    
+    rules_hash is ScoringSystem.rules_hash() of the rules the tables were
+    solved for (default: the advisor's rules).
+    """
+    
+    def __init__(self, hp_bucket, win, policy, advisor=None, rules_hash=None):
+        self.hp_bucket = hp_bucket
+        self.win = win
+        self.policy = policy
+        self.advisor = advisor or RerollAdvisor()
+        self.rules_hash = rules_hash or self.advisor.scoring_system.rules_hash()
+        self.rules_match = (None, False)  # (rules_key last checked, whether the tables were solved for it)
+        self.hand_index = {hand: i for i, hand in enumerate(self.advisor.full_hands)}
+    
+    def covers(self, player_hp, enemy_hp):
+        """Whether both HP totals are within the solved range (not clamped to its edge)"""
+        player_size, enemy_size = self.win.shape
+        return player_hp <= (player_size - 1) * self.hp_bucket and enemy_hp <= (enemy_size - 1) * self.hp_bucket
+    
+    def _bucket(self, hp, limit):
+        """Bucket index for an HP total (health plus shield)"""
+        return min(max(0, -(-hp // self.hp_bucket)), limit)
+    
+    def win_probability(self, player_hp, enemy_hp):
+        """Chance of winning the fight from the start of the player's turn"""
+        player_size, enemy_size = self.win.shape
+        return float(self.win[self._bucket(player_hp, player_size - 1), self._bucket(enemy_hp, enemy_size - 1)])
+    
+    def solved_for(self, scoring_system):
+        """Whether the tables were solved for a scoring system's current rules"""
+        rules_key = scoring_system.rules_key()
+        if self.rules_match[0] != rules_key:
+            self.rules_match = (rules_key, scoring_system.rules_hash() == self.rules_hash)
+        return self.rules_match[1]
+    
+    def suggest(self, core):
+        """Dice indices to discard in a GameCore's fight (None where the tables do not apply)
+        
+        The tables are solved for the level 1 fight, so they only apply there,
+        while both sides' HP is within the solved range and the game's scoring
+        rules are the ones they were solved for.
+        """
+        player, enemy = core.player, core.enemy
+        player_hp, enemy_hp = player.health + player.shield, enemy.health + enemy.shield
+        if core.current_level != 1 or not self.covers(player_hp, enemy_hp) or not self.solved_for(core.scoring_system):
+            return None
+        return self.advise(core.dice, core.rerolls_left, player_hp, enemy_hp)
+    
+    def advise(self, dice, rerolls_left, player_hp, enemy_hp):
+        """Dice indices to discard for the best chance of winning (empty means play)"""
+        if rerolls_left <= 0:
+            return []
+        rerolls_left = min(rerolls_left, self.policy.shape[0])
+        player_size, enemy_size = self.win.shape
+        symbols = [WILD if die.is_wild else die.value for die in dice]
+        hand = self.hand_index[tuple(sorted(symbols))]
+        choice = int(self.policy[rerolls_left - 1,
+                                 self._bucket(enemy_hp, enemy_size - 1),
+                                 self._bucket(player_hp, player_size - 1),
+                                 hand])
+        if choice == PLAY:
+            return []
+        
+        # Keep dice matching the chosen hold, discard the rest
+        keep = list(self.advisor.holds[choice])
+        discard = []
+        for i, symbol in enumerate(symbols):
+            if symbol in keep:
+                keep.remove(symbol)
+            else:
+                discard.append(i)
+        return discard
+    
+    def save(self, path):
+        """Write the tables in the compact binary format"""
+        rerolls, enemy_size, player_size, hand_count = self.policy.shape
+        with open(path, "wb") as f:
+            f.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, rerolls, self.hp_bucket, player_size, enemy_size,
+                                      hand_count, len(self.advisor.holds), bytes.fromhex(self.rules_hash)))
+            f.write(np.ascontiguousarray(self.win, dtype="<f4").tobytes())
+            f.write(np.ascontiguousarray(self.policy, dtype="<u2").tobytes())
+    
+    @classmethod
+    def load(cls, path, advisor=None):
+        """Memory-map tables written by save()
+        
+        With an advisor, the tables must have been solved for its rules.
+        """
+        with open(path, "rb") as f:
+            header = f.read(TABLE_HEADER.size)
+        if len(header) < TABLE_HEADER.size:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} fight table")
+        (magic, version, rerolls, hp_bucket, player_size, enemy_size, hand_count, hold_count,
+         rules_hash) = TABLE_HEADER.unpack(header)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} fight table")
+        rules_hash = rules_hash.hex()
+        if advisor is not None and advisor.scoring_system.rules_hash() != rules_hash:
+            raise ValueError(f"{path} was solved for other scoring rules")
+        
+        win = np.memmap(path, dtype="<f4", mode="r", offset=TABLE_HEADER.size, shape=(player_size, enemy_size))
+        policy = np.memmap(path, dtype="<u2", mode="r", offset=TABLE_HEADER.size + win.nbytes,
+                           shape=(rerolls, enemy_size, player_size, hand_count))
+        return cls(hp_bucket, win, policy, advisor, rules_hash)
+
+
+def main():
+    """Solve the level 1 fight and write the tables"""
+    parser = argparse.ArgumentParser(description="Solve a Dicey Dilemma fight and save the value tables")
+    parser.add_argument("--output", default=FIGHT_TABLES_PATH)
+    parser.add_argument("--hp-bucket", type=int, default=500)
+    parser.add_argument("--player-hp", type=int, default=25100, help="Player health plus shield")
+    parser.add_argument("--enemy-hp", type=int, default=15100, help="Enemy health plus shield")
+    args = parser.parse_args()
+    
+    solver = FightSolver(hp_bucket=args.hp_bucket, player_max_hp=args.player_hp, enemy_max_hp=args.enemy_hp)
+    tables = solver.save(args.output)
+    print(f"Win probability at full health: {tables.win_probability(args.player_hp, args.enemy_hp):.4f}")
+    print(f"Tables written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,19 @@
 import pygame
-import random
 import json
 import os
+import random
+from collections import deque
 from dice import Dice
-from enemy import Enemy
-from player import Player
 from ui import UI
-from scoring import ScoringSystem
+from game_core import GameCore
+from fight_solver import FightTables, FIGHT_TABLES_PATH
+from replay import save_recording
+
+# Every game is recorded here on exit, for `python replay.py last_replay.ddr`
+REPLAY_PATH = "last_replay.ddr"
 
 class DiceyDilemma:
-    def __init__(self, screen):
+    def __init__(self, screen, hand_size=6, faces=6, seed=None):
         self.screen = screen
         self.width, self.height = screen.get_size()
         
@@ -38,22 +42,17 @@ class DiceyDilemma:
             # If sound loading fails, continue without sound
             pass
         
-        # Initialize game components
-        self.player = Player(25000)  # Increased from 5000 to accommodate new enemy damage
-        self.enemy = None
-        self.dice = []
+        # Game rules live in the core; this class draws them and handles input.
+        # A fresh seed per game makes every game replayable from its recording.
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.core = GameCore(hand_size, faces, die_factory=Dice, seed=seed)
         self.ui = UI(self.width, self.height)
-        self.scoring_system = ScoringSystem()
-        
-        # Game state
-        self.game_state = "menu"  # menu, playing, enemy_turn, game_over, victory, shop
-        self.current_level = 1
-        self.rerolls_left = 3
+        self.show_hints = False
+        self.turbo = False  # Skip animation delays and run uncapped (T key)
         self.selected_dice = []
-        self.dice_rolled = False
-        self.enemy_turn_timer = 0
         self.display_message = ""
-        self.message_timer = 0
+        self.display_result = None  # ScoreResult filling in the message's template, if any
         
         # Shop state (new)
         self.shop_state = {
@@ -61,55 +60,99 @@ class DiceyDilemma:
             "active": False
         }
         
-        # Animation timers
-        self.enemy_glitch_timer = 0
-        self.player_glitch_timer = 0
-        self.glitch_intensity = 0
-        self.double_damage_timer = 0
-        self.second_attack_timer = 0
-        self.second_attack_score = 0
-        self.second_attack_message = ""
-        self.attack_count = 0
-        self.shield_shake_timer = 0
-        self.shield_upgrade_timer = 0
-        self.shield_upgrade_count = 0
-        self.shield_upgrade_message = ""
-        self.shield_upgrade_duration = 0
+        # Timed effects (message, enemy_glitch, player_glitch, glitch intensity,
+        # double_damage, shield_shake) end on a frame of the view's clock
+        self.clock = 0
+        self.effect_ends = {}
         
-        # Load high score
-        self.high_score = self.load_high_score()
+        # Core events held back by a chain's waits, as (clock frame, event)
+        self.animations = deque()
+        
+        # What each screen region showed when last drawn (None redraws everything)
+        self.drawn_regions = None
+        self.hint_cache = (None, ())  # (hand and HP, suggested discard)
         
-        # Initialize first enemy
-        self.spawn_new_enemy()
+        # The fight solver's tables, if solved, memory-mapped and shared with the bots
+        self.fight_tables = FightTables.load(FIGHT_TABLES_PATH) if os.path.exists(FIGHT_TABLES_PATH) else None
         
-        # Initialize dice
-        self.roll_dice()
+        # The game behind the open shop with the shop's backdrop over it,
+        # redrawn only when the game's regions change
+        self.shop_layer = pygame.Surface((self.width, self.height))
+        self.shop_layer_key = None
+        
+        # Load high score
+        self.high_score = self.load_high_score()
+    
+    def start_effect(self, name, frames):
+        """Show a timed effect for a number of frames"""
+        if self.turbo:
+            # Turbo skips animations but keeps each message up until the next one
+            frames = float("inf") if name == "message" and frames > 0 else 0
+        self.effect_ends[name] = self.clock + frames
+    
+    def toggle_turbo(self):
+        """Switch turbo mode on or off"""
+        self.turbo = not self.turbo
+        if not self.turbo:
+            # Messages shown in turbo stay up until the next one; end them now
+            for name, end in self.effect_ends.items():
+                if end == float("inf"):
+                    self.effect_ends[name] = self.clock
+        self.display_message = "Turbo on" if self.turbo else "Turbo off"
+        self.display_result = None
+        self.start_effect("message", 120)  # 2 seconds
     
-    def spawn_new_enemy(self):
-        """Spawn a new enemy with increasing health"""
-        base_health = 15000  # Increased from 3000 to accommodate new scoring
-        health_increase = 1.15 ** (self.current_level - 1)  # Increased from 1.1 to 1.15 for steeper scaling
-        enemy_health = int(base_health * health_increase)
-        
-        enemy_types = ["Dragon", "Goblin", "Orc", "Troll", "Demon", "Giant"]
-        enemy_type = random.choice(enemy_types)
-        
-        self.enemy = Enemy(enemy_type, enemy_health)
-        self.rerolls_left = 3
-        self.dice_rolled = False
+    def effect_frames(self, name):
+        """Frames left of a timed effect (0 once it has ended)"""
+        return max(0, self.effect_ends.get(name, 0) - self.clock)
     
-    def roll_dice(self):
-        """Roll 6 dice with 15% chance for wild card"""
-        self.dice = []
-        for i in range(6):
-            if random.random() < 0.15:  # 15% chance for wild card
-                die = Dice(i, 0, is_wild=True)
+    def handle_core_events(self):
+        """Show the core's events, queueing those after a wait for later frames"""
+        # The core has already resolved the whole chain; the queue only paces how it is shown
+        frame = self.animations[-1][0] if self.animations else self.clock
+        for event in self.core.pop_events():
+            if event[0] == "wait":
+                if not self.turbo:
+                    frame += event[1]
+            elif self.animations or frame > self.clock:
+                self.animations.append((frame, event))
             else:
-                value = random.randint(1, 6)
-                die = Dice(i, value, is_wild=False)
-            self.dice.append(die)
-        self.dice_rolled = True
-        self.selected_dice = []
+                self.show_event(event)
+    
+    def play_animations(self):
+        """Show the queued events that have come due"""
+        while self.animations and self.animations[0][0] <= self.clock:
+            self.show_event(self.animations.popleft()[1])
+    
+    def show_event(self, event):
+        """Turn a core event into sounds, animations and messages"""
+        kind = event[0]
+        if kind == "message":
+            self.display_message = event[1]
+            self.display_result = event[3] if len(event) > 3 else None
+            self.start_effect("message", event[2])
+        elif kind == "dice_rolled":
+            self.selected_dice = []
+        elif kind in ("player_attack", "bonus_attack"):
+            self.play_attack_sound(is_power_up=kind == "bonus_attack")
+            # Trigger enemy glitch animation
+            self.start_effect("enemy_glitch", 30)  # 0.5 seconds at 60 FPS
+            self.start_effect("glitch", 15)
+        elif kind == "enemy_attack":
+            self.play_attack_sound()
+            # Trigger player glitch animation
+            self.start_effect("player_glitch", 30)  # 0.5 seconds at 60 FPS
+            self.start_effect("glitch", 15)
+        elif kind == "line_em_up":
+            # Keep power-up active during all attacks
+            self.start_effect("double_damage", 90 + (event[1] * 90))  # 1.5s per attack
+        elif kind == "shield_upgrade":
+            self.play_attack_sound(is_power_up=True)
+            # Trigger shield shake animation
+            self.start_effect("shield_shake", 60)  # 1 second at 60 FPS
+        elif kind == "enemy_defeated":
+            self.play_attack_sound(is_death=True)
+            self.shop_state["active"] = True
     
     def handle_event(self, event):
         """Handle pygame events"""
@@ -118,10 +161,20 @@ class DiceyDilemma:
                 self.handle_click(event.pos)
         
         elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE and self.game_state == "playing":
-                self.roll_dice()
-            elif event.key == pygame.K_RETURN and self.game_state == "menu":
-                self.game_state = "playing"
+            if event.key == pygame.K_SPACE and self.core.game_state == "playing":
+                self.core.apply("roll_dice")
+            elif event.key == pygame.K_RETURN and self.core.game_state == "menu":
+                self.core.apply("start")
+            elif event.key == pygame.K_h:
+                # Toggle reroll hints
+                self.show_hints = not self.show_hints
+            elif event.key == pygame.K_t:
+                self.toggle_turbo()
+        
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            # The window was uncovered; push the whole screen again
+            self.drawn_regions = None
+        self.handle_core_events()
     
     def handle_shop_click(self, pos):
         """Handle clicks in the shop interface"""
@@ -142,70 +195,43 @@ class DiceyDilemma:
         if "continue_button_rect" in self.shop_state and self.shop_state["continue_button_rect"].collidepoint(x, y):
             # Continue to next level
             self.shop_state["active"] = False
-            self.game_state = "playing"
-            self.current_level += 1  # Increment level
-            self.spawn_new_enemy()
-            self.roll_dice()
+            self.core.apply("continue_to_next_level")
             return
         
         # Check restore tab items
         if self.shop_state["current_tab"] == "restore":
             if "health_restore_rect" in self.shop_state and self.shop_state["health_restore_rect"].collidepoint(x, y):
                 if self.shop_state.get("can_afford_health", False):
-                    # Purchase health restoration
-                    self.player.spend_gold(150)
-                    heal_amount = int(self.player.max_health * 0.3)
-                    self.player.heal(heal_amount)
-                    self.display_message = f"Health restored! +{heal_amount} HP"
-                    self.message_timer = 120  # 2 seconds
+                    self.core.apply("restore_health")
                     return
         
         # Check buy tab items
         if self.shop_state["current_tab"] == "buy":
             if "line_em_up_rect" in self.shop_state and self.shop_state["line_em_up_rect"].collidepoint(x, y):
                 if self.shop_state.get("can_afford_line_em_up", False):
-                    # Purchase Line 'em up power-up
-                    self.player.spend_gold(50)
-                    power_up = {
-                        "name": "Line 'em up",
-                        "description": "Six in a row = Double damage!",
-                        "cost": 50
-                    }
-                    if self.player.add_power_up(power_up):
-                        self.display_message = "Line 'em up power-up purchased!"
-                        self.message_timer = 120  # 2 seconds
-                    else:
-                        self.display_message = "No empty power-up slots!"
-                        self.message_timer = 120  # 2 seconds
+                    self.core.apply("buy_power_up", "Line 'em up")
                     return
             
             if "shield_of_dreams_rect" in self.shop_state and self.shop_state["shield_of_dreams_rect"].collidepoint(x, y):
                 if self.shop_state.get("can_afford_shield_of_dreams", False):
-                    # Purchase Shield Of Dreams power-up
-                    self.player.spend_gold(100)
-                    power_up = {
-                        "name": "Shield Of Dreams",
-                        "description": "Six fours = +25 max shield!",
-                        "cost": 100
-                    }
-                    if self.player.add_power_up(power_up):
-                        self.display_message = "Shield Of Dreams power-up purchased!"
-                        self.message_timer = 120  # 2 seconds
-                    else:
-                        self.display_message = "No empty power-up slots!"
-                        self.message_timer = 120  # 2 seconds
+                    self.core.apply("buy_power_up", "Shield Of Dreams")
                     return
     
     def handle_click(self, pos):
         """Handle mouse clicks"""
+        core = self.core
+        
+        # Wait for a power-up chain to finish showing
+        if self.animations:
+            return
+        
         # Handle shop clicks first
-        if self.game_state == "shop":
+        if core.game_state == "shop":
             self.handle_shop_click(pos)
-            return
         
-        if self.game_state == "playing":
+        elif core.game_state == "playing":
             # Check if dice were clicked
-            for i, die in enumerate(self.dice):
+            for i, die in enumerate(core.dice):
                 if die.rect.collidepoint(pos):
                     if i in self.selected_dice:
                         self.selected_dice.remove(i)
@@ -214,33 +240,22 @@ class DiceyDilemma:
                     break
             
             # Check if buttons were clicked
-            if self.ui.roll_button.collidepoint(pos) and not self.dice_rolled:
-                self.roll_dice()
-            elif self.ui.discard_button.collidepoint(pos) and self.dice_rolled and self.rerolls_left > 0:
-                self.discard_selected_dice()
-            elif self.ui.play_button.collidepoint(pos) and self.dice_rolled:
-                self.play_hand()
-        
-        elif self.game_state == "menu":
+            if self.ui.roll_button.collidepoint(pos) and not core.dice_rolled:
+                core.apply("roll_dice")
+            elif self.ui.discard_button.collidepoint(pos) and core.dice_rolled and core.rerolls_left > 0:
+                core.apply("discard", self.selected_dice)
+            elif self.ui.play_button.collidepoint(pos) and core.dice_rolled:
+                core.apply("play_hand")
+        
+        elif core.game_state == "menu":
             if self.ui.start_button.collidepoint(pos):
-                self.game_state = "playing"
+                core.apply("start")
         
-        elif self.game_state == "game_over":
+        elif core.game_state == "game_over":
             if self.ui.restart_button.collidepoint(pos):
-                self.restart_game()
-    
-    def discard_selected_dice(self):
-        """Discard selected dice and reroll them"""
-        if self.rerolls_left > 0 and self.selected_dice:
-            for i in self.selected_dice:
-                if random.random() < 0.15:  # 15% chance for wild card
-                    self.dice[i] = Dice(i, 0, is_wild=True)
-                else:
-                    value = random.randint(1, 6)
-                    self.dice[i] = Dice(i, value, is_wild=False)
-            
-            self.rerolls_left -= 1
-            self.selected_dice = []
+                core.apply("restart_game")
+        
+        self.handle_core_events()
     
     def play_attack_sound(self, is_power_up=False, is_death=False):
         """Play attack sound effect"""
@@ -258,342 +273,153 @@ class DiceyDilemma:
             # If sound playing fails, continue silently
             pass
     
-    def check_sequential_six(self, dice_values):
-        """Check if dice show 1,2,3,4,5,6 in any order"""
-        # Filter out wild dice (value 0) and get non-wild values
-        non_wild_values = [v for v in dice_values if v != 0]
-        wild_count = dice_values.count(0)
-        
-        # If we have wild dice, we need to check if the non-wild values can form a sequence
-        # and the wild dice can fill in the missing numbers
-        if wild_count > 0:
-            # Sort the non-wild values
-            sorted_non_wild = sorted(non_wild_values)
-            
-            # Check if we can form 1,2,3,4,5,6 with the available numbers and wild dice
-            required_numbers = [1, 2, 3, 4, 5, 6]
-            missing_numbers = []
-            
-            for num in required_numbers:
-                if num not in sorted_non_wild:
-                    missing_numbers.append(num)
-            
-            # If wild dice can fill all missing numbers, it's a sequential six
-            return len(missing_numbers) <= wild_count
-        else:
-            # No wild dice, just check if we have 1,2,3,4,5,6
-            sorted_values = sorted(dice_values)
-            result = sorted_values == [1, 2, 3, 4, 5, 6]
-            return result
-    
-    def check_six_fours(self, dice_values):
-        """Check if all dice show 4 (including stars/wild dice as fours)"""
-        return all(value == 4 or value == 0 for value in dice_values)
-    
-    def play_hand(self):
-        """Play the current dice hand"""
-        # Calculate score
-        dice_values = [die.value for die in self.dice]
-        wild_dice = [i for i, die in enumerate(self.dice) if die.is_wild]
-        
-        score, scoring_hand, calculation = self.scoring_system.calculate_score(dice_values, wild_dice)
-        
-        # Deal damage to enemy
-        self.enemy.take_damage(score)
-        
-        # Play attack sound
-        self.play_attack_sound()
-        
-        # Trigger enemy glitch animation
-        self.enemy_glitch_timer = 30  # 0.5 seconds at 60 FPS
-        self.glitch_intensity = 15
-        
-        # Reset rerolls for next turn
-        self.rerolls_left = 3
-        
-        # Display result
-        self.display_message = f"{scoring_hand}: {calculation} = {score} damage!"
-        self.message_timer = 180  # 3 seconds at 60 FPS
-        
-        # Check for "Line 'em up" power-up activation
-        has_power_up = self.player.has_power_up("Line 'em up")
-        is_sequential = self.check_sequential_six(dice_values)
-        
-        # Check for "Shield Of Dreams" power-up activation
-        has_shield_power_up = self.player.has_power_up("Shield Of Dreams")
-        is_six_fours = self.check_six_fours(dice_values)
-        
-        # Check if enemy is defeated
-        if self.enemy.health <= 0:
-            self.enemy_defeated()
+    def update(self):
+        """Update game state"""
+        if self.turbo:
+            # Run the next delayed action now instead of waiting for it
+            self.core.advance()
         else:
-            # Only start power-up attacks if enemy is still alive
-            if has_power_up and is_sequential:
-                # Count how many "Line 'em up" power-ups the player has
-                power_up_count = self.player.get_power_up_count("Line 'em up")
-                
-                # Trigger first attack
-                self.display_message = f"{scoring_hand}: {calculation} = {score} damage!"
-                self.message_timer = 90  # 1.5 seconds for first attack
-                
-                # Set up multiple attacks based on power-up count
-                self.second_attack_timer = 90  # 1.5 second delay before second attack
-                self.second_attack_score = score
-                self.second_attack_message = f"{scoring_hand}: {calculation} = {score} damage! + Line 'em up: Double damage!"
-                self.attack_count = power_up_count  # Track how many attacks to perform
-                
-                # Keep power-up active during all attacks
-                self.double_damage_timer = 90 + (power_up_count * 90)  # 1.5s per attack
-            elif is_sequential:
-                # Check if it was a sequential six but no power-up
-                self.display_message = f"{scoring_hand}: {calculation} = {score} damage! (Sequential six - buy Line 'em up for double damage!)"
-                self.message_timer = 180  # 3 seconds at 60 FPS
-            else:
-                # Check for Shield Of Dreams activation
-                if has_shield_power_up and is_six_fours:
-                    # Count how many "Shield Of Dreams" power-ups the player has
-                    shield_power_up_count = self.player.get_power_up_count("Shield Of Dreams")
-                    
-                    # Upgrade shield permanently (first upgrade)
-                    old_max_shield = self.player.max_shield
-                    self.player.max_shield += 25
-                    self.player.shield = self.player.max_shield  # Fill up to new maximum
-                    
-                    # Play power-up sound
-                    self.play_attack_sound(is_power_up=True)
-                    
-                    # Trigger shield shake animation
-                    self.shield_shake_timer = 60  # 1 second at 60 FPS
-                    
-                    # Display first shield upgrade message
-                    self.display_message = f"{scoring_hand}: {calculation} = {score} damage! + Shield Of Dreams: +25 max shield! ({old_max_shield} → {self.player.max_shield})"
-                    self.message_timer = 90  # 1.5 seconds for first upgrade
-                    
-                    # Set up multiple shield upgrades based on power-up count
-                    self.shield_upgrade_timer = 90  # 1.5 second delay before second upgrade
-                    self.shield_upgrade_count = shield_power_up_count - 1  # Track remaining upgrades
-                    self.shield_upgrade_message = f"Shield Of Dreams: +25 max shield! ({self.player.max_shield} → {self.player.max_shield + 25})"
-                    
-                    # Keep shield upgrade active during all upgrades
-                    self.shield_upgrade_duration = 90 + (shield_power_up_count * 90)  # 1.5s per upgrade
-                elif is_six_fours:
-                    # Check if it was six fours but no power-up
-                    self.display_message = f"{scoring_hand}: {calculation} = {score} damage! (Six fours - buy Shield Of Dreams for +25 max shield!)"
-                    self.message_timer = 180  # 3 seconds at 60 FPS
-                else:
-                    # Only start enemy turn if no power-up attacks or shield upgrades are pending
-                    if (self.second_attack_timer == 0 and self.attack_count == 0 and 
-                        self.shield_upgrade_timer == 0 and self.shield_upgrade_count == 0):
-                        self.game_state = "enemy_turn"
-                        self.enemy_turn_timer = 60  # 1 second delay
-                    else:
-                        # Keep in playing state until all attacks/upgrades are complete
-                        self.game_state = "playing"
-    
-    def enemy_turn(self):
-        """Enemy's turn to roll and attack"""
-        # Check if enemy is already defeated
-        if self.enemy.health <= 0:
-            self.enemy_defeated()
-            return
-        
-        # Enemy rolls dice
-        enemy_dice = []
-        for i in range(6):
-            if random.random() < 0.15:
-                enemy_dice.append(0)  # Wild card
-            else:
-                enemy_dice.append(random.randint(1, 6))
-        
-        # Calculate enemy score
-        score, scoring_hand, calculation = self.scoring_system.calculate_score(enemy_dice, [])
-        
-        # Deal damage to player
-        self.player.take_damage(score)
-        
-        # Play enemy attack sound
-        self.play_attack_sound()
-        
-        # Trigger player glitch animation
-        self.player_glitch_timer = 30  # 0.5 seconds at 60 FPS
-        self.glitch_intensity = 15
+            self.core.tick()
+        self.handle_core_events()
         
-        # Display result
-        self.display_message = f"Enemy {scoring_hand}: {calculation} = {score} damage!"
-        self.message_timer = 180
-        
-        # Check if player is defeated
-        if self.player.health <= 0:
-            self.game_over()
-        else:
-            self.game_state = "playing"
-            self.roll_dice()
+        # The enemy's turn comes before the effects' clock moves on,
+        # the steps of power-up chains after it
+        self.clock += 1
+        self.play_animations()
     
-    def enemy_defeated(self):
-        """Handle enemy defeat"""
-        # Play death sound
-        self.play_attack_sound(is_death=True)
-        
-        # Calculate gold reward based on current level and enemy health
-        # Higher levels and tougher enemies give more gold
-        base_gold = 50  # Base gold per level
-        level_bonus = self.current_level * 10  # More gold for higher levels
-        enemy_health_bonus = self.enemy.max_health // 100  # Bonus based on enemy toughness
-        
-        gold_earned = base_gold + level_bonus + enemy_health_bonus
-        self.player.earn_gold(gold_earned)
-        
-        # Heal player by 15%
-        heal_amount = int(self.player.max_health * 0.15)
-        self.player.heal(heal_amount)
-        
-        # Refill shield
-        self.player.refill_shield()
-        
-        # Display victory message
-        self.display_message = f"Enemy defeated! +{heal_amount} HP, +{gold_earned} Gold. Shield restored!"
-        self.message_timer = 180  # 3 seconds
-        
-        # Open shop instead of immediately spawning new enemy
-        self.game_state = "shop"
-        self.shop_state["active"] = True
+    def hinted_dice(self):
+        """Dice hinted for discarding: the fight tables' choice where they apply, else the advisor's"""
+        core = self.core
+        if not (self.show_hints and core.game_state == "playing" and core.dice_rolled):
+            return ()
+        # Ask again only when the hand or the fight changes
+        hand = (tuple((die.value, die.is_wild) for die in core.dice), core.rerolls_left, core.current_level,
+                core.player.health, core.player.shield, core.enemy.health, core.enemy.shield)
+        if self.hint_cache[0] != hand:
+            discard = self.fight_tables.suggest(core) if self.fight_tables is not None else None
+            if discard is None:
+                discard = core.get_suggested_discard()
+            self.hint_cache = (hand, tuple(discard))
+        return self.hint_cache[1]
     
-    def game_over(self):
-        """Handle game over"""
-        self.game_state = "game_over"
-        self.display_message = f"Game Over! Level reached: {self.current_level}"
-        self.message_timer = 300  # 5 seconds
+    def active_power_up(self):
+        """Name of the power-up to highlight (None if none is working)"""
+        if self.effect_frames("double_damage") > 0 or any(event[0] == "bonus_attack" for frame, event in self.animations):
+            return "Line 'em up"
+        return None
     
-    def restart_game(self):
-        """Restart the game"""
-        self.player = Player(25000)  # Increased from 5000 to accommodate new enemy damage
-        self.current_level = 1
-        self.spawn_new_enemy()
-        self.roll_dice()
-        self.game_state = "playing"
-        self.display_message = ""
-        self.message_timer = 0
-    
-    def update(self):
-        """Update game state"""
-        if self.game_state == "enemy_turn":
-            self.enemy_turn_timer -= 1
-            if self.enemy_turn_timer <= 0:
-                self.enemy_turn()
-        
-        if self.message_timer > 0:
-            self.message_timer -= 1
-        
-        # Update animation timers
-        if self.enemy_glitch_timer > 0:
-            self.enemy_glitch_timer -= 1
-        if self.player_glitch_timer > 0:
-            self.player_glitch_timer -= 1
-        if self.glitch_intensity > 0:
-            self.glitch_intensity -= 1
-        if self.double_damage_timer > 0:
-            self.double_damage_timer -= 1
-        if self.shield_shake_timer > 0:
-            self.shield_shake_timer -= 1
-        if self.shield_upgrade_timer > 0:
-            self.shield_upgrade_timer -= 1
-            # Trigger additional shield upgrade when timer reaches 0
-            if self.shield_upgrade_timer == 0:
-                # Upgrade shield again
-                old_max_shield = self.player.max_shield
-                self.player.max_shield += 25
-                self.player.shield = self.player.max_shield  # Fill up to new maximum
-                
-                # Play power-up sound
-                self.play_attack_sound(is_power_up=True)
-                
-                # Trigger shield shake animation again
-                self.shield_shake_timer = 60  # 1 second at 60 FPS
-                
-                # Show shield upgrade message
-                self.display_message = self.shield_upgrade_message
-                self.message_timer = 90  # 1.5 seconds
-                
-                # If we have more upgrades to perform, set up the next one
-                self.shield_upgrade_count -= 1
-                if self.shield_upgrade_count > 0:
-                    self.shield_upgrade_timer = 90  # 1.5 second delay before next upgrade
-                    self.shield_upgrade_message = f"Shield Of Dreams: +25 max shield! ({self.player.max_shield} → {self.player.max_shield + 25})"
-                else:
-                    # All upgrades complete, start enemy turn
-                    self.game_state = "enemy_turn"
-                    self.enemy_turn_timer = 60  # 1 second delay
-        if self.second_attack_timer > 0:
-            self.second_attack_timer -= 1
-            # Trigger second attack when timer reaches 0
-            if self.second_attack_timer == 0:
-                # Check if enemy is still alive before attacking
-                if self.enemy.health > 0:
-                    # Deal additional damage
-                    self.enemy.take_damage(self.second_attack_score)
-                    
-                    # Play power-up attack sound
-                    self.play_attack_sound(is_power_up=True)
-                    
-                    # Trigger enemy glitch animation again
-                    self.enemy_glitch_timer = 30  # 0.5 seconds at 60 FPS
-                    self.glitch_intensity = 15
-                    
-                    # Show attack message
-                    self.display_message = self.second_attack_message
-                    self.message_timer = 90  # 1.5 seconds
-                    
-                    # If we have more attacks to perform, set up the next one
-                    self.attack_count -= 1
-                    if self.attack_count > 0:
-                        self.second_attack_timer = 90  # 1.5 second delay before next attack
-                    else:
-                        # All attacks complete, start enemy turn
-                        self.game_state = "enemy_turn"
-                        self.enemy_turn_timer = 60  # 1 second delay
-                else:
-                    # Enemy is dead, stop power-up attacks and go to victory
-                    self.enemy_defeated()
+    def screen_regions(self):
+        """What each region of the screen shows, as {name: (rect, key)}
+        
+        A region is redrawn when its key changes. Glitches and shakes move
+        every frame, so the clock is part of the combatants' key while one runs.
+        """
+        core = self.core
+        game_state = core.game_state
+        screen_rect = self.screen.get_rect()
+        if game_state == "menu":
+            return {"screen": (screen_rect, ("menu", self.high_score))}
+        if game_state == "game_over":
+            return {"screen": (screen_rect, ("game_over", core.current_level, self.high_score))}
+        
+        player = core.player
+        enemy = core.enemy
+        moving = any(self.effect_frames(name) > 0 for name in ("enemy_glitch", "player_glitch", "shield_shake"))
+        ui = self.ui
+        regions = {
+            # Characters (with room for the glitch offsets), health and shield bars
+            "combatants": (pygame.Rect(0, 0, self.width, 230),
+                           (player.health, player.max_health, player.shield, player.max_shield, enemy.enemy_type,
+                            enemy.health, enemy.max_health, enemy.shield, enemy.max_shield, moving and self.clock)),
+            "status": (pygame.Rect(0, 230, self.width, ui.medium_font.get_height()), (core.rerolls_left, player.get_gold())),
+            "power_ups": (ui.power_up_boxes[0].unionall(ui.power_up_boxes[1:]),
+                          (tuple(p and p["name"] for p in player.power_ups), self.active_power_up())),
+            "buttons": (ui.roll_button.unionall([ui.discard_button, ui.play_button]),
+                        (core.dice_rolled, bool(core.dice_rolled and core.rerolls_left > 0 and self.selected_dice))),
+            "message": (pygame.Rect(0, self.height//2 - 40, self.width, 80),
+                        (self.display_message, self.display_result) if self.effect_frames("message") > 0 else None)
+        }
+        hinted = self.hinted_dice()
+        for die in core.dice:
+            regions[f"die {die.index}"] = (die.rect, (die.value, die.is_wild, die.index in self.selected_dice, die.index in hinted))
+        
+        if game_state == "shop" and not self.animations:
+            # The shop overlay covers the whole screen, game included
+            game_keys = tuple(regions[name][1] for name in sorted(regions))
+            return {"screen": (screen_rect, ("shop", self.shop_state["current_tab"], game_keys))}
+        return regions
     
     def draw(self):
-        """Draw the game"""
+        """Redraw the parts of the screen that changed and return their rects
+        
+        Nothing is drawn while the screen stays the same, so an idle game
+        costs next to nothing; pass the rects to pygame.display.update.
+        """
+        regions = self.screen_regions()
+        if self.drawn_regions is None:
+            dirty = [self.screen.get_rect()]
+        else:
+            dirty = [rect for name, (rect, key) in regions.items() if self.drawn_regions.get(name) != (rect, key)]
+            # Regions that are gone (the screen changed) are redrawn as well
+            dirty += [rect for name, (rect, key) in self.drawn_regions.items() if name not in regions]
+        self.drawn_regions = regions
+        if not dirty:
+            return []
+        
+        # Everything is drawn as before, but only pixels inside the changed regions are touched
+        self.screen.set_clip(dirty[0].unionall(dirty[1:]))
         self.screen.fill((0, 0, 0))  # Black background
         
-        if self.game_state == "shop":
-            # Draw game state behind shop
-            self.draw_game()
+        game_state = self.core.game_state
+        if game_state == "shop" and not self.animations:
+            # Draw game state behind shop, with the shop's backdrop, once per change of the game's regions
+            game_keys = regions["screen"][1][-1]
+            if self.shop_layer_key != game_keys:
+                self.shop_layer.fill((0, 0, 0))
+                self.draw_game(self.shop_layer)
+                self.ui.draw_shop_background(self.shop_layer)
+                self.shop_layer_key = game_keys
+            self.screen.blit(self.shop_layer, (0, 0))
             # Draw shop overlay
-            self.ui.draw_shop_ui(self.screen, self.player, self.shop_state)
-        elif self.game_state == "menu":
+            self.ui.draw_shop_contents(self.screen, self.core.player, self.shop_state)
+        elif game_state == "menu":
             self.ui.draw_menu(self.screen, self.high_score)
-        elif self.game_state == "playing":
-            self.draw_game()
-        elif self.game_state == "enemy_turn":
+        elif game_state in ("playing", "enemy_turn", "shop"):
             self.draw_game()
-        elif self.game_state == "game_over":
-            self.ui.draw_game_over(self.screen, self.current_level, self.high_score)
+        elif game_state == "game_over":
+            self.ui.draw_game_over(self.screen, self.core.current_level, self.high_score)
+        self.screen.set_clip(None)
+        return dirty
     
-    def draw_game(self):
-        """Draw the main game screen"""
+    def draw_game(self, screen=None):
+        """Draw the main game screen (on the display unless given another surface)"""
+        if screen is None:
+            screen = self.screen
+        core = self.core
+        
         # Draw player and enemy
-        self.ui.draw_combatants(self.screen, self.player, self.enemy, self.enemy_glitch_timer, self.player_glitch_timer, self.glitch_intensity, self.shield_shake_timer)
+        self.ui.draw_combatants(screen, core.player, core.enemy, self.effect_frames("enemy_glitch"),
+                                self.effect_frames("player_glitch"), self.effect_frames("glitch"),
+                                self.effect_frames("shield_shake"))
         
         # Draw dice
-        for die in self.dice:
-            die.draw(self.screen, die.index in self.selected_dice)
+        for die in core.dice:
+            die.draw(screen, die.index in self.selected_dice)
+        
+        # Highlight the advisor's suggested discards
+        hinted = self.hinted_dice()
+        if hinted:
+            self.ui.draw_dice_hints(screen, core.dice, hinted)
         
         # Draw UI
-        self.ui.draw_game_ui(self.screen, self.rerolls_left, self.dice_rolled, self.selected_dice, self.player)
+        self.ui.draw_game_ui(screen, core.rerolls_left, core.dice_rolled, self.selected_dice, core.player)
         
         # Draw power-up boxes with active power-up highlighting
-        active_power_up = None
-        if self.double_damage_timer > 0 or self.second_attack_timer > 0:
-            active_power_up = "Line 'em up"
-        self.ui.draw_power_up_boxes(self.screen, self.player, active_power_up)
+        self.ui.draw_power_up_boxes(screen, core.player, self.active_power_up())
         
         # Draw message
-        if self.message_timer > 0:
-            self.ui.draw_message(self.screen, self.display_message)
+        if self.effect_frames("message") > 0:
+            self.ui.draw_message(screen, self.display_message, self.display_result)
     
     def load_high_score(self):
         """Load high score from file"""
@@ -606,6 +432,13 @@ class DiceyDilemma:
             pass
         return 0
     
+    def save_recording(self):
+        """Save this game's seed and inputs so it can be replayed exactly"""
+        try:
+            save_recording(self.core.recording(), REPLAY_PATH)
+        except:
+            pass
+    
     def save_high_score(self):
         """Save high score to file"""
         try:
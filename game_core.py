@@ -0,0 +1,545 @@
+import random
+from enemy import Enemy
+from player import Player
+from scoring import ScoringSystem
+from advisor import RerollAdvisor
+from enemy_damage import EnemyDamageSampler
+from scheduler import Scheduler
+
+PLAYER_MAX_HEALTH = 25000  # Increased from 5000 to accommodate new enemy damage
+WILD_CHANCE = 0.15  # Chance for each die to roll a wild card
+REROLLS_PER_TURN = 3
+ENEMY_TYPES = ["Dragon", "Goblin", "Orc", "Troll", "Demon", "Giant"]
+
+# Shop items
+POWER_UPS = {
+    "Line 'em up": {
+        "name": "Line 'em up",
+        "description": "Six in a row = Double damage!",
+        "cost": 50
+    },
+    "Shield Of Dreams": {
+        "name": "Shield Of Dreams",
+        "description": "Six fours = +25 max shield!",
+        "cost": 100
+    }
+}
+HEALTH_RESTORE_COST = 150
+
+# Balance constants a GameCore can override (see balance_sweep.py)
+DEFAULT_BALANCE = {
+    "player_max_health": PLAYER_MAX_HEALTH,
+    "enemy_base_health": 15000,  # Increased from 3000 to accommodate new scoring
+    "enemy_health_growth": 1.15,  # Increased from 1.1 to 1.15 for steeper scaling
+    "victory_heal": 0.15,  # Share of max health healed after each victory
+    "line_em_up_cost": POWER_UPS["Line 'em up"]["cost"],
+    "shield_of_dreams_cost": POWER_UPS["Shield Of Dreams"]["cost"],
+    "health_restore_cost": HEALTH_RESTORE_COST
+}
+
+# Balance keys holding each power-up's price
+POWER_UP_COSTS = {
+    "Line 'em up": "line_em_up_cost",
+    "Shield Of Dreams": "shield_of_dreams_cost"
+}
+
+# Frames between the steps of a power-up chain, and before the enemy's turn
+CHAIN_STEP_FRAMES = 90
+ENEMY_TURN_DELAY = 60
+
+# Player actions a view sends through GameCore.apply, which logs them for replays
+INPUT_ACTIONS = ("start", "roll_dice", "discard", "play_hand", "buy_power_up", "restore_health",
+                 "continue_to_next_level", "restart_game")
+
+# Independent random streams: the player's dice, the enemy's dice and the enemy type
+RNG_STREAMS = ("dice", "enemy", "spawn")
+
+
+def rng_streams(seed=None):
+    """One random.Random per stream derived from seed (the shared random module if seed is None)"""
+    if seed is None:
+        return {name: random for name in RNG_STREAMS}
+    return {name: random.Random(f"{seed}/{name}") for name in RNG_STREAMS}
+
+
+class Die:
+    """A die without any rendering, for headless games"""
+    
+    def __init__(self, index, value, is_wild=False):
+        self.index = index
+        self.value = value
+        self.is_wild = is_wild
+
+
+class GameCore:
+    """Rules of Dicey Dilemma without pygame: combat, power-ups, shop and levels.
+    
+    Actions change the state and queue events (attacks, messages, sounds to
+    play) for a view to drain with pop_events(). Power-up chains resolve at
+    once, with ("wait", frames) events pacing their animation in the view.
+    The enemy's turn happens after a delay counted in frames: a view calls
+    tick() once per frame, while headless games call advance() to jump to it.
+    
+    With a seed, every random draw comes from the core's own streams and the
+    inputs sent through apply() are logged by frame, so recording() holds
+    everything replay.py needs to play the game again exactly.
+    """
+    
+    def __init__(self, hand_size=6, faces=6, scoring_system=None, die_factory=Die, balance=None,
+                 seed=None, rngs=None):
+        self.balance = dict(DEFAULT_BALANCE, **(balance or {}))
+        self.seed = seed
+        self.rngs = dict(rng_streams(seed), **(rngs or {}))  # See RNG_STREAMS
+        self.hand_size = hand_size
+        self.faces = faces
+        self.scoring_system = scoring_system or ScoringSystem(hand_size=hand_size, faces=faces)
+        self.die_factory = die_factory  # Called as die_factory(index, value, is_wild)
+        self.advisor = None  # Built on first use (about 0.1s), then instant
+        
+        # Fast enemy turns sample damage from the exact distribution instead of rolling dice
+        self.fast_enemy_turns = False
+        self.enemy_damage_sampler = None
+        
+        self.player = Player(self.balance["player_max_health"])
+        self.enemy = None
+        self.dice = []
+        self.events = []
+        
+        # Game state
+        self._game_state = "menu"  # menu, playing, enemy_turn, game_over, shop
+        self.current_level = 1
+        self.rerolls_left = REROLLS_PER_TURN
+        self.dice_rolled = False
+        
+        # Delayed actions by the frame they come due (power-up chains resolve
+        # at once, so only the enemy's turn is ever scheduled)
+        self.scheduler = Scheduler()
+        self.input_log = []  # [frame, action, args] of every input sent through apply()
+        
+        # Power-up chains in progress
+        self.second_attack_score = 0
+        self.second_attack_result = None
+        self.attack_count = 0
+        self.shield_upgrade_count = 0
+        
+        # Initialize first enemy
+        self.spawn_new_enemy()
+        
+        # Initialize dice
+        self.roll_dice()
+    
+    def pop_events(self):
+        """Return and clear the events queued since the last call"""
+        events = self.events
+        self.events = []
+        return events
+    
+    def _message(self, text, frames, result=None):
+        """Queue a message to show for a number of frames
+        
+        With a ScoreResult, text is a template for its {hand}, {calculation}
+        and {score}, filled in only when the view shows it.
+        """
+        if result is None:
+            self.events.append(("message", text, frames))
+        else:
+            self.events.append(("message", text, frames, result))
+    
+    @property
+    def game_state(self):
+        """menu, playing, enemy_turn, game_over or shop"""
+        return self._game_state
+    
+    @game_state.setter
+    def game_state(self, state):
+        # The enemy's turn only comes while it is the enemy's turn. Once the game
+        # moves on, only _start_enemy_turn brings it back, with a fresh delay.
+        if state != "enemy_turn":
+            self.scheduler.cancel("enemy_turn")
+        self._game_state = state
+    
+    @property
+    def frame(self):
+        """Frames ticked so far"""
+        return self.scheduler.now
+    
+    @property
+    def schedule(self):
+        """{action: frames left} of every delayed action"""
+        return self.scheduler.pending()
+    
+    def _wait(self, frames):
+        """Pause the view's animations between the steps of a chain"""
+        self.events.append(("wait", frames))
+    
+    def _schedule(self, action, frames):
+        """Run a delayed action after a number of frames"""
+        self.scheduler.schedule(action, frames)
+        self.events.append(("schedule", action, frames))
+    
+    def _roll_die(self, index):
+        """Roll one die with 15% chance for wild card"""
+        rng = self.rngs["dice"]
+        if rng.random() < WILD_CHANCE:
+            return self.die_factory(index, 0, True)
+        return self.die_factory(index, rng.randint(1, self.faces), False)
+    
+    def apply(self, action, *args):
+        """Perform a player action (one of INPUT_ACTIONS), logging it for replays"""
+        if action not in INPUT_ACTIONS:
+            raise ValueError(f"Unknown input action {action!r}")
+        args = [list(arg) if isinstance(arg, (list, tuple)) else arg for arg in args]
+        self.input_log.append([self.frame, action, args])
+        return getattr(self, action)(*args)
+    
+    def recording(self):
+        """Everything needed to replay this game: settings, seed and the input log"""
+        return {
+            "seed": self.seed,
+            "hand_size": self.hand_size,
+            "faces": self.faces,
+            "balance": dict(self.balance),
+            "fast_enemy_turns": self.fast_enemy_turns,
+            "frames": self.frame,
+            "inputs": [list(entry) for entry in self.input_log]
+        }
+    
+    def start(self):
+        """Leave the menu and start playing"""
+        self.game_state = "playing"
+    
+    def spawn_new_enemy(self):
+        """Spawn a new enemy with increasing health"""
+        base_health = self.balance["enemy_base_health"]
+        health_increase = self.balance["enemy_health_growth"] ** (self.current_level - 1)
+        enemy_health = int(base_health * health_increase)
+        
+        enemy_type = self.rngs["spawn"].choice(ENEMY_TYPES)
+        
+        self.enemy = Enemy(enemy_type, enemy_health)
+        self.rerolls_left = REROLLS_PER_TURN
+        self.dice_rolled = False
+    
+    def roll_dice(self):
+        """Roll a full hand of dice"""
+        self.dice = [self._roll_die(i) for i in range(self.hand_size)]
+        self.dice_rolled = True
+        self.events.append(("dice_rolled",))
+    
+    def discard(self, indices):
+        """Reroll the dice at the given indices, using up one reroll"""
+        if self.rerolls_left > 0 and indices:
+            for i in indices:
+                self.dice[i] = self._roll_die(i)
+            
+            self.rerolls_left -= 1
+            self.events.append(("dice_rolled",))
+            return True
+        return False
+    
+    def get_suggested_discard(self):
+        """Get the dice the advisor suggests discarding (empty means play)"""
+        if self.advisor is None:
+            self.advisor = RerollAdvisor(self.scoring_system)
+            self.advisor.build(REROLLS_PER_TURN)
+        discard, expected_score, options = self.advisor.advise(self.dice, self.rerolls_left)
+        return discard
+    
+    def check_sequential_six(self, dice_values):
+        """Check if dice show 1,2,3,4,5,6 in any order (wild dice fill the gaps)"""
+        # Filter out wild dice (value 0) and get non-wild values
+        non_wild_values = set(v for v in dice_values if v != 0)
+        wild_count = dice_values.count(0)
+        
+        # A run as long as the hand, or every face for dice with fewer faces than the hand
+        run_length = min(len(dice_values), self.faces)
+        for start in range(1, self.faces - run_length + 2):
+            missing_numbers = [num for num in range(start, start + run_length) if num not in non_wild_values]
+            # If wild dice can fill all missing numbers, it's a sequential six
+            if len(missing_numbers) <= wild_count:
+                return True
+        return False
+    
+    def check_six_fours(self, dice_values):
+        """Check if all dice show 4 (including stars/wild dice as fours)"""
+        return all(value == 4 or value == 0 for value in dice_values)
+    
+    def play_hand(self):
+        """Play the current dice hand"""
+        # Calculate score
+        dice_values = [die.value for die in self.dice]
+        wild_dice = [i for i, die in enumerate(self.dice) if die.is_wild]
+        
+        result = self.scoring_system.calculate_score(dice_values, wild_dice)
+        score = result.score
+        
+        # Deal damage to enemy
+        self.enemy.take_damage(score)
+        self.events.append(("player_attack", score))
+        
+        # Reset rerolls for next turn
+        self.rerolls_left = REROLLS_PER_TURN
+        
+        # Display result
+        self._message("{hand}: {calculation} = {score} damage!", 180, result)  # 3 seconds at 60 FPS
+        
+        # Check for "Line 'em up" power-up activation
+        has_power_up = self.player.has_power_up("Line 'em up")
+        is_sequential = self.check_sequential_six(dice_values)
+        
+        # Check for "Shield Of Dreams" power-up activation
+        has_shield_power_up = self.player.has_power_up("Shield Of Dreams")
+        is_six_fours = self.check_six_fours(dice_values)
+        
+        # Check if enemy is defeated
+        if self.enemy.health <= 0:
+            self.enemy_defeated()
+        else:
+            # Only start power-up attacks if enemy is still alive
+            if has_power_up and is_sequential:
+                # Count how many "Line 'em up" power-ups the player has
+                power_up_count = self.player.get_power_up_count("Line 'em up")
+                
+                # Trigger first attack
+                self._message("{hand}: {calculation} = {score} damage!", 90, result)  # 1.5 seconds for first attack
+                
+                # One more attack per power-up, resolved now
+                self.second_attack_score = score
+                self.second_attack_result = result
+                self.attack_count = power_up_count  # Track how many attacks to perform
+                self.events.append(("line_em_up", power_up_count))
+                self._resolve_chain(self.bonus_attack)
+            elif is_sequential:
+                # Sequential six without the power-up: no enemy turn follows
+                self._message("{hand}: {calculation} = {score} damage! (Sequential six - buy Line 'em up for double damage!)", 180, result)
+            else:
+                # Check for Shield Of Dreams activation
+                if has_shield_power_up and is_six_fours:
+                    # Count how many "Shield Of Dreams" power-ups the player has
+                    shield_power_up_count = self.player.get_power_up_count("Shield Of Dreams")
+                    
+                    # Upgrade shield permanently (first upgrade)
+                    old_max_shield = self._upgrade_shield()
+                    
+                    # Display first shield upgrade message
+                    self._message(f"{{hand}}: {{calculation}} = {{score}} damage! + Shield Of Dreams: +25 max shield! ({old_max_shield} → {self.player.max_shield})", 90, result)
+                    
+                    # The remaining upgrades, resolved now
+                    self.shield_upgrade_count = shield_power_up_count - 1  # Track remaining upgrades
+                    self._resolve_chain(self.shield_upgrade)
+                elif is_six_fours:
+                    # Six fours without the power-up: no enemy turn follows
+                    self._message("{hand}: {calculation} = {score} damage! (Six fours - buy Shield Of Dreams for +25 max shield!)", 180, result)
+                else:
+                    # Only start enemy turn if no power-up attacks or shield upgrades are pending
+                    if self.attack_count == 0 and self.shield_upgrade_count == 0:
+                        self._start_enemy_turn()
+                    else:
+                        # Keep in playing state until all attacks/upgrades are complete
+                        self.game_state = "playing"
+    
+    def _start_enemy_turn(self, delay=ENEMY_TURN_DELAY):
+        """Hand the turn to the enemy after a short delay"""
+        self.game_state = "enemy_turn"
+        self._schedule("enemy_turn", delay)  # 1 second after the last animation
+    
+    def _resolve_chain(self, step):
+        """Run every step of a power-up chain now, then hand the turn to the enemy
+        
+        Each step returns whether the chain goes on. The enemy's turn waits
+        until the view has animated every step.
+        """
+        chain_frames = 0
+        while True:
+            self._wait(CHAIN_STEP_FRAMES)  # 1.5 seconds per step
+            chain_frames += CHAIN_STEP_FRAMES
+            if not step():
+                break
+        if self.game_state != "shop":
+            self._start_enemy_turn(chain_frames + ENEMY_TURN_DELAY)
+    
+    def _upgrade_shield(self):
+        """Raise max shield by 25 and fill it, returning the old maximum"""
+        old_max_shield = self.player.max_shield
+        self.player.max_shield += 25
+        self.player.shield = self.player.max_shield  # Fill up to new maximum
+        self.events.append(("shield_upgrade", old_max_shield, self.player.max_shield))
+        return old_max_shield
+    
+    def shield_upgrade(self):
+        """Next upgrade of a Shield Of Dreams chain (True if more follow)"""
+        old_max_shield = self._upgrade_shield()
+        
+        # Show shield upgrade message
+        self._message(f"Shield Of Dreams: +25 max shield! ({old_max_shield} → {self.player.max_shield})", 90)  # 1.5 seconds
+        
+        # A single power-up still upgrades twice, leaving the count at -1
+        self.shield_upgrade_count -= 1
+        return self.shield_upgrade_count > 0
+    
+    def bonus_attack(self):
+        """Next attack of a Line 'em up chain (True if more follow)"""
+        # Check if enemy is still alive before attacking
+        if self.enemy.health > 0:
+            # Deal additional damage
+            self.enemy.take_damage(self.second_attack_score)
+            self.events.append(("bonus_attack", self.second_attack_score))
+            
+            # Show attack message
+            self._message("{hand}: {calculation} = {score} damage! + Line 'em up: Double damage!", 90,
+                          self.second_attack_result)  # 1.5 seconds
+            
+            # Attacks stop when they run out; a dying enemy ends the chain on the next step
+            self.attack_count -= 1
+            return self.attack_count > 0 or self.enemy.health <= 0
+        
+        # Enemy is dead, stop power-up attacks and go to victory (leaving attack_count as is)
+        self.enemy_defeated()
+        return False
+    
+    def enemy_turn(self):
+        """Enemy's turn to roll and attack"""
+        # Check if enemy is already defeated
+        if self.enemy.health <= 0:
+            self.enemy_defeated()
+            return
+        
+        if self.fast_enemy_turns:
+            # Same damage distribution as rolling, without the dice
+            if self.enemy_damage_sampler is None:
+                self.enemy_damage_sampler = EnemyDamageSampler(self.scoring_system, rng=self.rngs["enemy"])
+            # A hand of the sampled type dealing the sampled damage, for its name and calculation
+            result = self.enemy_damage_sampler.sample_result()
+        else:
+            # Enemy rolls dice
+            rng = self.rngs["enemy"]
+            enemy_dice = []
+            for i in range(self.hand_size):
+                if rng.random() < WILD_CHANCE:
+                    enemy_dice.append(0)  # Wild card
+                else:
+                    enemy_dice.append(rng.randint(1, self.faces))
+            
+            # Calculate enemy score
+            result = self.scoring_system.calculate_score(enemy_dice, [])
+        score = result.score
+        
+        # Deal damage to player
+        self.player.take_damage(score)
+        self.events.append(("enemy_attack", score, result))
+        
+        # Display result
+        self._message("Enemy {hand}: {calculation} = {score} damage!", 180, result)
+        
+        # Check if player is defeated
+        if self.player.health <= 0:
+            self.game_over()
+        else:
+            self.game_state = "playing"
+            self.roll_dice()
+    
+    def enemy_defeated(self):
+        """Handle enemy defeat"""
+        # Calculate gold reward based on current level and enemy health
+        # Higher levels and tougher enemies give more gold
+        base_gold = 50  # Base gold per level
+        level_bonus = self.current_level * 10  # More gold for higher levels
+        enemy_health_bonus = self.enemy.max_health // 100  # Bonus based on enemy toughness
+        
+        gold_earned = base_gold + level_bonus + enemy_health_bonus
+        self.player.earn_gold(gold_earned)
+        
+        # Heal player by 15%
+        heal_amount = int(self.player.max_health * self.balance["victory_heal"])
+        self.player.heal(heal_amount)
+        
+        # Refill shield
+        self.player.refill_shield()
+        
+        self.events.append(("enemy_defeated", gold_earned, heal_amount))
+        self._message(f"Enemy defeated! +{heal_amount} HP, +{gold_earned} Gold. Shield restored!", 180)  # 3 seconds
+        
+        # Open shop instead of immediately spawning new enemy
+        self.game_state = "shop"
+    
+    def can_buy_power_up(self, name):
+        """Check the player has the gold and a free slot for a power-up"""
+        has_empty_slot = any(p is None for p in self.player.power_ups)
+        return self.player.get_gold() >= self.balance[POWER_UP_COSTS[name]] and has_empty_slot
+    
+    def buy_power_up(self, name):
+        """Buy a power-up in the shop (returns False if it can't be bought)"""
+        if not self.can_buy_power_up(name):
+            return False
+        power_up = dict(POWER_UPS[name], cost=self.balance[POWER_UP_COSTS[name]])
+        self.player.spend_gold(power_up["cost"])
+        self.player.add_power_up(power_up)
+        self._message(f"{name} power-up purchased!", 120)  # 2 seconds
+        return True
+    
+    def can_restore_health(self):
+        """Check the player has the gold for a health restore"""
+        return self.player.get_gold() >= self.balance["health_restore_cost"]
+    
+    def restore_health(self):
+        """Buy back 30% of max health in the shop (returns False if it can't be bought)"""
+        if not self.can_restore_health():
+            return False
+        self.player.spend_gold(self.balance["health_restore_cost"])
+        heal_amount = int(self.player.max_health * 0.3)
+        self.player.heal(heal_amount)
+        self._message(f"Health restored! +{heal_amount} HP", 120)  # 2 seconds
+        return True
+    
+    def continue_to_next_level(self):
+        """Leave the shop and fight the next enemy"""
+        self.game_state = "playing"
+        self.current_level += 1  # Increment level
+        self.spawn_new_enemy()
+        self.roll_dice()
+    
+    def game_over(self):
+        """Handle game over"""
+        self.game_state = "game_over"
+        self.events.append(("game_over", self.current_level))
+        self._message(f"Game Over! Level reached: {self.current_level}", 300)  # 5 seconds
+    
+    def restart_game(self):
+        """Restart the game"""
+        self.player = Player(self.balance["player_max_health"])
+        self.current_level = 1
+        self.spawn_new_enemy()
+        self.roll_dice()
+        self.game_state = "playing"
+        self._message("", 0)
+    
+    def tick(self):
+        """Advance one frame, running delayed actions that come due"""
+        self.scheduler.now += 1
+        while True:
+            action = self.scheduler.pop_due()
+            if action is None:
+                break
+            getattr(self, action)()
+    
+    def run_until(self, frame):
+        """Tick up to the given frame, jumping straight to each delayed action"""
+        while self.frame < frame:
+            due = self.scheduler.next_due()
+            if due is None or due > frame:
+                due = frame
+            self.scheduler.now = max(self.frame, due - 1)
+            self.tick()
+    
+    def advance(self):
+        """Skip ahead to the next delayed action and run it (False if none is pending)"""
+        due = self.scheduler.next_due()
+        if due is None:
+            return False
+        self.run_until(max(due, self.frame + 1))
+        return True
+    
+    def settle(self):
+        """Run every pending delayed action, as if the frames had passed"""
+        while self.advance():
+            pass
@@ -19,17 +19,23 @@ def main():
     running = True
     clock = pygame.time.Clock()
     
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            game.handle_event(event)
-        
-        game.update()
-        game.draw()
-        
-        pygame.display.flip()
-        clock.tick(60)
+    try:
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                game.handle_event(event)
+            
+            game.update()
+            
+            # Only the regions that changed are pushed to the display
+            dirty = game.draw()
+            if dirty:
+                pygame.display.update(dirty)
+            clock.tick(0 if game.turbo else 60)  # Turbo runs uncapped
+    finally:
+        # Keep the recording even when the game crashes, for bug reports
+        game.save_recording()
     
     pygame.quit()
     sys.exit()
@@ -0,0 +1,123 @@
+import os
+import random
+from fight_solver import FightTables, FIGHT_TABLES_PATH
+from game_core import POWER_UPS, POWER_UP_COSTS
+
+
+class Policy:
+    """Decisions a bot makes at the game's decision points
+    
+    Before each hand is played, choose_discard picks the dice to reroll
+    (what the Discard button does with the selected dice); an empty list
+    plays the hand. Between levels, shop buys from the shop through the
+    core's buy_power_up and restore_health. new_run is called with the run's
+    seed before every run, for policies with randomness of their own.
+    """
+    
+    def new_run(self, seed=None):
+        """Get ready for a new run"""
+        pass
+    
+    def choose_discard(self, core):
+        """Dice indices to reroll (empty means play the hand)"""
+        return []
+    
+    def shop(self, core):
+        """Spend gold between levels"""
+        pass
+
+
+class PlayPolicy(Policy):
+    """Play every first roll and never shop"""
+
+
+class GreedyPolicy(Policy):
+    """Chase the largest N of a kind and buy whatever is affordable
+    
+    Wild dice and the most common face (the highest on ties) are kept and
+    the rest rerolled until every die matches or the rerolls run out.
+    """
+    
+    def choose_discard(self, core):
+        """Dice indices to reroll (empty means play the hand)"""
+        values = [die.value for die in core.dice if not die.is_wild]
+        if not values:
+            return []
+        target = max(values, key=lambda value: (values.count(value), value))
+        return [i for i, die in enumerate(core.dice) if not die.is_wild and die.value != target]
+    
+    def shop(self, core):
+        """Spend gold between levels"""
+        if core.player.get_health_percentage() < 0.5:
+            core.restore_health()
+        for name in sorted(POWER_UPS, key=lambda name: -core.balance[POWER_UP_COSTS[name]]):
+            while core.buy_power_up(name):
+                pass
+
+
+class RandomPolicy(Policy):
+    """Reroll random dice at random and shop at random"""
+    
+    def __init__(self, play_chance=0.4):
+        self.play_chance = play_chance
+        self.rng = random
+    
+    def new_run(self, seed=None):
+        """Get ready for a new run"""
+        # Without a seed the shared random module keeps simulations reproducible with random.seed
+        self.rng = random if seed is None else random.Random(f"{seed}/policy")
+    
+    def choose_discard(self, core):
+        """Dice indices to reroll (empty means play the hand)"""
+        if self.rng.random() < self.play_chance:
+            return []
+        return [i for i in range(len(core.dice)) if self.rng.random() < 0.5]
+    
+    def shop(self, core):
+        """Spend gold between levels"""
+        choice = self.rng.choice([None, "restore"] + list(POWER_UPS))
+        if choice == "restore":
+            core.restore_health()
+        elif choice is not None:
+            core.buy_power_up(choice)
+
+
+class AdvisorPolicy(Policy):
+    """Reroll as the advisor suggests, restore health when low and buy Line 'em up"""
+    
+    def choose_discard(self, core):
+        """Dice indices to reroll (empty means play the hand)"""
+        return core.get_suggested_discard()
+    
+    def shop(self, core):
+        """Spend gold between levels"""
+        if core.player.get_health_percentage() < 0.5:
+            core.restore_health()
+        core.buy_power_up("Line 'em up")
+
+
+class FightPolicy(AdvisorPolicy):
+    """Reroll for the best chance of winning the fight, from the fight solver's tables
+    
+    Where the tables do not apply (see FightTables.suggest), and without
+    tables (see fight_solver.py), it plays like AdvisorPolicy.
+    """
+    
+    def __init__(self, path=FIGHT_TABLES_PATH):
+        self.tables = FightTables.load(path) if os.path.exists(path) else None
+    
+    def choose_discard(self, core):
+        """Dice indices to reroll (empty means play the hand)"""
+        discard = self.tables.suggest(core) if self.tables is not None else None
+        if discard is None:
+            return super().choose_discard(core)
+        return discard
+
+
+POLICIES = {
+    "play": PlayPolicy,
+    "greedy": GreedyPolicy,
+    "random": RandomPolicy,
+    "advisor": AdvisorPolicy,
+    "fight": FightPolicy
+}
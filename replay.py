@@ -0,0 +1,198 @@
+import argparse
+import json
+import struct
+import time
+from game_core import GameCore, DEFAULT_BALANCE, INPUT_ACTIONS, POWER_UPS
+
+# Binary recordings: a header, then one packed record per input.
+# Files may hold any number of recordings back to back.
+REPLAY_MAGIC = b"DDRP"
+REPLAY_FORMAT_VERSION = 3  # Bump when the header, the record layout or how inputs play out changes (2: instant power-up chains, 3: fast enemy turns draw the hand too)
+
+# magic, version, hand size, faces, flags, seed, frames, input count
+_HEADER = struct.Struct("<4sBBBBQQI")
+_FLAG_FAST_ENEMY_TURNS = 1
+
+# Balance values follow the header as doubles, in this order
+BALANCE_KEYS = tuple(DEFAULT_BALANCE)
+_BALANCE = struct.Struct(f"<{len(BALANCE_KEYS)}d")
+
+# Power-ups are stored by their position here
+POWER_UP_NAMES = tuple(POWER_UPS)
+
+
+def _write_varint(out, value):
+    """Append an unsigned LEB128 integer to a bytearray"""
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_exact(f, size):
+    """Read exactly size bytes from a binary file, raising EOFError if it ends first"""
+    data = f.read(size)
+    if len(data) < size:
+        raise EOFError("Recording ends in the middle of an input")
+    return data
+
+
+def _read_varint(f):
+    """Read an unsigned LEB128 integer from a binary file"""
+    value = 0
+    shift = 0
+    while True:
+        byte = _read_exact(f, 1)
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def write_binary_recording(recording, f):
+    """Append a recording to a binary file as a header and packed inputs
+    
+    Each input is its frame (as the gap since the previous input), the
+    action's position in INPUT_ACTIONS and its arguments: the discarded
+    dice indices in the order they were rerolled, or the power-up bought.
+    """
+    seed = recording["seed"]
+    if seed is None or not 0 <= seed < 1 << 64:
+        raise ValueError("Binary recordings need a seed between 0 and 2**64 - 1")
+    inputs = recording["inputs"]
+    flags = _FLAG_FAST_ENEMY_TURNS if recording["fast_enemy_turns"] else 0
+    out = bytearray(_HEADER.pack(REPLAY_MAGIC, REPLAY_FORMAT_VERSION, recording["hand_size"], recording["faces"],
+                                 flags, seed, recording["frames"], len(inputs)))
+    balance = dict(DEFAULT_BALANCE, **recording["balance"])
+    out += _BALANCE.pack(*(balance[key] for key in BALANCE_KEYS))
+    
+    last_frame = 0
+    for frame, action, args in inputs:
+        _write_varint(out, frame - last_frame)
+        last_frame = frame
+        out.append(INPUT_ACTIONS.index(action))
+        if action == "discard":
+            indices = args[0]
+            _write_varint(out, len(indices))
+            out += bytes(indices)
+        elif action == "buy_power_up":
+            out.append(POWER_UP_NAMES.index(args[0]))
+    f.write(out)
+
+
+def _iter_binary_inputs(f, count):
+    """Yield count packed inputs as [frame, action, args]"""
+    frame = 0
+    for _ in range(count):
+        frame += _read_varint(f)
+        action = INPUT_ACTIONS[_read_exact(f, 1)[0]]
+        if action == "discard":
+            args = [list(_read_exact(f, _read_varint(f)))]
+        elif action == "buy_power_up":
+            args = [POWER_UP_NAMES[_read_exact(f, 1)[0]]]
+        else:
+            args = []
+        yield [frame, action, args]
+
+
+def iter_binary_recordings(f):
+    """Yield each recording in a binary file without loading the file
+    
+    A recording's "inputs" is a generator reading from f, so it must be
+    used before asking for the next recording (unread inputs are skipped).
+    """
+    while True:
+        header = f.read(_HEADER.size)
+        if not header:
+            return
+        if len(header) < _HEADER.size:
+            raise EOFError("Recording ends in the middle of its header")
+        magic, version, hand_size, faces, flags, seed, frames, count = _HEADER.unpack(header)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Not a Dicey Dilemma recording")
+        if version != REPLAY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version {version} (expected {REPLAY_FORMAT_VERSION})")
+        values = _BALANCE.unpack(_read_exact(f, _BALANCE.size))
+        balance = {key: type(DEFAULT_BALANCE[key])(value) for key, value in zip(BALANCE_KEYS, values)}
+        
+        inputs = _iter_binary_inputs(f, count)
+        yield {
+            "seed": seed,
+            "hand_size": hand_size,
+            "faces": faces,
+            "balance": balance,
+            "fast_enemy_turns": bool(flags & _FLAG_FAST_ENEMY_TURNS),
+            "frames": frames,
+            "inputs": inputs
+        }
+        for _ in inputs:
+            pass
+
+
+def save_recording(recording, path):
+    """Write a GameCore.recording() to a file: JSON for .json paths, binary otherwise"""
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(recording, f)
+    else:
+        with open(path, "wb") as f:
+            write_binary_recording(recording, f)
+
+
+def load_recording(path):
+    """Read the (first) recording written by save_recording, with its inputs in a list"""
+    with open(path, "rb") as f:
+        if f.read(len(REPLAY_MAGIC)) != REPLAY_MAGIC:
+            f.seek(0)
+            return json.load(f)
+        f.seek(0)
+        for recording in iter_binary_recordings(f):
+            return dict(recording, inputs=list(recording["inputs"]))
+    raise ValueError(f"{path}: empty recording")
+
+
+def replay(recording, scoring_system=None, until=None):
+    """Play a recorded game again, without a view, and return its GameCore
+    
+    Inputs are applied on the frames they were logged at; frames where
+    nothing is due are skipped, so a long game replays in milliseconds.
+    until stops at an earlier frame (default: the last recorded frame).
+    """
+    if recording["seed"] is None:
+        raise ValueError("Games without a seed cannot be replayed")
+    core = GameCore(recording["hand_size"], recording["faces"], scoring_system,
+                    balance=recording["balance"], seed=recording["seed"])
+    core.fast_enemy_turns = recording["fast_enemy_turns"]
+    until = recording["frames"] if until is None else until
+    
+    for frame, action, args in recording["inputs"]:
+        if frame > until:
+            break
+        core.run_until(frame)
+        core.apply(action, *args)
+        core.pop_events()
+    core.run_until(until)
+    core.pop_events()
+    return core
+
+
+def main():
+    """Replay a recorded game and print where it ended"""
+    parser = argparse.ArgumentParser(description="Replay a recorded Dicey Dilemma game without rendering")
+    parser.add_argument("path", help="Recording written by the game (last_replay.ddr)")
+    parser.add_argument("--until", type=int, default=None, help="Stop at this frame")
+    args = parser.parse_args()
+    
+    recording = load_recording(args.path)
+    start = time.time()
+    core = replay(recording, until=args.until)
+    print(f"Frame {core.frame}: {core.game_state}, level {core.current_level}")
+    print(f"Player {core.player.health}/{core.player.max_health} HP, "
+          f"{core.player.shield}/{core.player.max_shield} shield, {core.player.get_gold()} gold")
+    print(f"{core.enemy.enemy_type} {core.enemy.health}/{core.enemy.max_health} HP")
+    print(f"Dice {[die.value for die in core.dice]}, {core.rerolls_left} rerolls left")
+    print(f"\n{len(recording['inputs'])} inputs replayed in {1000 * (time.time() - start):.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
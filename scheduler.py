@@ -0,0 +1,63 @@
+import heapq
+import itertools
+
+
+class Scheduler:
+    """Named events due on a frame number, kept in a heap, with cancellation
+    
+    Each name has at most one pending event; scheduling it again replaces
+    it. Events due on the same frame come out in the order of priorities,
+    then in the order they were scheduled. Cancelled events stay in the
+    heap, marked dead, until they reach the top.
+    """
+    
+    def __init__(self, priorities=()):
+        self.now = 0  # Current frame
+        self.priorities = {name: i for i, name in enumerate(priorities)}
+        self._heap = []  # [due frame, priority, sequence, name or None once cancelled]
+        self._entries = {}  # Pending entry of each name
+        self._sequence = itertools.count()
+    
+    def __contains__(self, name):
+        return name in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def schedule(self, name, delay):
+        """Make name come due delay frames from now, replacing its pending event"""
+        self.cancel(name)
+        entry = [self.now + delay, self.priorities.get(name, len(self.priorities)), next(self._sequence), name]
+        self._entries[name] = entry
+        heapq.heappush(self._heap, entry)
+    
+    def cancel(self, name):
+        """Drop name's pending event (False if there was none)"""
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return False
+        entry[-1] = None
+        return True
+    
+    def pending(self):
+        """{name: frames until due} of every pending event"""
+        return {name: entry[0] - self.now for name, entry in self._entries.items()}
+    
+    def _prune(self):
+        """Drop cancelled entries from the top of the heap"""
+        while self._heap and self._heap[0][-1] is None:
+            heapq.heappop(self._heap)
+    
+    def next_due(self):
+        """Frame of the earliest pending event (None if nothing is pending)"""
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+    
+    def pop_due(self):
+        """Remove and return the next event due by now (None if none is due)"""
+        self._prune()
+        if not self._heap or self._heap[0][0] > self.now:
+            return None
+        name = heapq.heappop(self._heap)[-1]
+        del self._entries[name]
+        return name
@@ -1,95 +1,474 @@
-from collections import Counter
+import hashlib
 import itertools
+import json
+import math
+import os
+import json5
+import numpy as np
+
+# Rule sets are JSON5 files; compiled tables are cached next to them by content hash
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+DEFAULT_RULES_PATH = os.path.join(RULES_DIR, "default.json5")
+COMPILED_RULES_DIR = os.path.join(RULES_DIR, "compiled")
+RULES_COMPILER_VERSION = 2  # Bump when the compiled format or scoring logic changes
+
+# Hand sizes with at most this many canonical hands get their whole table built up front
+_EAGER_TABLE_LIMIT = 5000
+
+# Lazily filled tables (large hands) stop growing past this many hands
+_LAZY_TABLE_LIMIT = 200000
+
+# Wild dice are resolved by trying every multiset of wild values when there are at
+# most this many (462 covers six wilds on six faces); larger searches build one
+# candidate hand per combination instead
+_WILD_ENUMERATION_LIMIT = 462
+
+# Largest dense table calculate_scores_batch will allocate
+_BATCH_TABLE_LIMIT = 1 << 24
+
+# Parsed rule set files keyed by (path, modification time, size)
+_RULE_SETS = {}
+
+# Every canonical hand (sorted dice values) mapped to its ScoreResult.
+# Tables are shared between ScoringSystem instances with identical rules.
+_SCORE_TABLES = {}
+
+# Best wild resolution per (sorted non-wild values, wild count), keyed like _SCORE_TABLES
+_WILD_TABLES = {}
+
+# Dense (score, hand type id) arrays for calculate_scores_batch, keyed like _SCORE_TABLES
+_BATCH_TABLES = {}
+
+# Hand type ids returned by calculate_scores_batch
+HAND_TYPES = (
+    "No scoring combination",
+    "Pair",
+    "Two Pair",
+    "Three of a Kind",
+    "Full House",
+    "Four of a Kind",
+    "Five of a Kind",
+    "Six of a Kind",
+    "2-straight",
+    "3-straight",
+    "4-straight",
+    "5-straight",
+    "6-straight",
+    # Larger hands and dice
+    "7-straight",
+    "8-straight",
+    "9-straight",
+    "10-straight",
+    "11-straight",
+    "12-straight",
+    "7 of a Kind",
+    "8 of a Kind",
+    "9 of a Kind",
+    "10 of a Kind",
+    "11 of a Kind",
+    "12 of a Kind",
+)
+HAND_TYPE_IDS = {name: i for i, name in enumerate(HAND_TYPES)}
+HAND_TYPE_IDS[""] = 0  # Wild hands that never beat a score of 0
+
+# Rule names for N of a kind; larger kinds use '<n>_of_kind' when the rules define them
+KIND_RULES = {
+    6: 'six_of_kind',
+    5: 'five_of_kind',
+    4: 'four_of_kind',
+    3: 'three_of_kind',
+    2: 'pair'
+}
+
+# Readable names for the combination types
+HAND_NAMES = {
+    'six_of_kind': 'Six of a Kind',
+    'five_of_kind': 'Five of a Kind',
+    'four_of_kind': 'Four of a Kind',
+    'three_of_kind': 'Three of a Kind',
+    'pair': 'Pair',
+    'two_pair': 'Two Pair',
+    'full_house': 'Full House'
+}
+
+# Hand code for a wild hand where no assignment beat a score of 0
+NO_HAND = -1
+
+def encode_hand(dice_values, base=7):
+    """Base-7 (faces + 1 in general) code of a hand: its sorted values as digits, lowest first"""
+    code = 0
+    for value in sorted(dice_values, reverse=True):
+        code = code * base + value
+    return code
+
+def decode_hand(code, hand_size=6, base=7):
+    """Sorted dice values of a hand code"""
+    values = []
+    for _ in range(hand_size):
+        values.append(code % base)
+        code //= base
+    return values
+
+def load_rule_set(path):
+    """Read a JSON5 rule set with scoring_rules and bonus_multiplier"""
+    # Parsing JSON5 is slow, so unchanged files are only parsed once
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    rule_set = _RULE_SETS.get(cache_key)
+    if rule_set is None:
+        with open(path, "r") as f:
+            rule_set = json5.load(f)
+        if not isinstance(rule_set.get("scoring_rules"), dict):
+            raise ValueError(f"{path}: scoring_rules must be an object")
+        rule_set.setdefault("bonus_multiplier", 200)
+        _RULE_SETS[cache_key] = rule_set
+    return dict(rule_set, scoring_rules=dict(rule_set["scoring_rules"]))
+
+class ScoreResult:
+    """Score of a hand; the hand name and calculation are only formatted when read"""
+    __slots__ = ('score', 'code', '_scoring_system', '_description', '_hand_type')
+    
+    def __init__(self, score, code, scoring_system, description=None):
+        self.score = score
+        self.code = code  # Base-7 code of the (wild-resolved) hand that scored
+        self._scoring_system = scoring_system
+        self._description = description
+        self._hand_type = None
+    
+    @property
+    def hand_type(self):
+        """Id of the hand in HAND_TYPES, found without formatting its description"""
+        if self._hand_type is None:
+            if self._description is not None:
+                self._hand_type = HAND_TYPE_IDS[self._description[0]]
+            else:
+                self._hand_type = self._scoring_system.hand_type(self.code)
+        return self._hand_type
+    
+    @property
+    def hand_name(self):
+        """Readable hand name such as Full House"""
+        if self._description is None:
+            self._description = self._scoring_system.describe(self.code)
+        return self._description[0]
+    
+    @property
+    def calculation(self):
+        """Readable calculation such as 1000 + 3000 bonus = 4000"""
+        if self._description is None:
+            self._description = self._scoring_system.describe(self.code)
+        return self._description[1]
+    
+    def __iter__(self):
+        """Unpack as (score, hand_name, calculation)"""
+        return iter((self.score, self.hand_name, self.calculation))
+    
+    def format(self, template):
+        """Fill a message template's {hand}, {calculation} and {score} fields"""
+        return template.format(hand=self.hand_name, calculation=self.calculation, score=self.score)
+    
+    def __repr__(self):
+        return f"ScoreResult(score={self.score}, code={self.code})"
 
 class ScoringSystem:
-    def __init__(self):
-        self.scoring_rules = {
-            '6_sequential': 1500,  # Increased from 1000
-            '5_sequential': 800,   # Increased from 500
-            '4_sequential': 600,   # Increased from 400
-            '3_sequential': 400,   # Increased from 300
-            '2_sequential': 250,   # Increased from 200
-            'six_of_kind': 1200,     # Increased from 600
-            'five_of_kind': 1000,    # Increased from 500
-            'four_of_kind': 800,     # Increased from 400
-            'three_of_kind': 300,    # Increased from 200
-            'pair': 150,             # Increased from 100
-            'two_pair': 700,         # Increased from 500
-            'full_house': 1000       # Increased from 600
+    def __init__(self, rules_path=None, compiled_dir=COMPILED_RULES_DIR, hand_size=6, faces=6):
+        self.compiled_dir = compiled_dir
+        self.hand_size = hand_size  # Dice per hand
+        self.faces = faces  # Dice show 1..faces (0 is an unresolved wild)
+        self.load_rules(rules_path or DEFAULT_RULES_PATH)
+    
+    def load_rules(self, rules_path):
+        """Switch to the rule set in a JSON5 file, using the compiled cache when possible"""
+        rule_set = load_rule_set(rules_path)
+        self.set_rules(rule_set["scoring_rules"], rule_set["bonus_multiplier"])
+        if _SCORE_TABLES.get(self.rules_key()) is None and self._table_size() <= _EAGER_TABLE_LIMIT:
+            self._load_compiled_rules()
+    
+    def set_rules(self, scoring_rules, bonus_multiplier=200):
+        """Switch to the given rules (tables are built on first use)"""
+        self.scoring_rules = dict(scoring_rules)
+        self.bonus_multiplier = bonus_multiplier
+        self._score_table = None
+        self._wild_cache = None
+        self._owner = None
+    
+    def rules_key(self):
+        """Hashable key identifying the current rules"""
+        return tuple(sorted(self.scoring_rules.items())), self.bonus_multiplier, self.hand_size, self.faces
+    
+    def _table_size(self):
+        """Number of canonical hands (dice showing 0..faces)"""
+        return math.comb(self.faces + self.hand_size, self.hand_size)
+    
+    def _canonical_hands(self, hand_size=None):
+        """Every sorted hand of the given size with dice showing 0..faces"""
+        if hand_size is None:
+            hand_size = self.hand_size
+        return itertools.combinations_with_replacement(range(0, self.faces + 1), hand_size)
+    
+    def rules_hash(self):
+        """Content hash of the current rules, used to name compiled tables"""
+        content = json.dumps({
+            "scoring_rules": self.scoring_rules,
+            "bonus_multiplier": self.bonus_multiplier,
+            "hand_size": self.hand_size,
+            "faces": self.faces,
+            "compiler_version": RULES_COMPILER_VERSION
+        }, sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+    
+    def rebuild_score_table(self):
+        """Build (or fetch the shared copy of) the lookup table for the current rules"""
+        rules_key = self.rules_key()
+        table = _SCORE_TABLES.get(rules_key)
+        if table is None:
+            # Results keep a reference to a private copy whose rules never change
+            owner = self._frozen_copy()
+            # Six dice showing 0-6 (0 is an unresolved wild) give 924 distinct hands;
+            # much larger hands fill the table as they are seen
+            table = {}
+            if self._table_size() <= _EAGER_TABLE_LIMIT:
+                for hand in self._canonical_hands():
+                    score = self._find_best_combination(list(hand))[0]
+                    table[hand] = ScoreResult(score, encode_hand(hand, self.faces + 1), owner)
+            _SCORE_TABLES[rules_key] = table
+            _WILD_TABLES[rules_key] = {}
+        self._score_table = table
+        self._wild_cache = _WILD_TABLES[rules_key]
+        return table
+    
+    def _frozen_copy(self):
+        """A ScoringSystem with the same rules, used only to describe results"""
+        copy = ScoringSystem.__new__(ScoringSystem)
+        copy.compiled_dir = self.compiled_dir
+        copy.hand_size = self.hand_size
+        copy.faces = self.faces
+        copy.set_rules(self.scoring_rules, self.bonus_multiplier)
+        return copy
+    
+    def compile_rules(self):
+        """Resolve every hand and wild combination for the current rules"""
+        table = self.rebuild_score_table()
+        for wild_count in range(1, self.hand_size + 1):
+            for fixed_values in self._canonical_hands(self.hand_size - wild_count):
+                self._resolve_wild_dice(fixed_values, wild_count)
+        return table
+    
+    def _compiled_path(self):
+        """Path of the compiled table cache for the current rules"""
+        return os.path.join(self.compiled_dir, f"{self.rules_hash()}.json")
+    
+    def _load_compiled_rules(self):
+        """Load compiled tables from disk, or compile and save them"""
+        path = self._compiled_path()
+        try:
+            with open(path, "r") as f:
+                compiled = json.load(f)
+        except (OSError, ValueError):
+            compiled = None
+        
+        if compiled is not None and compiled.get("compiler_version") == RULES_COMPILER_VERSION:
+            owner = self._frozen_copy()
+            table = {hand: ScoreResult(score, encode_hand(hand, self.faces + 1), owner)
+                     for hand, score in zip(self._canonical_hands(), compiled["scores"])}
+            wild_cache = {}
+            for fixed_values, wild_count, code in compiled["wild"]:
+                if code == NO_HAND:
+                    wild_cache[(tuple(fixed_values), wild_count)] = ScoreResult(0, NO_HAND, owner, ("", ""))
+                else:
+                    wild_cache[(tuple(fixed_values), wild_count)] = table[tuple(decode_hand(code, self.hand_size, self.faces + 1))]
+            _SCORE_TABLES[self.rules_key()] = table
+            _WILD_TABLES[self.rules_key()] = wild_cache
+            self.rebuild_score_table()
+            return
+        
+        table = self.compile_rules()
+        compiled = {
+            "compiler_version": RULES_COMPILER_VERSION,
+            "scoring_rules": self.scoring_rules,
+            "bonus_multiplier": self.bonus_multiplier,
+            "scores": [result.score for result in table.values()],
+            "wild": [[list(fixed_values), wild_count, result.code]
+                     for (fixed_values, wild_count), result in self._wild_cache.items()]
         }
+        try:
+            os.makedirs(self.compiled_dir, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(compiled, f, separators=(",", ":"))
+        except OSError:
+            # A read-only install still works, it just compiles at startup
+            pass
+    
+    def _lookup_score(self, dice_values):
+        """Look up the ScoreResult of a hand, falling back to a full calculation"""
+        table = self._score_table
+        if table is None:
+            table = self.rebuild_score_table()
+        hand = tuple(sorted(dice_values))
+        result = table.get(hand)
+        if result is None:
+            if len(hand) == self.hand_size and len(table) < _LAZY_TABLE_LIMIT:
+                # Large hands: remember each hand the first time it is scored
+                if self._owner is None:
+                    self._owner = self._frozen_copy()
+                score = self._find_best_combination(hand)[0]
+                result = ScoreResult(score, encode_hand(hand, self.faces + 1), self._owner)
+                table[hand] = result
+            else:
+                # Hands outside the table (e.g. a different number of dice) are described up front
+                score, hand_name, calculation = self._calculate_single_score(dice_values)
+                result = ScoreResult(score, encode_hand(dice_values, self.faces + 1), self, (hand_name, calculation))
+        return result
+    
+    def describe(self, code):
+        """(hand name, calculation) for a hand code"""
+        if code == NO_HAND:
+            return "", ""
+        score, hand_name, calculation = self._calculate_single_score(decode_hand(code, self.hand_size, self.faces + 1))
+        return hand_name, calculation
+    
+    def hand_type(self, code):
+        """Id in HAND_TYPES of the hand for a hand code"""
+        if code == NO_HAND:
+            return HAND_TYPE_IDS[""]
+        best_score, best_combination = self._find_best_combination(decode_hand(code, self.hand_size, self.faces + 1))
+        if not best_combination:
+            return HAND_TYPE_IDS["No scoring combination"]
+        return HAND_TYPE_IDS[self._hand_name(best_combination)]
     
     def calculate_score(self, dice_values, wild_dice):
-        """Calculate the best possible score for the given dice"""
-        # Handle wild dice by trying all possible values
-        best_score = 0
-        best_hand = ""
-        best_calculation = ""
-        
+        """Calculate the best possible score for the given dice as a ScoreResult"""
         if wild_dice:
-            # Try all possible values for wild dice
-            for wild_values in itertools.product(range(1, 7), repeat=len(wild_dice)):
-                test_values = dice_values.copy()
-                for i, wild_index in enumerate(wild_dice):
-                    test_values[wild_index] = wild_values[i]
-                
-                score, hand, calculation = self._calculate_single_score(test_values)
-                if score > best_score:
-                    best_score = score
-                    best_hand = hand
-                    best_calculation = calculation
+            # wild_dice holds positions; a position listed twice is still one wild die (the
+            # original brute force reassigned the same position), so count distinct positions
+            wild_indices = set(wild_dice)
+            fixed_values = tuple(sorted(value for i, value in enumerate(dice_values) if i not in wild_indices))
+            return self._resolve_wild_dice(fixed_values, len(wild_indices))
+        
+        return self._lookup_score(dice_values)
+    
+    def calculate_scores_batch(self, dice_array, wild_mask=None):
+        """Score an (N, hand_size) array of hands at once, returning score and hand type id arrays"""
+        dice_array = np.asarray(dice_array)
+        if dice_array.ndim != 2 or dice_array.shape[1] != self.hand_size:
+            raise ValueError(f"Expected an (N, {self.hand_size}) array of dice, got shape {dice_array.shape}")
+        if dice_array.size and (dice_array.min() < 0 or dice_array.max() > self.faces):
+            raise ValueError(f"Dice values must be between 0 and {self.faces}")
+        
+        key_weights, score_table, hand_table = self._get_batch_tables()
+        if wild_mask is not None:
+            # Wild dice are looked up by count, whatever value they currently show
+            dice_array = np.where(wild_mask, self.faces + 1, dice_array)
+        keys = key_weights[dice_array].sum(axis=1)
+        return score_table[keys], hand_table[keys]
+    
+    def _get_batch_tables(self):
+        """Build the dense lookup arrays used by calculate_scores_batch"""
+        rules_key = self.rules_key()
+        tables = _BATCH_TABLES.get(rules_key)
+        if tables is None:
+            # A hand is encoded as a count vector in base hand_size + 1: each die adds
+            # the weight of its value (0 adds nothing, its count is implied) and
+            # wilds use the slot after the last face
+            base = self.hand_size + 1
+            size = base ** (self.faces + 1)
+            if size > _BATCH_TABLE_LIMIT:
+                raise ValueError(f"Batch scoring does not support {self.hand_size} dice with {self.faces} faces")
+            key_weights = np.array([0] + [base ** face for face in range(self.faces + 1)], dtype=np.int64)
+            
+            score_table = np.zeros(size, dtype=np.int32)
+            hand_table = np.zeros(size, dtype=np.int8)
+            for wild_count in range(self.hand_size + 1):
+                for fixed_values in self._canonical_hands(self.hand_size - wild_count):
+                    if wild_count:
+                        result = self._resolve_wild_dice(fixed_values, wild_count)
+                    else:
+                        result = self._lookup_score(fixed_values)
+                    key = int(key_weights[list(fixed_values)].sum()) + wild_count * int(key_weights[-1])
+                    score_table[key] = result.score
+                    hand_table[key] = result.hand_type
+            tables = (key_weights, score_table, hand_table)
+            _BATCH_TABLES[rules_key] = tables
+        return tables
+    
+    def _resolve_wild_dice(self, fixed_values, wild_count):
+        """Find the best hand for the non-wild dice plus wild_count wild dice"""
+        cache_key = (fixed_values, wild_count)
+        if self._wild_cache is None:
+            self.rebuild_score_table()
+        result = self._wild_cache.get(cache_key)
+        if result is not None:
+            return result
+        
+        if math.comb(self.faces + wild_count - 1, wild_count) <= _WILD_ENUMERATION_LIMIT:
+            candidates = (fixed_values + wild_values for wild_values in
+                          itertools.combinations_with_replacement(range(1, self.faces + 1), wild_count))
         else:
-            best_score, best_hand, best_calculation = self._calculate_single_score(dice_values)
+            candidates = self._wild_candidates(fixed_values, wild_count)
+        
+        # Only distinct multisets of wild values matter. When enumerated they are
+        # visited in the same order as their first appearance in itertools.product,
+        # so ties resolve to the same hand as trying every assignment would.
+        best = None
+        best_score = 0
+        for hand in candidates:
+            result = self._lookup_score(hand)
+            if result.score > best_score:
+                best_score = result.score
+                best = result
         
-        return best_score, best_hand, best_calculation
+        result = best or ScoreResult(0, NO_HAND, self, ("", ""))
+        self._wild_cache[cache_key] = result
+        return result
     
     def _calculate_single_score(self, dice_values):
         """Calculate score for a single set of dice values"""
-        counter = Counter(dice_values)
-        sorted_values = sorted(dice_values)
+        best_score, best_combination = self._find_best_combination(dice_values)
+        
+        # Generate description and calculation
+        if best_combination:
+            hand_name, calculation = self._generate_description(best_combination)
+            return best_score, hand_name, calculation
+        
+        return 0, "No scoring combination", "0"
+    
+    def _find_best_combination(self, dice_values):
+        """Find the best scoring combination as (score, combination or None)"""
+        counts = [0] * (self.faces + 1)
+        for value in dice_values:
+            counts[value] += 1
         
         # Check for different combinations
         combinations = []
         
-        # Check for six of a kind
-        if any(count >= 6 for count in counter.values()):
-            value = max(k for k, v in counter.items() if v >= 6)
-            combinations.append(('six_of_kind', value, 6))
-        
-        # Check for five of a kind
-        if any(count >= 5 for count in counter.values()):
-            value = max(k for k, v in counter.items() if v >= 5)
-            combinations.append(('five_of_kind', value, 5))
-        
-        # Check for four of a kind
-        if any(count >= 4 for count in counter.values()):
-            value = max(k for k, v in counter.items() if v >= 4)
-            combinations.append(('four_of_kind', value, 4))
-        
-        # Check for full house (three of a kind + pair)
-        if any(count >= 3 for count in counter.values()) and any(count >= 2 for k, count in counter.items() if count < 3):
-            three_value = max(k for k, v in counter.items() if v >= 3)
-            pair_value = max(k for k, v in counter.items() if v >= 2 and k != three_value)
+        # Check for N of a kind down to four of a kind
+        for size in range(self.hand_size, 3, -1):
+            rule_name = KIND_RULES.get(size, f'{size}_of_kind')
+            if size > 6 and rule_name not in self.scoring_rules:
+                continue
+            value = self._highest_with_count(counts, size)
+            if value is not None:
+                combinations.append((rule_name, value, size))
+        
+        # Check for full house (three of a kind + exactly two of another value)
+        three_value = self._highest_with_count(counts, 3)
+        if three_value is not None and 2 in counts:
             combinations.append(('full_house', three_value, 5))
         
         # Check for three of a kind
-        if any(count >= 3 for count in counter.values()):
-            value = max(k for k, v in counter.items() if v >= 3)
-            combinations.append(('three_of_kind', value, 3))
+        if three_value is not None:
+            combinations.append(('three_of_kind', three_value, 3))
         
-        # Check for two pair
-        if sum(1 for count in counter.values() if count >= 2) >= 2:
-            pairs = [k for k, v in counter.items() if v >= 2]
-            pairs.sort(reverse=True)
-            combinations.append(('two_pair', pairs[0], 4))
-        
-        # Check for pair
-        if any(count >= 2 for count in counter.values()):
-            value = max(k for k, v in counter.items() if v >= 2)
-            combinations.append(('pair', value, 2))
+        # Check for two pair (valued by the highest pair) and pair
+        pair_value = self._highest_with_count(counts, 2)
+        if pair_value is not None and sum(1 for count in counts if count >= 2) >= 2:
+            combinations.append(('two_pair', pair_value, 4))
+        if pair_value is not None:
+            combinations.append(('pair', pair_value, 2))
         
         # Check for sequential combinations
-        sequential_score, sequential_hand, sequential_values = self._check_sequential(sorted_values)
-        if sequential_score > 0:
+        sequential_values = self._check_sequential(counts)
+        if sequential_values:
             combinations.append(('sequential', 0, len(sequential_values), sequential_values))
         
         # Find the best combination
@@ -101,77 +480,199 @@ class ScoringSystem:
                 length = combo[3]
                 sequence_values = combo[3]  # Fixed: sequential_values is at index 3, not 4
                 score = self.scoring_rules.get(f'{length}_sequential', 0)
-                # Add bonus for numbers in the sequential combination (DOUBLED)
+                # Add bonus for numbers in the sequential combination
                 for value in sequence_values:
-                    score += value * 200  # Doubled from 100 to 200
+                    score += value * self.bonus_multiplier
             else:
                 score = self.scoring_rules.get(combo[0], 0)
-                # Add bonus for the value of the combination (DOUBLED)
-                score += combo[1] * 200 * combo[2]  # Doubled from 100 to 200
+                # Add bonus for the value of the combination
+                score += combo[1] * self.bonus_multiplier * combo[2]
             
             if score > best_score:
                 best_score = score
                 best_combination = combo
         
-        # Generate description and calculation
-        if best_combination:
-            hand_name, calculation = self._generate_description(best_combination)
-            return best_score, hand_name, calculation
+        return best_score, best_combination
+    
+    def _highest_with_count(self, counts, size):
+        """Highest value showing at least size times, or None"""
+        for value in range(len(counts) - 1, -1, -1):
+            if counts[value] >= size:
+                return value
+        return None
+    
+    def _sequence_starts(self, counts):
+        """Bitmasks of sequence start values for each length 2..hand_size
         
-        return 0, "No scoring combination", "0"
+        A sequence is a window of the sorted dice, so its inner values must
+        show exactly once while its two ends may repeat.
+        """
+        present = 0
+        single = 0
+        for value, count in enumerate(counts):
+            if count:
+                present |= 1 << value
+                if count == 1:
+                    single |= 1 << value
+        
+        starts = {}
+        runs = present & (present >> 1)
+        for length in range(2, self.hand_size + 1):
+            starts[length] = runs
+            # Extend by one: the old end becomes an inner value
+            runs &= (single >> (length - 1)) & (present >> length)
+        return starts
     
-    def _check_sequential(self, sorted_values):
-        """Check for sequential combinations"""
+    def _check_sequential(self, counts):
+        """Find the sequential combination with the best rule score (lowest start on ties)"""
         best_score = 0
-        best_hand = ""
         best_sequence = []
         
-        # Check for different lengths of sequences
-        for length in range(2, 7):
-            for i in range(len(sorted_values) - length + 1):
-                sequence = sorted_values[i:i+length]
-                if self._is_sequential(sequence):
-                    score = self.scoring_rules.get(f'{length}_sequential', 0)
-                    if score > best_score:
-                        best_score = score
-                        best_hand = f"{length}-straight"
-                        best_sequence = sequence
-        
-        return best_score, best_hand, best_sequence
-    
-    def _is_sequential(self, values):
-        """Check if values form a sequential sequence"""
-        for i in range(len(values) - 1):
-            if values[i + 1] - values[i] != 1:
-                return False
-        return True
+        for length, runs in self._sequence_starts(counts).items():
+            if runs:
+                score = self.scoring_rules.get(f'{length}_sequential', 0)
+                if score > best_score:
+                    start = (runs & -runs).bit_length() - 1
+                    best_score = score
+                    best_sequence = list(range(start, start + length))
+        
+        return best_sequence
+    
+    def _wild_candidates(self, fixed_values, wild_count):
+        """Candidate hands for resolving many wild dice, one per combination target
+        
+        Every combination the wilds could complete gets one hand that completes
+        it as well as possible, so the best candidate scores the same as the best
+        of all wild assignments, at a cost that grows with the number of faces.
+        """
+        faces = self.faces
+        counts = [0] * (faces + 1)
+        for value in fixed_values:
+            counts[value] += 1
+        
+        def hand_with(placement):
+            wild_values = []
+            for face, count in placement.items():
+                wild_values.extend([face] * count)
+            return fixed_values + tuple(wild_values)
+        
+        def place(placement, face, count):
+            if count:
+                placement[face] = placement.get(face, 0) + count
+        
+        # N of a kind down to a pair: every wild on one face
+        for face in range(1, faces + 1):
+            yield hand_with({face: wild_count})
+        
+        # Full house and two pair: the higher group on one face, a pair on another
+        for high in range(faces + 1):
+            for low in range(faces + 1):
+                if low == high:
+                    continue
+                for high_size, exact_pair in ((3, True), (2, False)):
+                    if exact_pair and counts[low] > 2:
+                        continue
+                    high_needed = max(0, high_size - counts[high])
+                    low_needed = max(0, 2 - counts[low])
+                    spare = wild_count - high_needed - low_needed
+                    if spare < 0 or (high_needed and high == 0) or (low_needed and low == 0):
+                        continue
+                    placement = {}
+                    place(placement, high, high_needed)
+                    place(placement, low, low_needed)
+                    if high:
+                        place(placement, high, spare)
+                    elif low and not exact_pair:
+                        place(placement, low, spare)
+                    else:
+                        place(placement, faces if faces != low else faces - 1, spare)
+                    yield hand_with(placement)
+        
+        # Sequences: fill the gaps, then spend spare wilds breaking any sequence
+        # that would be picked ahead of the target
+        rule_scores = {length: self.scoring_rules.get(f'{length}_sequential', 0)
+                       for length in range(2, self.hand_size + 1)}
+        for length, rule_score in rule_scores.items():
+            if rule_score <= 0:
+                continue
+            for start in range(0, faces - length + 2):
+                end = start + length - 1
+                placement = {}
+                for value in range(start, end + 1):
+                    if start < value < end and counts[value] > 1:
+                        break
+                    if counts[value] == 0:
+                        if value == 0:
+                            break
+                        placement[value] = 1
+                else:
+                    spare = wild_count - len(placement)
+                    if spare < 0:
+                        continue
+                    filled = list(counts)
+                    for value in placement:
+                        filled[value] += 1
+                    breaks = self._break_sequences(filled, length, start, rule_scores)
+                    if breaks is None or len(breaks) > spare:
+                        continue
+                    for value in breaks:
+                        place(placement, value, 1)
+                    place(placement, end, spare - len(breaks))
+                    yield hand_with(placement)
+    
+    def _break_sequences(self, counts, length, start, rule_scores):
+        """Fewest extra dice that break every sequence picked ahead of the target, or None
+        
+        A sequence is broken by doubling one of its inner values (never one
+        inside the target). Sequences are intervals, so stabbing them greedily
+        by their right end gives the fewest dice.
+        """
+        target_score = rule_scores[length]
+        end = start + length - 1
+        blockers = []
+        for other_length, runs in self._sequence_starts(counts).items():
+            other_score = rule_scores[other_length]
+            while runs:
+                other_start = (runs & -runs).bit_length() - 1
+                runs &= runs - 1
+                ahead = (other_score > target_score or
+                         (other_score == target_score and (other_length, other_start) < (length, start)))
+                if ahead:
+                    blockers.append((other_start + other_length - 2, other_start + 1))
+        
+        breaks = []
+        for last_inner, first_inner in sorted(blockers):
+            if any(first_inner <= value <= last_inner for value in breaks):
+                continue
+            for value in range(last_inner, first_inner - 1, -1):
+                if value >= 1 and counts[value] == 1 and not start < value < end:
+                    breaks.append(value)
+                    break
+            else:
+                return None
+        return breaks
+    
+    def _hand_name(self, combination):
+        """Readable name of a combination's hand"""
+        combo_type, value, count = combination[:3]
+        if combo_type == 'sequential':
+            return f"{count}-straight"
+        return HAND_NAMES.get(combo_type, combo_type.replace('_of_kind', ' of a Kind'))
     
     def _generate_description(self, combination):
         """Generate a description and calculation for the combination"""
         combo_type, value, count = combination[:3]
+        hand_name = self._hand_name(combination)
         
         if combo_type == 'sequential':
             length = count
-            hand_name = f"{length}-straight"
             base_score = self.scoring_rules.get(f'{length}_sequential', 0)
-            bonus_score = sum(combination[3]) * 200  # Doubled from 100 to 200
+            bonus_score = sum(combination[3]) * self.bonus_multiplier
             total_score = base_score + bonus_score
             calculation = f"{base_score} + {bonus_score} bonus = {total_score}"
         else:
-            # Map combination types to readable names
-            name_map = {
-                'six_of_kind': 'Six of a Kind',
-                'five_of_kind': 'Five of a Kind',
-                'four_of_kind': 'Four of a Kind',
-                'three_of_kind': 'Three of a Kind',
-                'pair': 'Pair',
-                'two_pair': 'Two Pair',
-                'full_house': 'Full House'
-            }
-            
-            hand_name = name_map.get(combo_type, combo_type)
             base_score = self.scoring_rules.get(combo_type, 0)
-            bonus_score = value * 200 * count  # Doubled from 100 to 200
+            bonus_score = value * self.bonus_multiplier * count
             total_score = base_score + bonus_score
             calculation = f"{base_score} + {bonus_score} bonus = {total_score}"
         
@@ -0,0 +1,146 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from scoring import ScoringSystem
+from scoring_reference import ScoringSystem as ReferenceScoringSystem
+
+# Number of dice in every checked hand
+HAND_SIZE = 6
+
+# Per-worker state, set up by _init_worker
+_candidate = None
+_reference_results = None
+
+
+def _init_worker(candidate_factory, reference_results):
+    """Build the candidate scorer once per worker process"""
+    global _candidate, _reference_results
+    _candidate = candidate_factory()
+    _reference_results = reference_results
+
+
+def reference_key(dice_values, wild_dice):
+    """Hands with the same key get the same reference result
+    
+    The reference sorts the dice it scores and tries wild values in the same
+    order wherever the wild dice sit, so its result only depends on the
+    sorted plain dice and the number of wilds.
+    """
+    wild_set = set(wild_dice)
+    return tuple(sorted(v for i, v in enumerate(dice_values) if i not in wild_set)), len(wild_set)
+
+
+def _reference_scores(keys):
+    """Reference results for a batch of keys"""
+    reference = ReferenceScoringSystem()
+    results = []
+    for plain, wild_count in keys:
+        dice_values = list(plain) + [0] * wild_count
+        wild_dice = list(range(len(plain), HAND_SIZE))
+        results.append(tuple(reference.calculate_score(dice_values, wild_dice)))
+    return results
+
+
+def task_cases(task):
+    """Every (dice_values, wild_dice) of one task
+    
+    ("wild", mask): wild dice (showing 0) at the bits of mask, the others 1-6.
+    ("plain", first): no wild dice, dice 0-6 with at least one 0 (enemy
+    hands score a 0 as a plain die), starting with first.
+    """
+    kind, arg = task
+    if kind == "wild":
+        wild_dice = [i for i in range(HAND_SIZE) if arg >> i & 1]
+        plain = [i for i in range(HAND_SIZE) if not arg >> i & 1]
+        for values in itertools.product(range(1, 7), repeat=len(plain)):
+            dice_values = [0] * HAND_SIZE
+            for i, value in zip(plain, values):
+                dice_values[i] = value
+            yield dice_values, wild_dice
+    else:
+        for rest in itertools.product(range(0, 7), repeat=HAND_SIZE - 1):
+            dice_values = [arg] + list(rest)
+            if 0 in dice_values:
+                yield dice_values, []
+
+
+def all_tasks():
+    """Tasks covering all 6^6 ordered hands under every wild mask, plus plain zeros"""
+    return [("wild", mask) for mask in range(1 << HAND_SIZE)] + [("plain", first) for first in range(7)]
+
+
+def _check_task(task):
+    """Compare the candidate with the reference on one task: (cases checked, mismatches)"""
+    checked = 0
+    mismatches = []
+    for dice_values, wild_dice in task_cases(task):
+        expected = _reference_results[reference_key(dice_values, wild_dice)]
+        actual = tuple(_candidate.calculate_score(list(dice_values), list(wild_dice)))
+        checked += 1
+        if actual != expected:
+            mismatches.append((dice_values, wild_dice, expected, actual))
+    return checked, mismatches
+
+
+def run_oracle(candidate_factory=ScoringSystem, processes=None, tasks=None):
+    """Check a scorer against the reference on every input: (cases checked, mismatches)
+    
+    candidate_factory builds the scorer under test in each worker, so it must
+    be picklable (a class or module-level function). Each mismatch is
+    (dice_values, wild_dice, expected, actual), where results are
+    (score, hand name, calculation) tuples. tasks limits the check to some
+    of all_tasks().
+    """
+    processes = processes or os.cpu_count() or 1
+    tasks = tasks or all_tasks()
+    
+    # The reference scores each distinct key once; deal the keys out
+    # round-robin, most wilds (slowest) first, so batches take similar time
+    keys = {reference_key(*case) for task in tasks for case in task_cases(task)}
+    keys = sorted(keys, key=lambda key: (-key[1], key[0]))
+    key_batches = [keys[i::processes * 4] for i in range(processes * 4)]
+    
+    if processes == 1:
+        results = list(map(_reference_scores, key_batches))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_reference_scores, key_batches)
+    reference_results = {}
+    for batch, batch_results in zip(key_batches, results):
+        reference_results.update(zip(batch, batch_results))
+    
+    if processes == 1:
+        _init_worker(candidate_factory, reference_results)
+        results = list(map(_check_task, tasks))
+    else:
+        with multiprocessing.Pool(processes, _init_worker, (candidate_factory, reference_results)) as pool:
+            results = pool.map(_check_task, tasks)
+    
+    checked = 0
+    mismatches = []
+    for task_checked, task_mismatches in results:
+        checked += task_checked
+        mismatches.extend(task_mismatches)
+    return checked, mismatches
+
+
+def main():
+    """Check the current scorer against the reference"""
+    parser = argparse.ArgumentParser(description="Compare ScoringSystem with the original scorer on every hand")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--show", type=int, default=10, help="Mismatches to print")
+    args = parser.parse_args()
+    
+    start = time.time()
+    checked, mismatches = run_oracle(processes=args.processes)
+    print(f"Checked {checked} hands in {time.time() - start:.1f}s: {len(mismatches)} mismatches")
+    for dice_values, wild_dice, expected, actual in mismatches[:args.show]:
+        print(f"  {dice_values} wild {wild_dice}: expected {expected}, got {actual}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
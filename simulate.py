@@ -0,0 +1,160 @@
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from game_core import GameCore
+from policies import POLICIES
+from scoring import ScoringSystem, HAND_TYPES
+
+# One record per run, written by the workers straight into shared memory
+RUN_RECORD = np.dtype([("level", "<i4"), ("gold", "<i8"), ("turns", "<i4"), ("cause", "<i2")])
+
+# Causes of death: the enemy hand that dealt the killing blow, or the turn cap
+# (runs stuck in a state where the enemy never attacks, e.g. a single Shield Of Dreams)
+TURN_LIMIT = "Turn limit"
+CAUSES = HAND_TYPES + (TURN_LIMIT,)
+CAUSE_IDS = {cause: i for i, cause in enumerate(CAUSES)}
+
+
+def play_run(policy, scoring_system=None, max_turns=2000, balance=None, seed=None, fast_enemy_turns=False):
+    """Play one run from level 1 until death: (level, gold earned, hands played, cause of death)
+    
+    With a seed the run draws from its own random streams, so every policy
+    given the same seed faces the same dice. fast_enemy_turns samples the
+    enemy's attacks instead of rolling its dice.
+    """
+    core = GameCore(scoring_system=scoring_system, balance=balance, seed=seed)
+    core.fast_enemy_turns = fast_enemy_turns
+    policy.new_run(seed)
+    core.start()
+    gold = 0
+    turns = 0
+    killing_blow = None
+    
+    while core.game_state != "game_over":
+        if core.game_state == "shop":
+            policy.shop(core)
+            core.continue_to_next_level()
+        elif turns >= max_turns:
+            break
+        else:
+            discard = policy.choose_discard(core) if core.rerolls_left > 0 else []
+            if not discard or not core.discard(discard):
+                core.play_hand()
+                turns += 1
+        
+        # Power-up chains and the enemy's turn resolve before the next decision
+        core.settle()
+        for event in core.pop_events():
+            if event[0] == "enemy_defeated":
+                gold += event[1]
+            elif event[0] == "enemy_attack":
+                killing_blow = event[2]
+    
+    if core.game_state != "game_over":
+        cause = TURN_LIMIT
+    else:
+        cause = HAND_TYPES[killing_blow.hand_type]  # By type id, so the hand is never described
+    return core.current_level, gold, turns, cause
+
+
+def _run_chunk(task):
+    """Play a chunk of runs, writing the records into the shared results buffer"""
+    shm_name, total, start, count, seed, policy_name, max_turns, balance, rule_set, fast_enemy_turns = task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        records = np.ndarray((total,), dtype=RUN_RECORD, buffer=shm.buf)
+        random.seed(seed)
+        policy = POLICIES[policy_name]()
+        scoring_system = ScoringSystem()
+        if rule_set is not None:
+            scoring_system.set_rules(rule_set["scoring_rules"], rule_set["bonus_multiplier"])
+        for i in range(start, start + count):
+            level, gold, turns, cause = play_run(policy, scoring_system, max_turns, balance,
+                                                 fast_enemy_turns=fast_enemy_turns)
+            records[i] = (level, gold, turns, CAUSE_IDS[cause])
+        del records
+    finally:
+        shm.close()
+    return count
+
+
+def simulate(runs, policy="play", processes=None, seed=0, max_turns=2000, chunk_size=None,
+             balance=None, rule_set=None, fast_enemy_turns=False):
+    """Play runs in a process pool and return their records (a RUN_RECORD array)
+    
+    balance overrides GameCore's DEFAULT_BALANCE and rule_set (a dict like
+    load_rule_set returns) replaces the default scoring rules. fast_enemy_turns
+    samples enemy attacks from their distribution instead of rolling dice.
+    """
+    processes = processes or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(2000, -(-runs // (processes * 8))))
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(1, runs * RUN_RECORD.itemsize))
+    try:
+        tasks = [(shm.name, runs, start, min(chunk_size, runs - start), seed * 1000003 + start, policy, max_turns,
+                  balance, rule_set, fast_enemy_turns)
+                 for start in range(0, runs, chunk_size)]
+        if processes == 1:
+            for task in tasks:
+                _run_chunk(task)
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                for _ in pool.imap_unordered(_run_chunk, tasks):
+                    pass
+        records = np.ndarray((runs,), dtype=RUN_RECORD, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    return records
+
+
+def summarize(records):
+    """Readable report of level reached, gold earned and cause of death"""
+    runs = len(records)
+    lines = [f"Runs: {runs}"]
+    
+    lines.append("")
+    lines.append("Level reached:")
+    levels, counts = np.unique(records["level"], return_counts=True)
+    for level, count in zip(levels, counts):
+        lines.append(f"  {level:4d}  {count:9d}  {100 * count / runs:6.2f}%")
+    lines.append(f"  mean {records['level'].mean():.2f}")
+    
+    lines.append("")
+    gold = records["gold"]
+    p10, p50, p90 = np.percentile(gold, [10, 50, 90])
+    lines.append(f"Gold earned: mean {gold.mean():.1f}, p10 {p10:.0f}, median {p50:.0f}, p90 {p90:.0f}")
+    
+    lines.append("")
+    lines.append("Cause of death:")
+    causes, counts = np.unique(records["cause"], return_counts=True)
+    for cause, count in sorted(zip(causes, counts), key=lambda item: -item[1]):
+        lines.append(f"  {CAUSES[cause]:<24}  {count:9d}  {100 * count / runs:6.2f}%")
+    return "\n".join(lines)
+
+
+def main():
+    """Simulate complete runs and print the outcome distribution"""
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of complete Dicey Dilemma runs")
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="play")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=2000, help="Hands played before a run is cut off")
+    parser.add_argument("--fast-enemy-turns", action="store_true",
+                        help="Sample enemy attacks instead of rolling the enemy's dice")
+    args = parser.parse_args()
+    
+    start = time.time()
+    records = simulate(args.runs, args.policy, args.processes, args.seed, args.max_turns,
+                       fast_enemy_turns=args.fast_enemy_turns)
+    print(summarize(records))
+    print(f"\n{args.runs} runs in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the reroll advisor
+"""
+
+import functools
+import itertools
+import math
+import random
+
+from advisor import RerollAdvisor
+
+
+class FakeDie:
+    def __init__(self, value, is_wild=False):
+        self.value = value
+        self.is_wild = is_wild
+
+
+def test_no_rerolls_means_play():
+    """Without rerolls the only option is to play the hand"""
+    advisor = RerollAdvisor()
+    dice = [FakeDie(v) for v in [1, 3, 5, 2, 4, 6]]
+    discard, expected_score, options = advisor.advise(dice, 0)
+    assert discard == []
+    assert options == {(): advisor.play_scores[(1, 2, 3, 4, 5, 6)]}
+
+
+def test_reroll_everything_matches_sampling():
+    """Expected value of a full reroll agrees with a Monte Carlo estimate"""
+    advisor = RerollAdvisor()
+    dice = [FakeDie(v) for v in [1, 3, 5, 2, 4, 1]]
+    discard, expected_score, options = advisor.advise(dice, 1)
+    assert len(options) == 64
+    assert expected_score == max(options.values())
+    
+    rng = random.Random(3)
+    total = 0
+    samples = 20000
+    for _ in range(samples):
+        hand = tuple(sorted(0 if rng.random() < 0.15 else rng.randint(1, 6) for _ in range(6)))
+        total += advisor.play_scores[hand]
+    assert abs(total / samples - options[(0, 1, 2, 3, 4, 5)]) < 100
+
+
+def test_advice_matches_brute_force():
+    """With 1 and 2 rerolls, every option's expected score and the chosen discard match full enumeration"""
+    advisor = RerollAdvisor()
+    chances = {0: 0.15, **{face: 0.85 / 6 for face in range(1, 7)}}
+    
+    def rolls(count):
+        """(dice, chance) of every roll of count dice, in order"""
+        for dice in itertools.product(chances, repeat=count):
+            yield dice, math.prod(chances[value] for value in dice)
+    
+    @functools.lru_cache(maxsize=None)
+    def best(hand, rerolls):
+        """Best expected score of a sorted hand with rerolls left"""
+        if rerolls == 0:
+            return advisor.play_scores[hand]
+        return max(keep(tuple(hand[i] for i in range(6) if i not in discard), rerolls)
+                   for size in range(7) for discard in itertools.combinations(range(6), size))
+    
+    @functools.lru_cache(maxsize=None)
+    def keep(kept, rerolls):
+        """Expected score of keeping some dice and rerolling the rest, rerolls left before rerolling"""
+        if len(kept) == 6:
+            return advisor.play_scores[kept]
+        return sum(chance * best(tuple(sorted(kept + dice)), rerolls - 1) for dice, chance in rolls(6 - len(kept)))
+    
+    for values, rerolls in [([1, 3, 5, 2, 4, 1], 1), ([6, 6, 0, 2, 3, 6], 1), ([4, 4, 1, 1, 5, 2], 2), ([0, 5, 5, 3, 3, 1], 2)]:
+        dice = [FakeDie(v, is_wild=v == 0) for v in values]
+        discard, expected_score, options = advisor.advise(dice, rerolls)
+        expected = {}
+        for size in range(7):
+            for indices in itertools.combinations(range(6), size):
+                kept = tuple(sorted(values[i] for i in range(6) if i not in indices))
+                expected[indices] = keep(kept, rerolls)
+        assert options.keys() == expected.keys()
+        assert all(abs(options[indices] - expected[indices]) < 1e-6 for indices in expected)
+        
+        top = max(expected.values())
+        assert abs(expected_score - top) < 1e-6
+        assert abs(expected[tuple(discard)] - top) < 1e-6
+        assert len(discard) == min(len(indices) for indices, value in expected.items() if value > top - 1e-6)
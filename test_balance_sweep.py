@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the balance sweep
+"""
+
+import os
+
+import pytest
+
+import balance_sweep
+from balance_sweep import sweep, format_table, parse_grid, point_hash
+from game_core import GameCore
+
+
+def test_balance_overrides_game_core():
+    """Balance overrides replace the defaults and keep the other constants"""
+    core = GameCore(balance={"player_max_health": 1000, "line_em_up_cost": 75})
+    core.start()
+    assert core.player.max_health == 1000
+    assert core.enemy.max_health == 15000
+    core.player.earn_gold(74)
+    assert not core.can_buy_power_up("Line 'em up")
+    core.player.earn_gold(1)
+    assert core.buy_power_up("Line 'em up")
+    assert core.player.get_gold() == 0
+
+
+def test_sweep_is_cached_and_deterministic(tmp_path, monkeypatch):
+    """Every grid point is played once; repeated sweeps read the cache and print the same table"""
+    grid = parse_grid(["enemy_health_growth=1.1,1.15", "rules.pair=150,300"])
+    results = sweep(grid, runs=200, processes=2, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 4
+    
+    def fail(task):
+        raise AssertionError("cached grid point was played again")
+    monkeypatch.setattr(balance_sweep, "run_point", fail)
+    cached = sweep(grid, runs=200, processes=1, cache_dir=str(tmp_path))
+    assert cached == results
+    assert format_table(grid, cached) == format_table(grid, results)
+    
+    # Growth makes later enemies tougher, so runs end sooner
+    levels = {(point["enemy_health_growth"], point["rules.pair"]): summary["mean_level"] for point, summary in results}
+    assert levels[(1.1, 150)] > levels[(1.15, 150)]
+
+
+def test_point_hash_tracks_every_setting():
+    """Defaults written out hash like omitted ones; any other change gives a new hash"""
+    base = point_hash({}, "vector", "play", 100, 0, 2000)
+    assert point_hash({"enemy_base_health": 15000}, "vector", "play", 100, 0, 2000) == base
+    assert point_hash({"enemy_base_health": 16000}, "vector", "play", 100, 0, 2000) != base
+    assert point_hash({}, "vector", "play", 100, 1, 2000) != base
+    assert point_hash({}, "core", "play", 100, 0, 2000) != base
+
+
+def test_unknown_parameters_are_rejected(tmp_path):
+    """Typos in a grid fail before anything is played"""
+    with pytest.raises(ValueError):
+        sweep({"enemy_helth_growth": [1.1]}, runs=10, cache_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        parse_grid(["rules.pair"])
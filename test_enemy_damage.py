@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the enemy damage distribution and sampler
+"""
+
+import itertools
+import random
+
+from enemy_damage import EnemyDamageSampler, enemy_attack_pmf, enemy_damage_pmf
+from game_core import GameCore
+from scoring import ScoringSystem, HAND_TYPES, HAND_TYPE_IDS
+
+
+def test_pmf_matches_every_roll():
+    """The distribution matches scoring every ordered enemy roll"""
+    scoring = ScoringSystem()
+    expected = {}
+    expected_attacks = {}
+    for dice in itertools.product(range(7), repeat=6):
+        chance = 1.0
+        for value in dice:
+            chance *= 0.15 if value == 0 else 0.85 / 6
+        result = scoring.calculate_score(list(dice), [])
+        expected[result.score] = expected.get(result.score, 0) + chance
+        attack = (HAND_TYPE_IDS[result.hand_name], result.score)
+        expected_attacks[attack] = expected_attacks.get(attack, 0) + chance
+    
+    pmf = enemy_damage_pmf(scoring)
+    assert sum(pmf.values()) == 1
+    assert set(pmf) == set(expected)
+    for damage, chance in pmf.items():
+        assert abs(float(chance) - expected[damage]) < 1e-12
+    
+    attack_pmf = enemy_attack_pmf(scoring)
+    assert set(attack_pmf) == set(expected_attacks)
+    for attack, chance in attack_pmf.items():
+        assert abs(float(chance) - expected_attacks[attack]) < 1e-12
+
+
+def test_sampler_frequencies():
+    """Sampled damage follows the distribution"""
+    sampler = EnemyDamageSampler(rng=random.Random(11))
+    pmf = enemy_damage_pmf()
+    samples = 200000
+    counts = {}
+    for _ in range(samples):
+        damage = sampler.sample()
+        counts[damage] = counts.get(damage, 0) + 1
+    
+    assert set(counts) <= set(pmf)
+    mean = sum(damage * count for damage, count in counts.items()) / samples
+    expected_mean = sum(damage * float(chance) for damage, chance in pmf.items())
+    assert abs(mean - expected_mean) < 25
+
+
+def test_sampled_attacks_are_real_hands():
+    """Sampled attacks name a hand type that deals the sampled damage"""
+    sampler = EnemyDamageSampler(rng=random.Random(5))
+    pmf = enemy_attack_pmf()
+    for _ in range(1000):
+        assert sampler.sample_attack() in pmf
+        result = sampler.sample_result()
+        assert (result.hand_type, result.score) in pmf
+        assert result.hand_type == HAND_TYPE_IDS[result.hand_name]
+    
+    # Fast enemy turns report the hand like rolled ones do
+    core = GameCore(seed=8)
+    core.fast_enemy_turns = True
+    core.start()
+    core.enemy_turn()
+    attack = next(event for event in core.pop_events() if event[0] == "enemy_attack")
+    assert attack[2].hand_name in HAND_TYPES
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the fight solver tables
+"""
+
+import functools
+import itertools
+import math
+
+import pytest
+
+from advisor import RerollAdvisor
+from fight_solver import FightSolver, FightTables, PLAY, is_sequential_six, is_six_fours
+from scoring import ScoringSystem
+
+
+def test_tables_round_trip(tmp_path):
+    """Saved tables load back memory-mapped with the same contents"""
+    solver = FightSolver(hp_bucket=500, player_max_hp=4000, enemy_max_hp=3000)
+    tables = solver.solve()
+    path = tmp_path / "fight_tables.bin"
+    tables.save(path)
+    
+    loaded = FightTables.load(path, solver.advisor)
+    assert (loaded.win == tables.win).all()
+    assert (loaded.policy == tables.policy).all()
+    assert loaded.win_probability(4000, 0) == 1.0
+    assert loaded.win_probability(0, 3000) == 0.0
+    assert 0 < loaded.win_probability(1000, 3000) < 1
+    assert loaded.rules_hash == solver.scoring_system.rules_hash()
+    
+    # Tables solved for other rules are refused
+    other = RerollAdvisor(ScoringSystem())
+    other.scoring_system.set_rules(dict(other.scoring_system.scoring_rules, pair=51), other.scoring_system.bonus_multiplier)
+    with pytest.raises(ValueError):
+        FightTables.load(path, other)
+
+
+def test_tables_match_brute_force_expectimax():
+    """Win chances and holds match a plain recursive expectimax over the same bucketed fight"""
+    # Buckets as large as the weakest hand, so fights last several turns
+    hp_bucket, max_rerolls = 900, 2
+    solver = FightSolver(hp_bucket=hp_bucket, player_max_hp=2700, enemy_max_hp=9000, max_rerolls=max_rerolls)
+    tables = solver.solve()
+    advisor = solver.advisor
+    chances = advisor.symbol_chances
+    scores = {hand: advisor.hand_score(hand) for hand in advisor.full_hands}
+    
+    def split(position):
+        """[(bucket, weight)] of a fractional bucket position, as the solver splits it"""
+        if position <= 0:
+            return [(0, 1.0)]
+        low, high = max(math.floor(position), 1), math.ceil(position)
+        if high <= low:
+            return [(low, 1.0)]
+        return [(low, high - position), (high, position - low)]
+    
+    def outcomes(count):
+        """(sorted dice, chance) of every roll of count dice"""
+        for dice in itertools.combinations_with_replacement(advisor.symbols, count):
+            chance = math.factorial(count)
+            for symbol in set(dice):
+                chance *= chances[symbol] ** dice.count(symbol) / math.factorial(dice.count(symbol))
+            yield dice, chance
+    
+    @functools.lru_cache(maxsize=None)
+    def win(player, enemy):
+        if player == 0:
+            return 0.0
+        if enemy == 0:
+            return 1.0
+        return sum(chance * value(max_rerolls, player, enemy, hand) for hand, chance in outcomes(6))
+    
+    @functools.lru_cache(maxsize=None)
+    def after_enemy(player, enemy):
+        if enemy == 0:
+            return 1.0
+        return sum(chance * weight * win(hit, enemy)
+                   for damage, chance in solver.enemy_distribution.items()
+                   for hit, weight in split(player - damage / hp_bucket))
+    
+    @functools.lru_cache(maxsize=None)
+    def play(player, enemy, hand):
+        if is_sequential_six(hand) or is_six_fours(hand):
+            return 1.0
+        return sum(weight * after_enemy(player, hit) for hit, weight in split(enemy - scores[hand] / hp_bucket))
+    
+    @functools.lru_cache(maxsize=None)
+    def keep(rerolls, player, enemy, hold):
+        return sum(chance * value(rerolls, player, enemy, tuple(sorted(hold + dice)))
+                   for dice, chance in outcomes(6 - len(hold)))
+    
+    @functools.lru_cache(maxsize=None)
+    def value(rerolls, player, enemy, hand):
+        best = play(player, enemy, hand)
+        if rerolls > 0:
+            for size in range(6):
+                for hold in set(itertools.combinations(hand, size)):
+                    best = max(best, keep(rerolls - 1, player, enemy, hold))
+        return best
+    
+    player_size, enemy_size = tables.win.shape
+    for player in range(player_size):
+        for enemy in range(enemy_size):
+            assert abs(tables.win[player, enemy] - win(player, enemy)) < 1e-6
+    assert 0.5 < tables.win[1, enemy_size - 1] < tables.win[player_size - 1, enemy_size - 1] < 0.9
+    
+    # Every hold the tables choose is as good as the best one
+    choices = set()
+    for rerolls in range(1, max_rerolls + 1):
+        for enemy in range(1, enemy_size):
+            for player in range(1, player_size):
+                for i, hand in enumerate(advisor.full_hands):
+                    choice = int(tables.policy[rerolls - 1, enemy, player, i])
+                    chosen = play(player, enemy, hand) if choice == PLAY else keep(rerolls - 1, player, enemy,
+                                                                                   advisor.holds[choice])
+                    assert abs(chosen - value(rerolls, player, enemy, hand)) < 1e-9
+                    choices.add(choice == PLAY)
+    assert choices == {True, False}
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the headless game core
+"""
+
+import random
+import subprocess
+import sys
+
+from game_core import GameCore, Die, POWER_UPS
+
+
+def set_dice(core, values):
+    """Replace the core's dice (0 is a wild die)"""
+    core.dice = [Die(i, value, is_wild=value == 0) for i, value in enumerate(values)]
+
+
+def test_core_does_not_import_pygame():
+    """The core must run where pygame is not installed"""
+    code = "import sys, game_core; game_core.GameCore(); assert 'pygame' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_headless_games_finish():
+    """Games that always play the first roll end in a game over"""
+    random.seed(11)
+    for _ in range(20):
+        core = GameCore()
+        core.start()
+        for turn in range(1000):
+            if core.game_state == "game_over":
+                break
+            if core.game_state == "shop":
+                core.continue_to_next_level()
+            else:
+                core.play_hand()
+            core.settle()
+        assert core.game_state == "game_over"
+        assert core.player.health == 0
+        assert core.pop_events()[-1] == ("message", f"Game Over! Level reached: {core.current_level}", 300)
+
+
+def test_line_em_up_chain():
+    """Each Line 'em up repeats a sequential six's damage at once, then the enemy's turn waits for the animations"""
+    random.seed(3)
+    core = GameCore()
+    core.start()
+    core.enemy.health = core.enemy.max_health = 10 ** 6
+    core.player.add_power_up(dict(POWER_UPS["Line 'em up"]))
+    core.player.add_power_up(dict(POWER_UPS["Line 'em up"]))
+    set_dice(core, [6, 2, 3, 4, 5, 1])
+    
+    core.play_hand()
+    score = core.second_attack_score
+    assert core.enemy.health == 10 ** 6 + 100 - 3 * score
+    assert core.game_state == "enemy_turn"
+    assert core.schedule == {"enemy_turn": 2 * 90 + 60}
+    events = core.pop_events()
+    assert [event for event in events if event[0] in ("wait", "bonus_attack")] == [
+        ("wait", 90), ("bonus_attack", score), ("wait", 90), ("bonus_attack", score)]
+    
+    core.settle()
+    assert core.game_state == "playing"
+    assert core.attack_count == 0
+    assert core.player.health < core.player.max_health or core.player.shield < 100
+
+
+def test_single_shield_of_dreams_locks_out_enemy_turns():
+    """One Shield Of Dreams upgrades twice and leaves the chain counter at -1"""
+    random.seed(5)
+    core = GameCore()
+    core.start()
+    core.enemy.health = core.enemy.max_health = 10 ** 6
+    core.player.add_power_up(dict(POWER_UPS["Shield Of Dreams"]))
+    set_dice(core, [4, 4, 0, 4, 4, 4])
+    
+    core.play_hand()
+    assert core.player.max_shield == 150
+    core.settle()
+    assert core.shield_upgrade_count == -1
+    
+    # From now on a plain hand never hands the turn to the enemy
+    set_dice(core, [1, 1, 2, 3, 5, 6])
+    core.play_hand()
+    assert core.game_state == "playing"
+    assert not core.advance()
+
+
+def test_line_em_up_kill_opens_the_shop_at_once():
+    """An enemy killed mid-chain is defeated in the same call, leaving the unused attacks counted"""
+    random.seed(4)
+    core = GameCore()
+    core.start()
+    for _ in range(3):
+        core.player.add_power_up(dict(POWER_UPS["Line 'em up"]))
+    set_dice(core, [6, 2, 3, 4, 5, 1])
+    score = core.scoring_system.calculate_score([6, 2, 3, 4, 5, 1], []).score
+    core.enemy.health = core.enemy.max_health = 2 * score - 100
+    
+    core.play_hand()
+    assert core.game_state == "shop"
+    assert core.attack_count == 2
+    assert not core.schedule
+    assert [event[0] for event in core.pop_events() if event[0] in ("wait", "bonus_attack", "enemy_defeated")] == [
+        "wait", "bonus_attack", "wait", "enemy_defeated"]
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tests for the pygame view's rendering, without a window
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from dice import ATLAS_FACES, Dice, draw_face, face_atlas
+from fight_solver import FightSolver, FightTables
+from game import DiceyDilemma
+from game_core import ENEMY_TURN_DELAY
+from ui import TEXT_CACHE_SIZE
+
+
+@pytest.fixture
+def game():
+    """A seeded view on an offscreen display, in the middle of a hand"""
+    # pygame is shut down afterwards; its audio thread would hang forked worker pools in other tests
+    pygame.init()
+    screen = pygame.display.set_mode((400, 720))
+    game = DiceyDilemma(screen, seed=3)
+    game.core.apply("start")
+    game.handle_core_events()
+    game.update()
+    game.draw()
+    # Let the level's opening message run out
+    while game.effect_frames("message") > 0:
+        game.update()
+        game.draw()
+    yield game
+    pygame.quit()
+
+
+def full_redraw(game):
+    """Pixels of the current screen drawn from scratch"""
+    game.drawn_regions = None
+    game.draw()
+    return pygame.image.tostring(game.screen, "RGB")
+
+
+def test_idle_frames_draw_nothing(game):
+    """A screen that does not change is not redrawn or pushed"""
+    before = pygame.image.tostring(game.screen, "RGB")
+    for _ in range(10):
+        game.update()
+        assert game.draw() == []
+    assert pygame.image.tostring(game.screen, "RGB") == before
+
+
+def test_only_changed_regions_are_redrawn(game):
+    """Selecting a die redraws that die, and the result matches a full redraw"""
+    die = game.core.dice[4]
+    game.handle_click(die.rect.center)
+    game.update()
+    dirty = game.draw()
+    assert die.rect in dirty
+    assert game.ui.roll_button.unionall([game.ui.discard_button, game.ui.play_button]) in dirty  # Discard lights up
+    assert not any(rect.colliderect(game.core.dice[0].rect) for rect in dirty)
+    
+    partial = pygame.image.tostring(game.screen, "RGB")
+    assert full_redraw(game) == partial
+
+
+def test_new_screens_are_redrawn_whole(game):
+    """Switching from the game to another screen pushes the whole screen"""
+    game.core.game_state = "game_over"
+    assert game.screen.get_rect() in game.draw()
+
+
+def test_text_surfaces_are_reused(game):
+    """Text drawn again comes from the cache, which stays within its size"""
+    ui = game.ui
+    first = ui.render_text(ui.medium_font, "Gold: 10", True, ui.text_color)
+    hits = ui.text_cache_hits
+    assert ui.render_text(ui.medium_font, "Gold: 10", True, ui.text_color) is first
+    assert ui.text_cache_hits == hits + 1
+    assert ui.render_text(ui.small_font, "Gold: 10", True, ui.text_color) is not first
+    
+    misses = ui.text_cache_misses
+    for i in range(TEXT_CACHE_SIZE):
+        ui.render_text(ui.small_font, str(i), True, ui.text_color)
+    assert ui.text_cache_misses == misses + TEXT_CACHE_SIZE
+    assert len(ui.text_cache) == TEXT_CACHE_SIZE
+    # The oldest entries were evicted
+    assert ui.render_text(ui.medium_font, "Gold: 10", True, ui.text_color) is not first
+
+
+def test_messages_are_laid_out_once(game):
+    """A long message wraps to fit the screen, and is not wrapped again while it stays up"""
+    ui = game.ui
+    message = "Enemy attacks for 1234 damage! " * 4
+    lines = ui.wrap_message(message)
+    assert len(lines) > 1
+    assert " ".join(lines) == message.strip()
+    assert all(ui.small_font.size(line)[0] <= ui.width - 20 for line in lines)
+    
+    layout = ui.layout_message(message)
+    assert [surface for surface, rect in layout] == [ui.render_text(ui.small_font, line, True, ui.text_color) for line in lines]
+    assert ui.layout_message(message) is layout
+    assert ui.layout_message("Turbo on") is not layout
+
+
+def test_dice_are_blitted_from_the_face_atlas(game):
+    """A die drawn from the atlas looks the same as its face drawn directly"""
+    atlas, areas = face_atlas(100)
+    assert face_atlas(100)[0] is atlas
+    assert len(areas) == len(ATLAS_FACES) * 2
+    for value, is_wild in [(1, False), (6, False), (0, True), (9, False)]:
+        for is_selected in (False, True):
+            die = Dice(4, value, is_wild)
+            drawn = pygame.Surface((400, 720))
+            die.draw(drawn, is_selected)
+            expected = pygame.Surface((400, 720))
+            draw_face(expected, die.rect, die.face(), is_selected)
+            assert pygame.image.tostring(drawn, "RGB") == pygame.image.tostring(expected, "RGB")
+
+
+def test_shop_backdrop_is_drawn_once_per_change(game):
+    """The game behind the shop is kept in a layer until something in it changes"""
+    game.core.game_state = "shop"
+    game.draw()
+    layer_key = game.shop_layer_key
+    assert layer_key is not None
+    game.shop_state["current_tab"] = "buy"
+    game.draw()
+    assert game.shop_layer_key is layer_key
+    
+    # Buying changes the power-up boxes behind the shop
+    game.core.player.earn_gold(100)
+    game.core.apply("buy_power_up", "Line 'em up")
+    game.draw()
+    assert game.shop_layer_key != layer_key
+    partial = pygame.image.tostring(game.screen, "RGB")
+    game.shop_layer_key = None
+    assert full_redraw(game) == partial
+
+
+def play_plain_hand(game):
+    """Play a hand that hands the turn to the enemy, as the Play button does"""
+    game.core.enemy.health = game.core.enemy.max_health = 10 ** 6
+    game.core.dice = [Dice(i, value) for i, value in enumerate([1, 1, 2, 3, 5, 6])]
+    game.core.apply("play_hand")
+    game.handle_core_events()
+
+
+def test_turbo_skips_waits(game):
+    """Turbo runs the enemy's turn on the next frame without animations; turning it off restores the waits"""
+    game.toggle_turbo()
+    assert game.effect_frames("message") == float("inf")
+    play_plain_hand(game)
+    health = game.core.player.health + game.core.player.shield
+    game.update()
+    assert game.core.game_state == "playing"
+    assert game.core.player.health + game.core.player.shield < health
+    assert game.effect_frames("player_glitch") == 0 and game.effect_frames("enemy_glitch") == 0
+    assert game.effect_frames("message") == float("inf")
+    
+    game.toggle_turbo()
+    assert game.effect_frames("message") == 120
+    assert float("inf") not in game.effect_ends.values()
+    play_plain_hand(game)
+    assert game.effect_frames("enemy_glitch") > 0
+    assert game.effect_frames("message") == 180
+    frames = 0
+    while game.core.game_state == "enemy_turn":
+        game.update()
+        frames += 1
+    assert frames == ENEMY_TURN_DELAY
+    assert game.effect_frames("player_glitch") > 0
+
+
+def test_hints_come_from_the_fight_tables(game, tmp_path):
+    """Hints follow the fight solver's tables where they apply, and the advisor elsewhere"""
+    path = str(tmp_path / "fight_tables.bin")
+    FightSolver(hp_bucket=500, player_max_hp=30000, enemy_max_hp=20000, max_rerolls=1).save(path)
+    game.fight_tables = FightTables.load(path)
+    game.show_hints = True
+    core = game.core
+    assert list(game.hinted_dice()) == game.fight_tables.advise(core.dice, core.rerolls_left,
+                                                                core.player.health + core.player.shield,
+                                                                core.enemy.health + core.enemy.shield)
+    core.current_level = 2
+    assert list(game.hinted_dice()) == core.get_suggested_discard()
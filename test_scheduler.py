@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the event scheduler
+"""
+
+from game_core import GameCore, POWER_UPS
+from scheduler import Scheduler
+
+
+def test_events_come_due_in_order():
+    """Earlier frames first, then priority, then scheduling order"""
+    scheduler = Scheduler(["first", "second"])
+    scheduler.schedule("late", 5)
+    scheduler.schedule("second", 3)
+    scheduler.schedule("other", 3)
+    scheduler.schedule("first", 3)
+    assert scheduler.next_due() == 3
+    assert scheduler.pop_due() is None
+    
+    scheduler.now = 3
+    assert [scheduler.pop_due(), scheduler.pop_due(), scheduler.pop_due(), scheduler.pop_due()] == ["first", "second", "other", None]
+    assert scheduler.pending() == {"late": 2}
+
+
+def test_cancel_and_reschedule():
+    """Cancelled events never come due; rescheduling replaces the pending event"""
+    scheduler = Scheduler()
+    scheduler.schedule("attack", 2)
+    scheduler.schedule("attack", 4)
+    scheduler.schedule("upgrade", 1)
+    assert scheduler.cancel("upgrade")
+    assert not scheduler.cancel("upgrade")
+    assert "upgrade" not in scheduler and len(scheduler) == 1
+    assert scheduler.next_due() == 4
+    
+    scheduler.now = 10
+    assert scheduler.pop_due() == "attack"
+    assert scheduler.pop_due() is None
+    assert scheduler.next_due() is None
+
+
+def test_leaving_the_enemy_turn_cancels_it():
+    """The enemy's pending turn is dropped as soon as the game moves on"""
+    core = GameCore(seed=2)
+    core.start()
+    core.enemy.health = core.enemy.max_health = 10 ** 6
+    core.play_hand()
+    assert "enemy_turn" in core.schedule
+    core.restart_game()
+    assert not core.schedule
+    assert not core.advance()
+
+
+def test_run_until_matches_ticking_every_frame():
+    """Jumping to each due action gives the same game as ticking all the frames"""
+    games = []
+    for jump in (False, True):
+        core = GameCore(seed=8)
+        core.start()
+        core.enemy.health = core.enemy.max_health = 10 ** 6
+        for _ in range(2):
+            core.player.add_power_up(dict(POWER_UPS["Line 'em up"]))
+        for turn in range(40):
+            core.apply("play_hand")
+            if jump:
+                core.run_until(core.frame + 400)
+            else:
+                for _ in range(400):
+                    core.tick()
+        games.append((core.frame, core.enemy.health, core.player.health, core.player.shield, core.schedule))
+    assert games[0] == games[1]
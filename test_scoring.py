@@ -3,7 +3,13 @@
 Test script for the Dicey Dilemma scoring system
 """
 
-from scoring import ScoringSystem
+import itertools
+import random
+
+import numpy as np
+
+from scoring import ScoringSystem, HAND_TYPE_IDS, DEFAULT_RULES_PATH
+from scoring_reference import ScoringSystem as ReferenceScoringSystem
 
 def test_scoring():
     """Test various dice combinations"""
@@ -52,5 +58,107 @@ def test_scoring():
     print(f"Score: {score}")
     print()
 
+def test_score_table_matches_reference():
+    """Every canonical hand in the lookup table scores like the original scorer"""
+    scoring = ScoringSystem()
+    reference = ReferenceScoringSystem()
+    table = scoring.rebuild_score_table()
+    assert len(table) == 924  # Six dice showing 0-6, sorted
+    for hand in itertools.combinations_with_replacement(range(7), 6):
+        assert tuple(scoring.calculate_score(list(hand), [])) == tuple(reference.calculate_score(list(hand), []))
+    
+    # Systems with the same rules share one table
+    assert ScoringSystem().rebuild_score_table() is table
+
+def test_wild_resolution_matches_brute_force():
+    """Memoized wild resolution picks the same hand as trying every wild assignment in order"""
+    scoring = ScoringSystem()
+    for wild_count in range(1, 7):
+        for fixed_values in itertools.combinations_with_replacement(range(1, 7), 6 - wild_count):
+            best = (0, "", "")
+            for wild_values in itertools.product(range(1, 7), repeat=wild_count):
+                result = tuple(scoring.calculate_score(list(fixed_values + wild_values), []))
+                if result[0] > best[0]:
+                    best = result
+            
+            # Wilds score the same wherever they sit in the hand
+            dice_values = [0] * wild_count + list(fixed_values)
+            result = scoring.calculate_score(dice_values, list(range(wild_count)))
+            assert tuple(result) == best
+            assert scoring.calculate_score(list(fixed_values) + [0] * wild_count, list(range(6 - wild_count, 6))) is result
+
+def test_batch_scoring():
+    """Batch scoring must agree with calculate_score hand for hand"""
+    scoring = ScoringSystem()
+    rng = np.random.default_rng(7)
+    dice = rng.integers(1, 7, size=(5000, 6))
+    wild_mask = rng.random((5000, 6)) < 0.15
+    
+    scores, hand_ids = scoring.calculate_scores_batch(dice, wild_mask)
+    
+    for i in range(len(dice)):
+        wild_dice = [j for j in range(6) if wild_mask[i, j]]
+        score, hand, calculation = scoring.calculate_score(list(dice[i]), wild_dice)
+        assert scores[i] == score
+        assert hand_ids[i] == HAND_TYPE_IDS[hand]
+
+def test_rule_set_files(tmp_path):
+    """Rule sets load from JSON5, compile once and hot-swap"""
+    rules_path = tmp_path / "variant.json5"
+    rules_path.write_text("""{
+  // Only pairs score in this variant
+  scoring_rules: {pair: 50},
+  bonus_multiplier: 10,
+}""")
+    compiled_dir = tmp_path / "compiled"
+    
+    scoring = ScoringSystem(str(rules_path), compiled_dir=str(compiled_dir))
+    assert scoring.calculate_score([6, 6, 1, 2, 4, 5], []).score == 50 + 6 * 10 * 2
+    assert len(list(compiled_dir.iterdir())) == 1
+    
+    # A second system reads the compiled tables back
+    cached = ScoringSystem(str(rules_path), compiled_dir=str(compiled_dir))
+    for dice_values, wild_dice in [([6, 6, 1, 2, 4, 5], []), ([0, 3, 0, 1, 5, 2], [0, 2])]:
+        assert tuple(cached.calculate_score(dice_values, wild_dice)) == tuple(scoring.calculate_score(dice_values, wild_dice))
+    
+    # Swapping back to the default rules
+    cached.load_rules(DEFAULT_RULES_PATH)
+    assert cached.calculate_score([6, 6, 1, 2, 4, 5], []).score == ScoringSystem().calculate_score([6, 6, 1, 2, 4, 5], []).score
+
+def test_larger_dice(tmp_path):
+    """Eight eight-sided dice score like six, and many wilds resolve without enumerating"""
+    rules_path = tmp_path / "eight.json5"
+    rules_path.write_text("""{
+  scoring_rules: {pair: 100, three_of_kind: 300, four_of_kind: 600, five_of_kind: 900,
+                  six_of_kind: 1200, '8_of_kind': 4000, full_house: 500, two_pair: 200,
+                  '2_sequential': 50, '5_sequential': 700, '8_sequential': 3000},
+  bonus_multiplier: 10,
+}""")
+    scoring = ScoringSystem(str(rules_path), compiled_dir=str(tmp_path), hand_size=8, faces=8)
+    
+    assert scoring.calculate_score([7] * 8, []).hand_name == "8 of a Kind"
+    assert scoring.calculate_score([1, 2, 3, 4, 5, 6, 7, 8], []).hand_name == "8-straight"
+    assert scoring.calculate_score([8, 8, 8, 8, 8, 8, 8, 1], []).hand_name == "Six of a Kind"
+    assert scoring.calculate_score([0, 3, 0, 0, 0, 0, 0, 0], list(range(8))).hand_name == "8 of a Kind"
+    
+    # Five or more wilds take the candidate search, which must find the same
+    # best score as trying every wild value
+    rng = random.Random(3)
+    for _ in range(60):
+        wild_count = rng.randint(5, 6)
+        fixed_values = tuple(sorted(rng.randint(0, 8) for _ in range(8 - wild_count)))
+        best = max(scoring.calculate_score(list(fixed_values + wild_values), []).score
+                   for wild_values in itertools.combinations_with_replacement(range(1, 9), wild_count))
+        dice_values = list(fixed_values) + [0] * wild_count
+        assert scoring.calculate_score(dice_values, list(range(8 - wild_count, 8))).score == best
+
 if __name__ == "__main__":
-    test_scoring() 
\ No newline at end of file
+    test_scoring() 
+
+def test_repeated_wild_positions_count_once():
+    """A wild position listed twice is one wild die, as in the original brute force"""
+    scoring = ScoringSystem()
+    reference = ReferenceScoringSystem()
+    for dice, wild_dice in [([1, 1, 2, 3, 5, 0], [5, 5]), ([4, 0, 4, 2, 0, 6], [1, 4, 1])]:
+        assert tuple(scoring.calculate_score(dice, wild_dice)) == tuple(reference.calculate_score(dice, wild_dice))
+        assert tuple(scoring.calculate_score(dice, wild_dice)) == tuple(scoring.calculate_score(dice, sorted(set(wild_dice))))
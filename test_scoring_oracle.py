@@ -0,0 +1,30 @@
+from scoring import ScoringSystem
+from scoring_oracle import run_oracle
+
+
+class OffByOneScoring(ScoringSystem):
+    """Scorer with a deliberate bug in one hand"""
+    
+    def calculate_score(self, dice_values, wild_dice):
+        score, hand, calculation = super().calculate_score(dice_values, wild_dice)
+        if sorted(dice_values) == [1, 2, 3, 4, 5, 6]:
+            score += 1
+        return score, hand, calculation
+
+
+def test_scorer_matches_reference():
+    """The optimized scorer must agree with the original on every hand"""
+    checked, mismatches = run_oracle(ScoringSystem)
+    # 6^6 orderings of 1-6 under every wild mask is 7^6 hands, plus hands scoring 0 as a plain die
+    assert checked == 7 ** 6 + (7 ** 6 - 6 ** 6)
+    assert mismatches == []
+
+
+def test_oracle_reports_mismatches():
+    """A broken scorer is caught, with the offending hands"""
+    checked, mismatches = run_oracle(OffByOneScoring, processes=1, tasks=[("wild", 0)])
+    assert checked == 6 ** 6
+    assert len(mismatches) == 720  # Every ordering of 1-6
+    dice_values, wild_dice, expected, actual = mismatches[0]
+    assert sorted(dice_values) == [1, 2, 3, 4, 5, 6] and wild_dice == []
+    assert actual[0] == expected[0] + 1
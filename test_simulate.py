@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo run simulator
+"""
+
+import random
+
+from advisor import RerollAdvisor
+from game_core import Die
+from policies import AdvisorPolicy, PlayPolicy
+from scoring import ScoringSystem, HAND_TYPES
+from simulate import simulate, play_run, CAUSES, TURN_LIMIT
+
+
+def test_results_do_not_depend_on_worker_count():
+    """Each chunk of runs has its own seed, so pools of any size agree"""
+    single = simulate(300, processes=1, seed=4, chunk_size=50)
+    pooled = simulate(300, processes=3, seed=4, chunk_size=50)
+    assert (single == pooled).all()
+    assert (single["level"] >= 1).all()
+    assert all(CAUSES[cause] != TURN_LIMIT for cause in single["cause"])
+
+
+def test_fast_enemy_turns_report_the_killing_hand():
+    """Sampled enemy attacks die by real hands, like rolled ones"""
+    records = simulate(200, processes=1, seed=4, chunk_size=50, fast_enemy_turns=True)
+    assert (records["level"] >= 1).all()
+    assert all(CAUSES[cause] in HAND_TYPES[1:] for cause in records["cause"])
+    assert (simulate(200, processes=1, seed=4, chunk_size=50, fast_enemy_turns=True) == records).all()
+
+
+def test_turn_limit_ends_runs():
+    """Runs that outlast the turn cap are reported as such"""
+    random.seed(2)
+    level, gold, turns, cause = play_run(PlayPolicy(), max_turns=1)
+    assert (level, gold, turns, cause) == (1, 0, 1, TURN_LIMIT)
+
+
+def test_scoring_alone_never_describes_hands(monkeypatch):
+    """Runs and the advisor only need scores, so no hand name or calculation is formatted"""
+    def describe(self, code):
+        raise AssertionError("hand described")
+    monkeypatch.setattr(ScoringSystem, "describe", describe)
+    
+    # Rules of its own, so no earlier test has described hands in its tables
+    scoring = ScoringSystem()
+    scoring.set_rules(dict(scoring.scoring_rules, pair=51), scoring.bonus_multiplier)
+    
+    advisor = RerollAdvisor(scoring)
+    advisor.build(2)
+    advisor.advise([Die(i, value, value == 0) for i, value in enumerate([1, 1, 0, 3, 5, 6])], 2)
+    level, gold, turns, cause = play_run(AdvisorPolicy(), scoring, max_turns=200, seed=5)
+    assert turns > 0
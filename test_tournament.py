@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the bot policies and the tournament runner
+"""
+
+from fight_solver import FightSolver
+from game_core import GameCore, Die
+from policies import AdvisorPolicy, FightPolicy, GreedyPolicy, RandomPolicy
+from simulate import play_run
+from tournament import tournament, survival_curves, head_to_head, wilson_interval
+
+
+def test_wilson_interval():
+    """Known values, and sensible bounds at the edges"""
+    low, high = wilson_interval(50, 100)
+    assert abs(low - 0.4038) < 1e-4 and abs(high - 0.5962) < 1e-4
+    assert wilson_interval(0, 20)[0] == 0.0
+    assert wilson_interval(20, 20)[1] == 1.0
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_greedy_keeps_the_largest_set():
+    """Greedy keeps wilds and the most common face, preferring high faces on ties"""
+    core = GameCore(seed=1)
+    core.dice = [Die(i, value, is_wild=value == 0) for i, value in enumerate([2, 5, 2, 5, 0, 1])]
+    assert GreedyPolicy().choose_discard(core) == [0, 2, 5]
+
+
+def test_fight_policy_follows_the_tables(tmp_path):
+    """The fight policy rerolls as its tables say, and plays like the advisor without them"""
+    core = GameCore(seed=1)
+    core.start()
+    core.dice = [Die(i, value, is_wild=value == 0) for i, value in enumerate([2, 5, 2, 5, 0, 1])]
+    fallback = FightPolicy(str(tmp_path / "missing.bin"))
+    assert fallback.tables is None
+    assert fallback.choose_discard(core) == AdvisorPolicy().choose_discard(core)
+    
+    path = str(tmp_path / "fight_tables.bin")
+    tables = FightSolver(hp_bucket=500, player_max_hp=4000, enemy_max_hp=3000).save(path)
+    policy = FightPolicy(path)
+    player, enemy = core.player, core.enemy
+    for player.health, enemy.health in [(100, 100), (100, 2500), (3000, 100)]:
+        assert policy.choose_discard(core) == tables.advise(core.dice, core.rerolls_left, player.health + player.shield,
+                                                            enemy.health + enemy.shield)
+    assert play_run(policy, seed=3)[0] >= 1
+    
+    # Outside the fight the tables were solved for, it plays like the advisor
+    policy.tables.advise = lambda *args: "tables"
+    player.health = enemy.health = 100
+    assert policy.choose_discard(core) == "tables"
+    enemy.health = 3000
+    assert policy.choose_discard(core) == AdvisorPolicy().choose_discard(core)
+    enemy.health = 100
+    core.current_level = 2
+    assert policy.choose_discard(core) != "tables"
+    core.current_level = 1
+    core.scoring_system.set_rules(dict(core.scoring_system.scoring_rules, pair=51), core.scoring_system.bonus_multiplier)
+    assert policy.choose_discard(core) != "tables"
+
+
+def test_seeded_runs_are_reproducible():
+    """The same seed gives the same run, even for a policy with randomness of its own"""
+    assert play_run(RandomPolicy(), seed=7) == play_run(RandomPolicy(), seed=7)
+
+
+def test_tournament_shares_seeds_across_workers():
+    """Pools of any size give every policy the same runs"""
+    single = tournament(["play", "greedy", "random"], 40, seed=3, processes=1, chunk_size=7)
+    pooled = tournament(["play", "greedy", "random"], 40, seed=3, processes=2, chunk_size=7)
+    for name in single:
+        assert (single[name] == pooled[name]).all()
+    
+    curves = survival_curves(single)
+    assert all(curve[0][1] == 40 for curve in curves.values())
+    wins, losses, ties = head_to_head(single)[("play", "greedy")]
+    assert wins + losses + ties == 40
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized game engine
+"""
+
+import random
+
+import numpy as np
+
+from game_core import GameCore
+from player import Player
+from policies import PlayPolicy
+from scoring import ScoringSystem
+from simulate import play_run
+from vector_engine import VectorGames, _absorb
+
+
+def test_damage_absorption_matches_player():
+    """Shields soak up damage first, exactly like Player.take_damage"""
+    rng = np.random.default_rng(0)
+    health = rng.integers(0, 3000, 500)
+    shield = rng.integers(0, 200, 500)
+    damage = rng.integers(0, 5000, 500)
+    
+    expected = []
+    for h, s, d in zip(health, shield, damage):
+        player = Player(3000)
+        player.health, player.shield = int(h), int(s)
+        player.take_damage(int(d))
+        expected.append((player.health, player.shield))
+    
+    _absorb(health, shield, damage)
+    assert list(zip(health, shield)) == expected
+
+
+def test_levels_match_game_core():
+    """Vectorized runs reach the same levels as full GameCore runs"""
+    games = VectorGames(20000, seed=5)
+    games.run()
+    assert not games.alive.any()
+    assert (games.cause >= 0).all()
+    
+    random.seed(5)
+    levels = [play_run(PlayPolicy())[0] for _ in range(2000)]
+    assert abs(games.level.mean() - np.mean(levels)) < 0.15
+
+
+def test_other_dice_sizes():
+    """Hand size and faces come from the scoring system, for rolls, rerolls and free replays"""
+    scoring = ScoringSystem(hand_size=5, faces=8)
+    games = VectorGames(500, "advisor", scoring, seed=2)
+    games.run(50)
+    assert games.dice.shape == (500, 5)
+    assert games.dice.max() <= 8 and games.turns.max() > 1
+    
+    core = GameCore(hand_size=5, faces=8, scoring_system=scoring, seed=2)
+    dice = np.sort(games.roll(5000), axis=1)
+    dice[0] = [0, 4, 5, 6, 7]
+    dice[1] = [0, 0, 4, 4, 4]
+    expected = [core.check_sequential_six(list(hand)) or core.check_six_fours(list(hand)) for hand in dice.tolist()]
+    assert expected[:2] == [True, True]
+    assert games.free_replays(dice).tolist() == expected
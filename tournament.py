@@ -0,0 +1,131 @@
+import argparse
+import itertools
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from policies import POLICIES
+from scoring import ScoringSystem
+from simulate import play_run
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score interval (95% by default) for a success rate"""
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def run_seed(seed, run):
+    """Seed of one run, shared by every policy in a tournament"""
+    return seed * 1000003 + run
+
+
+def _play_chunk(task):
+    """Play a chunk of runs with one policy: (policy name, first run, levels reached)"""
+    policy_name, start, count, seed, max_turns = task
+    policy = POLICIES[policy_name]()
+    scoring_system = ScoringSystem()
+    levels = np.array([play_run(policy, scoring_system, max_turns, seed=run_seed(seed, run))[0]
+                       for run in range(start, start + count)], dtype=np.int32)
+    return policy_name, start, levels
+
+
+def tournament(policy_names, runs, seed=0, processes=None, max_turns=2000, chunk_size=None):
+    """Play every policy on the same run seeds: {policy name: levels reached, by run}"""
+    processes = processes or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(200, -(-runs * len(policy_names) // (processes * 8))))
+    tasks = [(name, start, min(chunk_size, runs - start), seed, max_turns)
+             for name in policy_names for start in range(0, runs, chunk_size)]
+    
+    levels = {name: np.zeros(runs, dtype=np.int32) for name in policy_names}
+    if processes == 1:
+        results = map(_play_chunk, tasks)
+    else:
+        pool = multiprocessing.Pool(processes)
+        results = pool.imap_unordered(_play_chunk, tasks)
+    try:
+        for name, start, chunk in results:
+            levels[name][start:start + len(chunk)] = chunk
+    finally:
+        if processes > 1:
+            pool.close()
+            pool.join()
+    return levels
+
+
+def survival_curves(levels):
+    """{policy name: [(level, runs reaching it, low, high)]}, with Wilson intervals"""
+    top = max(int(reached.max()) for reached in levels.values())
+    curves = {}
+    for name, reached in levels.items():
+        curve = []
+        for level in range(1, top + 1):
+            survivors = int((reached >= level).sum())
+            curve.append((level, survivors) + wilson_interval(survivors, len(reached)))
+        curves[name] = curve
+    return curves
+
+
+def head_to_head(levels):
+    """Round robin on shared seeds: {(a, b): (a further, b further, ties)}"""
+    results = {}
+    for a, b in itertools.combinations(levels, 2):
+        results[(a, b)] = (int((levels[a] > levels[b]).sum()), int((levels[a] < levels[b]).sum()),
+                           int((levels[a] == levels[b]).sum()))
+    return results
+
+
+def report(levels):
+    """Readable survival curves and round-robin results"""
+    names = list(levels)
+    runs = len(levels[names[0]])
+    lines = [f"Runs per policy: {runs} (same seeds for every policy)"]
+    lines.append("")
+    lines.append("Share of runs reaching each level, 95% Wilson interval:")
+    width = 22
+    lines.append("  level" + "".join(f"{name:>{width}}" for name in names))
+    curves = survival_curves(levels)
+    for row in zip(*(curves[name] for name in names)):
+        cells = [f"{100 * survivors / runs:6.2f}% [{100 * low:5.1f},{100 * high:5.1f}]"
+                 for level, survivors, low, high in row]
+        lines.append(f"  {row[0][0]:5d}" + "".join(f"{cell:>{width}}" for cell in cells))
+    lines.append("  mean " + "".join(f"{levels[name].mean():>{width}.2f}" for name in names))
+    
+    lines.append("")
+    lines.append("Head to head (which policy got further on the same seed):")
+    for (a, b), (wins, losses, ties) in head_to_head(levels).items():
+        decided = wins + losses
+        low, high = wilson_interval(wins, decided)
+        share = 100 * wins / decided if decided else 50.0
+        lines.append(f"  {a} vs {b}: {wins}-{losses}, {ties} ties; {a} wins {share:.1f}% "
+                     f"[{100 * low:.1f}, {100 * high:.1f}] of decided runs")
+    return "\n".join(lines)
+
+
+def main():
+    """Pit bot policies against each other on identical seeds"""
+    parser = argparse.ArgumentParser(description="Round-robin tournament of Dicey Dilemma bots")
+    parser.add_argument("policies", nargs="*", default=sorted(POLICIES), help=f"Policies to enter ({', '.join(sorted(POLICIES))})")
+    parser.add_argument("--runs", type=int, default=1000, help="Runs per policy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--max-turns", type=int, default=2000, help="Hands played before a run is cut off")
+    args = parser.parse_args()
+    unknown = [name for name in args.policies if name not in POLICIES]
+    if unknown:
+        parser.error(f"Unknown policies: {', '.join(unknown)}")
+    
+    start = time.time()
+    levels = tournament(args.policies, args.runs, args.seed, args.processes, args.max_turns)
+    print(report(levels))
+    print(f"\n{args.runs * len(args.policies)} runs in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 import pygame
 import math
 import random # Added for glitch effect
+from collections import OrderedDict
+
+# Rendered text surfaces kept for reuse, least recently used dropped first
+TEXT_CACHE_SIZE = 256
 
 class UI:
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None):
         self.width = width
         self.height = height
+        self.rng = rng or random.Random()  # Glitch and shake offsets, kept apart from the game's dice
         
         # Initialize fonts
         pygame.font.init()
@@ -14,6 +19,20 @@ class UI:
         self.medium_font = pygame.font.Font(None, 24)
         self.small_font = pygame.font.Font(None, 18)
         
+        # (font, text, color, antialias) -> rendered surface, oldest use first
+        self.text_cache = OrderedDict()
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
+        self.message_layout = (None, [])  # (message, [(line surface, rect)]) of the last message drawn
+        
+        # Semi-transparent overlays, made once and blitted as needed
+        self.message_overlay = pygame.Surface((width, 80))
+        self.message_overlay.set_alpha(200)
+        self.message_overlay.fill((0, 0, 0))
+        self.shop_overlay = pygame.Surface((width, height))
+        self.shop_overlay.set_alpha(200)
+        self.shop_overlay.fill((0, 0, 0))
+        
         # Colors
         self.title_color = (255, 215, 0)  # Gold
         self.text_color = (255, 255, 255)  # White
@@ -88,21 +107,40 @@ class UI:
                 box = pygame.Rect(x, y, power_up_width, power_up_height)
                 self.power_up_boxes.append(box)
     
+    def render_text(self, font, text, antialias, color):
+        """Render text with a font, reusing the surface if it was rendered recently
+        
+        The surface is shared between callers, so it must not be drawn on.
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self.text_cache.get(key)
+        if surface is not None:
+            self.text_cache_hits += 1
+            self.text_cache.move_to_end(key)
+            return surface
+        
+        self.text_cache_misses += 1
+        surface = font.render(text, antialias, color)
+        self.text_cache[key] = surface
+        if len(self.text_cache) > TEXT_CACHE_SIZE:
+            self.text_cache.popitem(last=False)
+        return surface
+    
     def draw_menu(self, screen, high_score):
         """Draw the main menu"""
         # Title
-        title_text = self.title_font.render("Dicey Dilemma", True, self.title_color)
+        title_text = self.render_text(self.title_font, "Dicey Dilemma", True, self.title_color)
         title_rect = title_text.get_rect(center=(self.width//2, 120))
         screen.blit(title_text, title_rect)
         
         # Subtitle
-        subtitle_text = self.medium_font.render("A Roguelike Dice Adventure", True, self.text_color)
+        subtitle_text = self.render_text(self.medium_font, "A Roguelike Dice Adventure", True, self.text_color)
         subtitle_rect = subtitle_text.get_rect(center=(self.width//2, 160))
         screen.blit(subtitle_text, subtitle_rect)
         
         # High score
         if high_score > 0:
-            high_score_text = self.medium_font.render(f"High Score: Level {high_score}", True, self.text_color)
+            high_score_text = self.render_text(self.medium_font, f"High Score: Level {high_score}", True, self.text_color)
             high_score_rect = high_score_text.get_rect(center=(self.width//2, 200))
             screen.blit(high_score_text, high_score_rect)
         
@@ -116,13 +154,13 @@ class UI:
         ]
         
         for i, instruction in enumerate(instructions):
-            text = self.small_font.render(instruction, True, self.text_color)
+            text = self.render_text(self.small_font, instruction, True, self.text_color)
             text_rect = text.get_rect(center=(self.width//2, 280 + i * 25))
             screen.blit(text, text_rect)
         
         # Start button
         pygame.draw.rect(screen, self.button_color, self.start_button)
-        start_text = self.large_font.render("START", True, self.text_color)
+        start_text = self.render_text(self.large_font, "START", True, self.text_color)
         start_text_rect = start_text.get_rect(center=self.start_button.center)
         screen.blit(start_text, start_text_rect)
     
@@ -137,7 +175,7 @@ class UI:
         
         # Apply shake effect if active
         if shield_shake_timer > 0:
-            shake_offset = random.randint(-3, 3)
+            shake_offset = self.rng.randint(-3, 3)
             bar_x += shake_offset
             character_center_x += shake_offset
         
@@ -159,7 +197,7 @@ class UI:
         
         # Shield text
         shield_text = f"{current_shield}/{max_shield}"
-        text_surface = self.small_font.render(shield_text, True, self.text_color)
+        text_surface = self.render_text(self.small_font, shield_text, True, self.text_color)
         text_rect = text_surface.get_rect(center=(character_center_x, y + bar_height//2))
         screen.blit(text_surface, text_rect)
     
@@ -186,8 +224,8 @@ class UI:
             # Apply glitch effect if active
             if glitch_timer > 0:
                 # Create glitch effect by offsetting the image slightly
-                offset_x = random.randint(-glitch_intensity, glitch_intensity)
-                offset_y = random.randint(-glitch_intensity, glitch_intensity)
+                offset_x = self.rng.randint(-glitch_intensity, glitch_intensity)
+                offset_y = self.rng.randint(-glitch_intensity, glitch_intensity)
                 glitch_rect = image_rect.copy()
                 glitch_rect.x += offset_x
                 glitch_rect.y += offset_y
@@ -201,8 +239,8 @@ class UI:
             # Apply glitch effect if active
             if glitch_timer > 0:
                 # Create glitch effect by offsetting the image slightly
-                offset_x = random.randint(-glitch_intensity, glitch_intensity)
-                offset_y = random.randint(-glitch_intensity, glitch_intensity)
+                offset_x = self.rng.randint(-glitch_intensity, glitch_intensity)
+                offset_y = self.rng.randint(-glitch_intensity, glitch_intensity)
                 glitch_rect = image_rect.copy()
                 glitch_rect.x += offset_x
                 glitch_rect.y += offset_y
@@ -247,7 +285,7 @@ class UI:
         
         # Health text
         health_text = f"{current_health}/{max_health}"
-        text_surface = self.small_font.render(health_text, True, self.text_color)
+        text_surface = self.render_text(self.small_font, health_text, True, self.text_color)
         text_rect = text_surface.get_rect(center=(character_center_x, y + bar_height//2))
         screen.blit(text_surface, text_rect)
     
@@ -286,22 +324,22 @@ class UI:
                         pygame.draw.rect(screen, (0, 0, 0), (domino_x, domino_y, domino_width, domino_height), 1)
                 
                 # Draw power-up name
-                text = self.small_font.render(name, True, self.text_color)
+                text = self.render_text(self.small_font, name, True, self.text_color)
                 text_rect = text.get_rect(center=(box.centerx, box.bottom - 15))
                 screen.blit(text, text_rect)
             else:
                 # Power Up text for empty slots
                 pygame.draw.rect(screen, (80, 80, 80), box)  # Gray background
                 pygame.draw.rect(screen, (255, 255, 255), box, 2)  # White border
-                text = self.small_font.render("Power Up", True, self.text_color)
+                text = self.render_text(self.small_font, "Power Up", True, self.text_color)
                 text_rect = text.get_rect(center=box.center)
                 screen.blit(text, text_rect)
     
     def draw_game_ui(self, screen, rerolls_left, dice_rolled, selected_dice, player):
         """Draw the game UI elements"""
         # Draw rerolls and gold
-        rerolls_text = self.medium_font.render(f"Rerolls: {rerolls_left}", True, self.text_color)
-        gold_text = self.medium_font.render(f"Gold: {player.get_gold()}", True, self.text_color)
+        rerolls_text = self.render_text(self.medium_font, f"Rerolls: {rerolls_left}", True, self.text_color)
+        gold_text = self.render_text(self.medium_font, f"Gold: {player.get_gold()}", True, self.text_color)
         
         # Position them side by side
         rerolls_rect = rerolls_text.get_rect()
@@ -318,6 +356,11 @@ class UI:
         self.draw_button(screen, self.discard_button, "Discard", dice_rolled and rerolls_left > 0 and selected_dice)
         self.draw_button(screen, self.play_button, "Play", dice_rolled)
     
+    def draw_dice_hints(self, screen, dice, suggested_discard):
+        """Outline the dice the advisor suggests discarding"""
+        for i in suggested_discard:
+            pygame.draw.rect(screen, (255, 140, 0), dice[i].rect.inflate(-10, -10), 4)  # Orange outline
+    
     def draw_button(self, screen, rect, text, enabled):
         """Draw a button"""
         if enabled:
@@ -327,86 +370,99 @@ class UI:
         
         pygame.draw.rect(screen, (255, 255, 255), rect, 2)  # White border
         
-        button_text = self.medium_font.render(text, True, self.text_color)
+        button_text = self.render_text(self.medium_font, text, True, self.text_color)
         text_rect = button_text.get_rect(center=rect.center)
         screen.blit(button_text, text_rect)
     
-    def draw_message(self, screen, message):
-        """Draw a message in the center of the screen"""
+    def draw_message(self, screen, message, result=None):
+        """Draw a message in the center of the screen, filled in from a ScoreResult if given"""
         if message:
-            # Create a semi-transparent background
-            overlay = pygame.Surface((self.width, 80))
-            overlay.set_alpha(200)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, self.height//2 - 40))
+            if result is not None:
+                message = result.format(message)
             
-            # Split long messages into multiple lines
-            words = message.split()
-            lines = []
-            current_line = ""
+            # Semi-transparent background
+            screen.blit(self.message_overlay, (0, self.height//2 - 40))
             
-            for word in words:
-                test_line = current_line + " " + word if current_line else word
-                test_surface = self.small_font.render(test_line, True, self.text_color)
-                if test_surface.get_width() <= self.width - 20:  # 10px margin on each side
-                    current_line = test_line
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            
-            if current_line:
-                lines.append(current_line)
-            
-            # If no lines were created, use the original message
-            if not lines:
-                lines = [message]
-            
-            # Draw each line
+            for text_surface, text_rect in self.layout_message(message):
+                screen.blit(text_surface, text_rect)
+    
+    def wrap_message(self, message):
+        """Split a message into lines that fit across the screen"""
+        words = message.split()
+        lines = []
+        current_line = ""
+        
+        for word in words:
+            test_line = current_line + " " + word if current_line else word
+            # font.size measures the line without rendering it
+            if self.small_font.size(test_line)[0] <= self.width - 20:  # 10px margin on each side
+                current_line = test_line
+            else:
+                if current_line:
+                    lines.append(current_line)
+                current_line = word
+        
+        if current_line:
+            lines.append(current_line)
+        
+        # If no lines were created, use the original message
+        if not lines:
+            lines = [message]
+        return lines
+    
+    def layout_message(self, message):
+        """Rendered lines of a message with their rects, worked out once per message"""
+        if self.message_layout[0] != message:
+            lines = self.wrap_message(message)
             line_height = self.small_font.get_height()
             total_height = len(lines) * line_height
             start_y = self.height//2 - total_height//2
             
+            layout = []
             for i, line in enumerate(lines):
-                text_surface = self.small_font.render(line, True, self.text_color)
+                text_surface = self.render_text(self.small_font, line, True, self.text_color)
                 text_rect = text_surface.get_rect(center=(self.width//2, start_y + i * line_height))
-                screen.blit(text_surface, text_rect)
+                layout.append((text_surface, text_rect))
+            self.message_layout = (message, layout)
+        return self.message_layout[1]
     
     def draw_game_over(self, screen, level_reached, high_score):
         """Draw the game over screen"""
         # Game over text
-        game_over_text = self.title_font.render("Game Over!", True, (255, 0, 0))
+        game_over_text = self.render_text(self.title_font, "Game Over!", True, (255, 0, 0))
         game_over_rect = game_over_text.get_rect(center=(self.width//2, 150))
         screen.blit(game_over_text, game_over_rect)
         
         # Level reached
-        level_text = self.large_font.render(f"Level Reached: {level_reached}", True, self.text_color)
+        level_text = self.render_text(self.large_font, f"Level Reached: {level_reached}", True, self.text_color)
         level_rect = level_text.get_rect(center=(self.width//2, 200))
         screen.blit(level_text, level_rect)
         
         # High score
         if level_reached >= high_score:
-            new_record_text = self.medium_font.render("New High Score!", True, self.title_color)
+            new_record_text = self.render_text(self.medium_font, "New High Score!", True, self.title_color)
             new_record_rect = new_record_text.get_rect(center=(self.width//2, 250))
             screen.blit(new_record_text, new_record_rect)
         else:
-            high_score_text = self.medium_font.render(f"High Score: Level {high_score}", True, self.text_color)
+            high_score_text = self.render_text(self.medium_font, f"High Score: Level {high_score}", True, self.text_color)
             high_score_rect = high_score_text.get_rect(center=(self.width//2, 250))
             screen.blit(high_score_text, high_score_rect)
         
         # Restart button - positioned at bottom
         pygame.draw.rect(screen, self.button_color, self.restart_button)
-        restart_text = self.large_font.render("Play Again", True, self.text_color)
+        restart_text = self.render_text(self.large_font, "Play Again", True, self.text_color)
         restart_text_rect = restart_text.get_rect(center=self.restart_button.center)
         screen.blit(restart_text, restart_text_rect) 
-
+    
     def draw_shop_ui(self, screen, player, shop_state):
         """Draw the shop interface overlay"""
+        self.draw_shop_background(screen)
+        self.draw_shop_contents(screen, player, shop_state)
+    
+    def draw_shop_background(self, screen):
+        """Draw the parts of the shop that never change: backdrop, frame and title"""
         # Semi-transparent background overlay
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        screen.blit(overlay, (0, 0))
+        screen.blit(self.shop_overlay, (0, 0))
         
         # Shop background
         shop_rect = pygame.Rect(20, 50, self.width - 40, self.height - 100)
@@ -414,12 +470,14 @@ class UI:
         pygame.draw.rect(screen, (255, 255, 255), shop_rect, 3)
         
         # Shop title
-        title_text = self.large_font.render("SHOP", True, (255, 255, 255))
+        title_text = self.render_text(self.large_font, "SHOP", True, (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.width//2, 80))
         screen.blit(title_text, title_rect)
-        
+    
+    def draw_shop_contents(self, screen, player, shop_state):
+        """Draw the shop's gold, tabs, items and navigation"""
         # Gold display
-        gold_text = self.medium_font.render(f"Gold: {player.get_gold()}", True, (255, 215, 0))
+        gold_text = self.render_text(self.medium_font, f"Gold: {player.get_gold()}", True, (255, 215, 0))
         gold_rect = gold_text.get_rect(center=(self.width//2, 120))
         screen.blit(gold_text, gold_rect)
         
@@ -461,7 +519,7 @@ class UI:
             pygame.draw.rect(screen, (255, 255, 255), tab_rect, 2)
             
             # Tab text
-            tab_text = self.small_font.render(tab.upper(), True, (255, 255, 255))
+            tab_text = self.render_text(self.small_font, tab.upper(), True, (255, 255, 255))
             text_rect = tab_text.get_rect(center=(x + tab_width//2, y + tab_height//2))
             screen.blit(tab_text, text_rect)
             
@@ -488,9 +546,9 @@ class UI:
         
         # Item text
         text_color = (255, 255, 255) if can_afford_power_up and has_empty_slot else (150, 150, 150)
-        item_text = self.medium_font.render("Line 'em up", True, text_color)
-        cost_text = self.small_font.render(f"Cost: {power_up_cost} gold", True, text_color)
-        desc_text = self.small_font.render("Six in a row = Double damage!", True, text_color)
+        item_text = self.render_text(self.medium_font, "Line 'em up", True, text_color)
+        cost_text = self.render_text(self.small_font, f"Cost: {power_up_cost} gold", True, text_color)
+        desc_text = self.render_text(self.small_font, "Six in a row = Double damage!", True, text_color)
         
         screen.blit(item_text, (70, y_start + 5))
         screen.blit(cost_text, (70, y_start + 25))
@@ -516,9 +574,9 @@ class UI:
         
         # Item text for Shield Of Dreams
         text_color = (255, 255, 255) if can_afford_shield_power_up and has_empty_slot_shield else (150, 150, 150)
-        shield_item_text = self.medium_font.render("Shield Of Dreams", True, text_color)
-        shield_cost_text = self.small_font.render(f"Cost: {shield_power_up_cost} gold", True, text_color)
-        shield_desc_text = self.small_font.render("Six fours = +25 max shield!", True, text_color)
+        shield_item_text = self.render_text(self.medium_font, "Shield Of Dreams", True, text_color)
+        shield_cost_text = self.render_text(self.small_font, f"Cost: {shield_power_up_cost} gold", True, text_color)
+        shield_desc_text = self.render_text(self.small_font, "Six fours = +25 max shield!", True, text_color)
         
         screen.blit(shield_item_text, (70, y_start + 75))
         screen.blit(shield_cost_text, (70, y_start + 95))
@@ -532,14 +590,14 @@ class UI:
         """Draw the sell tab content"""
         # Placeholder for sell items
         y_start = 200
-        item_text = self.medium_font.render("Sell items will be implemented here", True, (255, 255, 255))
+        item_text = self.render_text(self.medium_font, "Sell items will be implemented here", True, (255, 255, 255))
         screen.blit(item_text, (50, y_start))
     
     def draw_upgrade_tab(self, screen, player, shop_state):
         """Draw the upgrade tab content"""
         # Placeholder for upgrade items
         y_start = 200
-        item_text = self.medium_font.render("Upgrade items will be implemented here", True, (255, 255, 255))
+        item_text = self.render_text(self.medium_font, "Upgrade items will be implemented here", True, (255, 255, 255))
         screen.blit(item_text, (50, y_start))
     
     def draw_restore_tab(self, screen, player, shop_state):
@@ -561,8 +619,8 @@ class UI:
         
         # Item text
         text_color = (255, 255, 255) if can_afford_health else (150, 150, 150)
-        item_text = self.medium_font.render("Restore 30% Health", True, text_color)
-        cost_text = self.small_font.render(f"Cost: {health_cost} gold", True, text_color)
+        item_text = self.render_text(self.medium_font, "Restore 30% Health", True, text_color)
+        cost_text = self.render_text(self.small_font, f"Cost: {health_cost} gold", True, text_color)
         
         screen.blit(item_text, (70, y_start + 10))
         screen.blit(cost_text, (70, y_start + 30))
@@ -578,7 +636,7 @@ class UI:
         pygame.draw.rect(screen, (100, 100, 100), back_rect)
         pygame.draw.rect(screen, (255, 255, 255), back_rect, 2)
         
-        back_text = self.small_font.render("BACK", True, (255, 255, 255))
+        back_text = self.render_text(self.small_font, "BACK", True, (255, 255, 255))
         back_text_rect = back_text.get_rect(center=back_rect.center)
         screen.blit(back_text, back_text_rect)
         
@@ -587,7 +645,7 @@ class UI:
         pygame.draw.rect(screen, (100, 150, 255), continue_rect)
         pygame.draw.rect(screen, (255, 255, 255), continue_rect, 2)
         
-        continue_text = self.small_font.render("CONTINUE", True, (255, 255, 255))
+        continue_text = self.render_text(self.small_font, "CONTINUE", True, (255, 255, 255))
         continue_text_rect = continue_text.get_rect(center=continue_rect.center)
         screen.blit(continue_text, continue_text_rect)
         
@@ -0,0 +1,181 @@
+import numpy as np
+from scoring import ScoringSystem, encode_hand
+from advisor import RerollAdvisor
+from game_core import Die, DEFAULT_BALANCE, WILD_CHANCE, REROLLS_PER_TURN
+
+# Rerolls chosen by the advisor: masks[r][code] has bit i set to reroll the
+# i-th smallest die of the hand with that code, with r rerolls left
+_ADVISOR_MASKS = {}
+
+
+def advisor_masks(scoring_system=None):
+    """Discard bit masks over sorted hands for every reroll count, from RerollAdvisor"""
+    scoring_system = scoring_system or ScoringSystem()
+    cache_key = scoring_system.rules_key()
+    masks = _ADVISOR_MASKS.get(cache_key)
+    if masks is None:
+        advisor = RerollAdvisor(scoring_system)
+        advisor.build(REROLLS_PER_TURN)
+        base = scoring_system.faces + 1
+        masks = np.zeros((REROLLS_PER_TURN + 1, base ** scoring_system.hand_size),
+                         dtype=np.min_scalar_type((1 << scoring_system.hand_size) - 1))
+        for hand in advisor.full_hands:
+            dice = [Die(i, value, is_wild=value == 0) for i, value in enumerate(hand)]
+            for rerolls in range(1, REROLLS_PER_TURN + 1):
+                discard, expected_score, options = advisor.advise(dice, rerolls)
+                masks[rerolls, encode_hand(hand, base)] = sum(1 << i for i in discard)
+        _ADVISOR_MASKS[cache_key] = masks
+    return masks
+
+
+def _absorb(health, shield, damage):
+    """Shields absorb damage first, then health (as in Player/Enemy.take_damage)"""
+    absorbed = np.minimum(shield, damage)
+    shield -= absorbed
+    health -= np.minimum(health, damage - absorbed)
+
+
+class VectorGames:
+    """N games of Dicey Dilemma held as NumPy arrays and stepped one turn at a time.
+    
+    A turn is the player's hand (rerolling as the policy says), then the
+    enemy's attack unless the enemy died or the hand was a sequential six or
+    six fours. Those skip the enemy's turn, as they do without power-ups,
+    and the same dice are played again on the next turn.
+    Defeating an enemy heals 15%, refills the shield, pays gold and spawns the
+    next enemy. There is no shop: power-ups are never bought.
+    """
+    
+    def __init__(self, n, policy="play", scoring_system=None, seed=None, balance=None):
+        self.n = n
+        self.balance = dict(DEFAULT_BALANCE, **(balance or {}))
+        self.scoring_system = scoring_system or ScoringSystem()
+        self.hand_size = self.scoring_system.hand_size
+        self.faces = self.scoring_system.faces
+        self.rng = np.random.default_rng(seed)
+        if policy == "advisor":
+            self.discard_masks = advisor_masks(self.scoring_system)
+        elif policy == "play":
+            self.discard_masks = None
+        else:
+            raise ValueError(f"Unknown policy {policy!r}")
+        
+        self.player_health = np.full(n, self.balance["player_max_health"], dtype=np.int64)
+        self.player_shield = np.full(n, 100, dtype=np.int64)
+        self.gold = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.rerolls_left = np.full(n, REROLLS_PER_TURN, dtype=np.int64)
+        self.turns = np.zeros(n, dtype=np.int64)
+        self.enemy_max_health = np.zeros(n, dtype=np.int64)
+        self.enemy_health = np.zeros(n, dtype=np.int64)
+        self.enemy_shield = np.zeros(n, dtype=np.int64)
+        self.cause = np.full(n, -1, dtype=np.int8)  # Hand type id of the killing blow
+        self.dice = np.zeros((n, self.hand_size), dtype=np.int64)  # Last hand played, sorted
+        self.replay = np.zeros(n, dtype=bool)  # Play the last hand again instead of rolling
+        self.spawn_enemies(np.ones(n, dtype=bool))
+        
+        self._code_weights = (self.faces + 1) ** np.arange(self.hand_size, dtype=np.int64)
+    
+    @property
+    def alive(self):
+        """Games where the player is still alive"""
+        return self.player_health > 0
+    
+    def spawn_enemies(self, mask):
+        """New enemies for the masked games, scaled by level like GameCore.spawn_new_enemy"""
+        base_health = self.balance["enemy_base_health"]
+        health = (base_health * self.balance["enemy_health_growth"] ** (self.level[mask] - 1)).astype(np.int64)
+        self.enemy_max_health[mask] = health
+        self.enemy_health[mask] = health
+        self.enemy_shield[mask] = 100
+        self.rerolls_left[mask] = REROLLS_PER_TURN
+    
+    def roll(self, size):
+        """Roll (size, hand_size) dice: 0 is a wild die, 1..faces are faces"""
+        values = self.rng.integers(1, self.faces + 1, size=(size, self.hand_size))
+        return np.where(self.rng.random((size, self.hand_size)) < WILD_CHANCE, 0, values)
+    
+    def _play_hands(self, alive):
+        """Roll (or keep), reroll and return the final sorted hands of the living games"""
+        dice = np.sort(self.roll(int(alive.sum())), axis=1)
+        replay = self.replay[alive]
+        dice[replay] = self.dice[alive][replay]
+        if self.discard_masks is None:
+            return dice
+        
+        rerolls = self.rerolls_left[alive].copy()
+        while True:
+            codes = dice @ self._code_weights
+            masks = self.discard_masks[rerolls, codes]
+            rerolling = masks > 0
+            if not rerolling.any():
+                return dice
+            bits = (masks[rerolling, None] >> np.arange(self.hand_size, dtype=masks.dtype)) & 1
+            fresh = self.roll(int(rerolling.sum()))
+            dice[rerolling] = np.sort(np.where(bits == 1, fresh, dice[rerolling]), axis=1)
+            rerolls[rerolling] -= 1
+    
+    def free_replays(self, dice):
+        """Hands that skip the enemy's turn, as GameCore.check_sequential_six/check_six_fours decide"""
+        wilds = (dice == 0).sum(axis=1)
+        present = [(dice == face).any(axis=1) for face in range(self.faces + 1)]
+        # A run as long as the hand, or every face for dice with fewer faces than the hand
+        run_length = min(self.hand_size, self.faces)
+        sequential = np.zeros(len(dice), dtype=bool)
+        for start in range(1, self.faces - run_length + 2):
+            missing = sum(~present[face] for face in range(start, start + run_length))
+            sequential |= missing <= wilds
+        return sequential | ((dice == 4) | (dice == 0)).all(axis=1)
+    
+    def step(self):
+        """Play one turn of every living game"""
+        alive = self.alive
+        count = int(alive.sum())
+        if count == 0:
+            return
+        
+        # Player's hand
+        dice = self._play_hands(alive)
+        self.dice[alive] = dice
+        scores = self.scoring_system.calculate_scores_batch(dice, dice == 0)[0]
+        enemy_health = self.enemy_health[alive]
+        enemy_shield = self.enemy_shield[alive]
+        _absorb(enemy_health, enemy_shield, scores)
+        self.enemy_health[alive] = enemy_health
+        self.enemy_shield[alive] = enemy_shield
+        self.turns[alive] += 1
+        
+        # Sequential sixes and six fours skip the enemy's turn
+        free_replay = self.free_replays(dice)
+        
+        # Defeated enemies: gold, healing, shield, next level
+        defeated = np.zeros(self.n, dtype=bool)
+        defeated[alive] = enemy_health <= 0
+        self.gold[defeated] += 50 + self.level[defeated] * 10 + self.enemy_max_health[defeated] // 100
+        max_health = self.balance["player_max_health"]
+        heal_amount = int(max_health * self.balance["victory_heal"])
+        self.player_health[defeated] = np.minimum(max_health, self.player_health[defeated] + heal_amount)
+        self.player_shield[defeated] = 100
+        self.level[defeated] += 1
+        self.spawn_enemies(defeated)
+        
+        # Enemy's attack: its dice count a 0 as a plain die
+        attacked = np.zeros(self.n, dtype=bool)
+        attacked[alive] = (enemy_health > 0) & ~free_replay
+        self.replay[alive] = (enemy_health > 0) & free_replay
+        enemy_scores, enemy_hand_ids = self.scoring_system.calculate_scores_batch(self.roll(int(attacked.sum())))
+        player_health = self.player_health[attacked]
+        player_shield = self.player_shield[attacked]
+        _absorb(player_health, player_shield, enemy_scores)
+        self.player_health[attacked] = player_health
+        self.player_shield[attacked] = player_shield
+        killed = np.zeros(self.n, dtype=bool)
+        killed[attacked] = player_health <= 0
+        self.cause[killed] = enemy_hand_ids[player_health <= 0]
+    
+    def run(self, max_turns=2000):
+        """Step until every player is dead or max_turns turns have passed"""
+        for _ in range(max_turns):
+            if not self.alive.any():
+                break
+            self.step()